@@ -1,12 +1,20 @@
 """
 Migration to create the default groups
 """
+from django.contrib.auth.management import create_permissions
 from django.db import migrations
 
 def create_default_groups(apps, schema_editor):
     """
     Creates the default groups for the application
     """
+    # The user permissions are normally created after all migrations ran (post_migrate),
+    # create them now so this migration also works on a fresh database.
+    auth_config = apps.get_app_config('auth')
+    auth_config.models_module = True
+    create_permissions(auth_config, apps=apps, verbosity=0)
+    auth_config.models_module = None
+
     group = apps.get_model('auth', 'Group')
     permission = apps.get_model('auth', 'Permission')
     content_type = apps.get_model('contenttypes.ContentType')
@@ -47,6 +55,8 @@ class Migration(migrations.Migration):
     """
 
     dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('contenttypes', '0002_remove_content_type_name'),
     ]
 
     operations = [
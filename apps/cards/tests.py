@@ -1,2 +1,66 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from apps.modules.weather import WeatherData
+from forcast.models import WeatherSnapshot
+
+
+class PublicPageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.store_weather(21)
+        WeatherSnapshot.objects.create(source=WeatherSnapshot.SOURCE_RECOSANTE, location='92019', data={'raep': {}})
+
+    def store_weather(self, wind_speed):
+        data = {**WeatherData._default_weather_response(), 'wind_speed': wind_speed}
+        WeatherSnapshot.objects.create(source=WeatherSnapshot.SOURCE_WEATHER, location='48.77,2.27', data=data)
+
+    def test_anonymous_page_is_served_from_cache(self):
+        first = self.client.get(reverse('dash'))
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('ETag', first)
+        self.assertIn('Last-Modified', first)
+        self.assertIn('public', first['Cache-Control'])
+
+        # Only the snapshot version is read, neither the snapshots nor the session
+        with self.assertNumQueries(1):
+            second = self.client.get(reverse('dash'))
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_location_is_part_of_the_key(self):
+        self.client.get(reverse('dash'))
+        with self.assertNumQueries(3):
+            self.client.get(reverse('dash'), {'lat': '48.77', 'lon': '2.27'})
+
+    def test_invalid_location_falls_back_to_the_default(self):
+        response = self.client.get(reverse('dash'), {'lat': 'abc', 'lon': '2.27'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('souffle à 21 km/h', response.content.decode())
+
+    def test_conditional_get(self):
+        etag = self.client.get(reverse('dash'))['ETag']
+
+        response = self.client.get(reverse('dash'), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_new_snapshot_invalidates_pages(self):
+        self.assertIn('souffle à 21 km/h', self.client.get(reverse('dash')).content.decode())
+
+        self.store_weather(30)
+
+        self.assertIn('souffle à 30 km/h', self.client.get(reverse('dash')).content.decode())
+
+    def test_staff_bypass(self):
+        self.client.get(reverse('dash'))
+        self.client.force_login(User.objects.create_user('staff', password='secret', is_staff=True))
+
+        response = self.client.get(reverse('dash'))
+
+        self.assertNotIn('ETag', response)
+        self.assertIn('private', response['Cache-Control'])
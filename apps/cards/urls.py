@@ -1,4 +1,5 @@
 from django.urls import path
+from apps.modules.page_cache import cache_public_page
 from .views import CombinedData
 
 
@@ -6,7 +7,7 @@ from .views import CombinedData
 urlpatterns = [
     path(
         "cards/basic/",
-      CombinedData.as_view(template_name="dash.html"),
+      cache_public_page(CombinedData.as_view(template_name="dash.html")),
         name="dash",
     )
 ]
@@ -1,3 +1,19 @@
 from django.contrib import admin
+from .models import DailyAvailabilityStats, StatsRefresh, TopContributor
 
-# Register your models here.
+
+@admin.register(DailyAvailabilityStats)
+class DailyAvailabilityStatsAdmin(admin.ModelAdmin):
+    list_display = ('date', 'is_volunteer', 'active', 'registrations', 'pairings', 're_registrations')
+    list_filter = ('is_volunteer',)
+    date_hierarchy = 'date'
+
+
+@admin.register(StatsRefresh)
+class StatsRefreshAdmin(admin.ModelAdmin):
+    list_display = ('first', 'last', 'created_at')
+
+
+@admin.register(TopContributor)
+class TopContributorAdmin(admin.ModelAdmin):
+    list_display = ('rank', 'first_name', 'last_name', 'total_days')
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class DashboardVolonteersConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.dashboard_volonteers"
+
+    def ready(self):
+        from . import signals  # noqa: F401 pylint: disable=import-outside-toplevel,unused-import
@@ -0,0 +1,26 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.dashboard_volonteers.stats import rebuild_stats, refresh_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily dashboard statistics from the contact forms.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='first', help='First date to refresh (YYYY-MM-DD).')
+        parser.add_argument('--to', dest='last', help='Last date to refresh (YYYY-MM-DD).')
+
+    def handle(self, *args, **options):
+        if options['first'] or options['last']:
+            if not (options['first'] and options['last']):
+                raise CommandError('--from and --to must be given together.')
+            try:
+                first, last = date.fromisoformat(options['first']), date.fromisoformat(options['last'])
+            except ValueError as e:
+                raise CommandError(f"Invalid date: {e}") from e
+            count = refresh_stats(first, last)
+        else:
+            count = rebuild_stats()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {count} daily statistics row(s)."))
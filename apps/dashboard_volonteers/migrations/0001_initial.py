@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyAvailabilityStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('is_volunteer', models.BooleanField()),
+                ('active', models.PositiveIntegerField(default=0)),
+                ('all_day', models.PositiveIntegerField(default=0)),
+                ('morning', models.PositiveIntegerField(default=0)),
+                ('afternoon', models.PositiveIntegerField(default=0)),
+                ('evening', models.PositiveIntegerField(default=0)),
+                ('registrations', models.PositiveIntegerField(default=0)),
+                ('weekend', models.PositiveIntegerField(default=0)),
+                ('weekday_all_day', models.PositiveIntegerField(default=0)),
+                ('pairings', models.PositiveIntegerField(default=0)),
+                ('re_registrations', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['date', 'is_volunteer'],
+                'constraints': [models.UniqueConstraint(fields=('date', 'is_volunteer'), name='daily_stats_unique_day_role')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:01
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard_volonteers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatsRefresh',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first', models.DateField()),
+                ('last', models.DateField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
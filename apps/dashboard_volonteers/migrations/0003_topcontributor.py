@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard_volonteers', '0002_statsrefresh'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TopContributor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField(unique=True)),
+                ('first_name', models.CharField(max_length=100)),
+                ('last_name', models.CharField(max_length=100)),
+                ('total_days', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['rank'],
+            },
+        ),
+    ]
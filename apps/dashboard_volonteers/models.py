@@ -1,3 +1,79 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class DailyAvailabilityStats(models.Model):
+    """
+    Dashboard counters of one day for volunteers or seekers.
+
+    Maintained from the ContactForm signals in `signals.py` through StatsRefresh,
+    rebuilt from scratch by the `rebuild_dashboard_stats` command.
+    """
+
+    date = models.DateField()
+    is_volunteer = models.BooleanField()
+
+    # Contacts whose period covers the date, and how many of them are available in
+    # each slot of that weekday
+    active = models.PositiveIntegerField(default=0)
+    all_day = models.PositiveIntegerField(default=0)
+    morning = models.PositiveIntegerField(default=0)
+    afternoon = models.PositiveIntegerField(default=0)
+    evening = models.PositiveIntegerField(default=0)
+
+    # Contacts whose period starts on the date
+    registrations = models.PositiveIntegerField(default=0)
+    weekend = models.PositiveIntegerField(default=0)
+    weekday_all_day = models.PositiveIntegerField(default=0)
+    pairings = models.PositiveIntegerField(default=0)
+    # Second registrations under the same name, i.e. people registering again
+    re_registrations = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['date', 'is_volunteer']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'is_volunteer'], name='daily_stats_unique_day_role'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} ({'bénévoles' if self.is_volunteer else 'demandeurs'})"
+
+
+class StatsRefresh(models.Model):
+    """
+    Days whose statistics must be recomputed after a ContactForm change.
+
+    Queued by the signals in the transaction of the change, processed out of the
+    request by the `match_worker` command (`stats.process_refreshes`).
+    """
+
+    first = models.DateField()
+    last = models.DateField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['created_at']
+
+    def __str__(self):
+        return f"{self.first} - {self.last}"
+
+
+class TopContributor(models.Model):
+    """
+    Volunteers with the most registered days, ranked for the dashboard.
+
+    Rewritten with the daily statistics by `stats.process_refreshes` and
+    `stats.rebuild_stats`, so the dashboard never reads ContactForm.
+    """
+
+    rank = models.PositiveSmallIntegerField(unique=True)
+    first_name = models.CharField(max_length=100)
+    last_name = models.CharField(max_length=100)
+    # Sum of end_date - start_date over the registrations under that name
+    total_days = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['rank']
+
+    def __str__(self):
+        return f"{self.rank}. {self.first_name} {self.last_name} ({self.total_days} jours)"
@@ -0,0 +1,54 @@
+from django.db.models import Max, Min
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from apps.db_users.models import ContactForm
+from .stats import queue_refresh
+
+TRACKED_FIELDS = ('is_volunteer', 'first_name', 'last_name', 'start_date', 'end_date')
+
+
+def schedule_refresh(*contacts):
+    """Queue the refresh of the days covered by the given contact states, with the change itself."""
+    first = min(contact['start_date'] for contact in contacts)
+    last = max(contact['end_date'] for contact in contacts)
+    # Adding or removing a registration can move the second registration of that name
+    for contact in contacts:
+        same_name = ContactForm.objects.filter(
+            is_volunteer=contact['is_volunteer'], first_name=contact['first_name'], last_name=contact['last_name']
+        ).aggregate(first=Min('start_date'), last=Max('start_date'))
+        if same_name['first'] is not None:
+            first, last = min(first, same_name['first']), max(last, same_name['last'])
+    queue_refresh(first, last)
+
+
+def contact_state(contact):
+    return {field: getattr(contact, field) for field in TRACKED_FIELDS}
+
+
+@receiver(pre_save, sender=ContactForm)
+def remember_previous_state(sender, instance, **kwargs):
+    instance._stats_previous = None
+    if instance.pk is not None:
+        instance._stats_previous = ContactForm.objects.filter(pk=instance.pk).values(*TRACKED_FIELDS).first()
+
+
+@receiver(post_save, sender=ContactForm)
+def refresh_after_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    states = [contact_state(instance)]
+    if getattr(instance, '_stats_previous', None):
+        states.append(instance._stats_previous)
+    schedule_refresh(*states)
+
+
+@receiver(pre_delete, sender=ContactForm)
+def remember_partners(sender, instance, **kwargs):
+    # Their buddy is set to NULL by the deletion, without a signal, which changes their pairings
+    instance._stats_partners = list(ContactForm.objects.filter(buddy_id=instance.pk).values(*TRACKED_FIELDS))
+
+
+@receiver(post_delete, sender=ContactForm)
+def refresh_after_delete(sender, instance, **kwargs):
+    schedule_refresh(contact_state(instance), *getattr(instance, '_stats_partners', ()))
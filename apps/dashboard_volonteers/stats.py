@@ -0,0 +1,132 @@
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from django.db import transaction
+from django.db.models import F, Max, Min, Sum, Window
+from django.db.models.functions import RowNumber
+
+from apps.db_users import availability as slots
+from apps.db_users.models import ContactForm
+from .models import DailyAvailabilityStats, StatsRefresh, TopContributor
+
+WEEKDAY_ALL_DAY_MASK = slots.slot_mask('all_day') & slots.WEEKDAYS_MASK
+TOP_CONTRIBUTORS = 5
+
+
+def compute_stats(first: date, last: date) -> Dict[Tuple[date, bool], DailyAvailabilityStats]:
+    """Compute the rows of every day from `first` to `last`, both included, from ContactForm."""
+    rows = {}
+
+    def row(day, is_volunteer):
+        if (day, is_volunteer) not in rows:
+            rows[day, is_volunteer] = DailyAvailabilityStats(date=day, is_volunteer=is_volunteer)
+        return rows[day, is_volunteer]
+
+    active = ContactForm.objects.filter(start_date__lte=last, end_date__gte=first).values_list(
+        'is_volunteer', 'start_date', 'end_date', 'availability'
+    )
+    for is_volunteer, start_date, end_date, availability in active.iterator():
+        day, stop = max(start_date, first), min(end_date, last)
+        while day <= stop:
+            stats = row(day, is_volunteer)
+            stats.active += 1
+            day_slots = availability >> (4 * day.weekday())
+            for index, slot in enumerate(slots.SLOTS):
+                if day_slots & (1 << index):
+                    setattr(stats, slot, getattr(stats, slot) + 1)
+            day += timedelta(days=1)
+
+    registrations = ContactForm.objects.filter(start_date__range=(first, last)).values_list(
+        'is_volunteer', 'start_date', 'availability', 'buddy_id'
+    )
+    for is_volunteer, start_date, availability, buddy_id in registrations.iterator():
+        stats = row(start_date, is_volunteer)
+        stats.registrations += 1
+        stats.weekend += bool(availability & slots.WEEKEND_MASK)
+        stats.weekday_all_day += bool(availability & WEEKDAY_ALL_DAY_MASK)
+        stats.pairings += buddy_id is not None
+
+    second_registrations = ContactForm.objects.annotate(
+        registration_rank=Window(
+            RowNumber(),
+            partition_by=[F('is_volunteer'), F('first_name'), F('last_name')],
+            order_by=[F('submit_at').asc(), F('id').asc()],
+        )
+    ).filter(registration_rank=2, start_date__range=(first, last)).values_list('is_volunteer', 'start_date')
+    for is_volunteer, start_date in second_registrations:
+        row(start_date, is_volunteer).re_registrations += 1
+
+    return rows
+
+
+def refresh_stats(first: date, last: date) -> int:
+    """Recompute the rows from `first` to `last`, both included, returns the number of rows written."""
+    rows = compute_stats(first, last)
+    with transaction.atomic():
+        DailyAvailabilityStats.objects.filter(date__range=(first, last)).delete()
+        DailyAvailabilityStats.objects.bulk_create(rows.values(), batch_size=500)
+    return len(rows)
+
+
+def refresh_contributors():
+    """Recompute the TopContributor ranking from ContactForm."""
+    ranking = ContactForm.objects.filter(is_volunteer=True).values('first_name', 'last_name').annotate(
+        total_days=Sum(F('end_date') - F('start_date'))
+    ).order_by('-total_days', 'first_name', 'last_name')[:TOP_CONTRIBUTORS]
+    with transaction.atomic():
+        TopContributor.objects.all().delete()
+        TopContributor.objects.bulk_create([
+            TopContributor(rank=rank, first_name=row['first_name'], last_name=row['last_name'],
+                           total_days=row['total_days'].days)
+            for rank, row in enumerate(ranking, start=1)
+        ])
+
+
+def rebuild_stats() -> int:
+    """Drop the whole table and rebuild it from ContactForm."""
+    bounds = ContactForm.objects.aggregate(first=Min('start_date'), last=Max('end_date'))
+    with transaction.atomic():
+        refresh_contributors()
+        DailyAvailabilityStats.objects.all().delete()
+        if bounds['first'] is None:
+            return 0
+        return refresh_stats(bounds['first'], bounds['last'])
+
+
+def queue_refresh(first: date, last: date) -> StatsRefresh:
+    """Queue the refresh of the rows from `first` to `last`, both included, for `process_refreshes`."""
+    return StatsRefresh.objects.create(first=first, last=last)
+
+
+def merge_ranges(ranges: Iterable[Tuple[date, date]]) -> List[Tuple[date, date]]:
+    """Sorted union of the date ranges, overlapping or adjacent ranges merged."""
+    merged: List[Tuple[date, date]] = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def process_refreshes() -> int:
+    """Refresh the days of every queued StatsRefresh, returns the number of rows written."""
+    with transaction.atomic():
+        queued = list(StatsRefresh.objects.values_list('id', 'first', 'last'))
+        ranges = merge_ranges((first, last) for _, first, last in queued)
+        count = sum(refresh_stats(first, last) for first, last in ranges)
+        if queued:
+            # Every change queueing a refresh may also move the ranking
+            refresh_contributors()
+        # Deleted with the refresh, so a crashed worker leaves them queued
+        StatsRefresh.objects.filter(id__in=[refresh_id for refresh_id, _, _ in queued]).delete()
+    return count
+
+
+def refresh_contacts(contact_ids: Iterable[int]):
+    """Queue the refresh of the days touched by the given contacts, e.g. after a bulk_update of their buddies."""
+    bounds = ContactForm.objects.filter(id__in=list(contact_ids)).aggregate(
+        first=Min('start_date'), last=Max('end_date')
+    )
+    if bounds['first'] is not None:
+        queue_refresh(bounds['first'], bounds['last'])
@@ -1,3 +1,142 @@
+import json
+from datetime import date, timedelta
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.db_users.factories import build_contact, create_contacts
+from .models import DailyAvailabilityStats, StatsRefresh, TopContributor
+from .stats import process_refreshes, rebuild_stats
+
+# Summed daily statistics, the 14-day slot histogram and the top contributors
+DASHBOARD_QUERIES = 3
+
+
+class DashboardViewTests(TestCase):
+    def test_query_count_does_not_depend_on_data(self):
+        with self.assertNumQueries(DASHBOARD_QUERIES):
+            self.client.get(reverse('dashboard'))
+
+        create_contacts(20, ['saturday_morning'], is_volunteer=True)
+        create_contacts(10, ['monday_all_day'], is_volunteer=False)
+        # bulk_create() skips the signals maintaining the statistics
+        rebuild_stats()
+
+        with self.assertNumQueries(DASHBOARD_QUERIES), CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('dashboard'))
+
+        # Answered from the statistics tables alone
+        self.assertFalse([query for query in queries if 'db_users_contactform' in query['sql']])
+        self.assertEqual(len(response.context['top_contributors']), 5)
+        self.assertEqual(response.context['total_active_volunteers'], 20)
+        self.assertEqual(response.context['total_seekers'], 10)
+        self.assertEqual(response.context['weekend_volunteers_count'], 20)
+        self.assertEqual(response.context['weekend_seekers_count'], 0)
+        self.assertEqual(response.context['weekday_seekers_count'], 10)
+
+    def test_slot_histogram_follows_weekdays(self):
+        create_contacts(3, ['saturday_morning'], is_volunteer=True)
+        rebuild_stats()
+
+        response = self.client.get(reverse('dashboard'))
+
+        histogram = json.loads(response.context['contacts_by_dates_slots_volunteers'])
+        self.assertEqual(len(histogram), 14)
+        for day, counts in histogram.items():
+            day = date.fromisoformat(day)
+            # Contacts are available for the next 8 days only
+            expected = 3 if day.weekday() == 5 and day <= date.today() + timedelta(days=7) else 0
+            self.assertEqual(counts, {'all_day': 0, 'morning': expected, 'afternoon': 0, 'evening': 0})
+
+
+class DailyAvailabilityStatsTests(TestCase):
+    def create_contact(self, **fields):
+        values = {
+            'first_name': 'Camille', 'last_name': 'Martin', 'email': 'camille@example.com',
+            'end_date': date.today() + timedelta(days=2), 'is_volunteer': True,
+        }
+        values.update(fields)
+        contact = build_contact(slots=(), **values)
+        contact.save()
+        process_refreshes()
+        return contact
+
+    def test_signals_keep_statistics_up_to_date(self):
+        today = date.today()
+        first = self.create_contact()
+        second = self.create_contact(start_date=today + timedelta(days=1), end_date=today + timedelta(days=1))
+
+        stats = DailyAvailabilityStats.objects.get(date=today + timedelta(days=1), is_volunteer=True)
+        self.assertEqual((stats.active, stats.registrations, stats.re_registrations), (2, 1, 1))
+
+        first.end_date = today
+        first.save()
+        process_refreshes()
+        self.assertEqual(DailyAvailabilityStats.objects.get(date=today + timedelta(days=1), is_volunteer=True).active, 1)
+
+        second.delete()
+        process_refreshes()
+        self.assertFalse(DailyAvailabilityStats.objects.filter(date=today + timedelta(days=1)).exists())
+
+    def test_changes_are_refreshed_out_of_the_request(self):
+        self.create_contact()
+        contact = self.create_contact(first_name='Alex', start_date=date.today() + timedelta(days=1))
+
+        contact.delete()
+
+        # Queued with the change, the rows are only recomputed by the worker
+        self.assertEqual(DailyAvailabilityStats.objects.get(date=contact.start_date, is_volunteer=True).active, 2)
+        self.assertEqual(StatsRefresh.objects.count(), 1)
+        process_refreshes()
+        self.assertEqual(DailyAvailabilityStats.objects.get(date=contact.start_date, is_volunteer=True).active, 1)
+        self.assertFalse(StatsRefresh.objects.exists())
+
+    def test_deleting_a_contact_refreshes_its_partner(self):
+        today = date.today()
+        volunteer = self.create_contact(start_date=today + timedelta(days=10), end_date=today + timedelta(days=12))
+        seeker = self.create_contact(first_name='Alex', is_volunteer=False, buddy=volunteer)
+        volunteer.buddy = seeker
+        volunteer.save()
+        process_refreshes()
+        self.assertEqual(DailyAvailabilityStats.objects.get(date=today, is_volunteer=False).pairings, 1)
+
+        volunteer.delete()
+        process_refreshes()
+
+        # The seeker's registration day lies outside the deleted volunteer's period
+        self.assertEqual(DailyAvailabilityStats.objects.get(date=today, is_volunteer=False).pairings, 0)
+
+    def test_top_contributors_follow_the_changes(self):
+        today = date.today()
+        self.create_contact(end_date=today + timedelta(days=10))
+        alex = self.create_contact(first_name='Alex', end_date=today + timedelta(days=3))
+        self.create_contact(
+            first_name='Alex', start_date=today + timedelta(days=20), end_date=today + timedelta(days=30),
+        )
+        self.create_contact(first_name='Sam', is_volunteer=False, end_date=today + timedelta(days=60))
+
+        ranking = list(TopContributor.objects.values_list('rank', 'first_name', 'total_days'))
+        self.assertEqual(ranking, [(1, 'Alex', 13), (2, 'Camille', 10)])
+
+        alex.delete()
+        process_refreshes()
+
+        # Ties are ranked by name
+        self.assertEqual(list(TopContributor.objects.values_list('first_name', 'total_days')),
+                         [('Alex', 10), ('Camille', 10)])
+
+    def test_rebuild_matches_incremental_updates(self):
+        today = date.today()
+        for offset in range(3):
+            self.create_contact(
+                first_name=f'Prénom{offset % 2}', start_date=today + timedelta(days=offset),
+                end_date=today + timedelta(days=offset + 3), is_volunteer=bool(offset % 2), saturday_all_day=True,
+            )
+        fields = [field.name for field in DailyAvailabilityStats._meta.fields if field.name != 'id']
+        incremental = list(DailyAvailabilityStats.objects.values_list(*fields))
+
+        rebuild_stats()
 
-# Create your tests here.
+        self.assertEqual(list(DailyAvailabilityStats.objects.values_list(*fields)), incremental)
@@ -1,8 +1,9 @@
 from django.views.generic import TemplateView
-from django.db.models import Count, Q, F, Sum
+from django.db.models import Q, Sum
 from django.utils.timezone import now, timedelta
 from datetime import date
-from apps.db_users.models import ContactForm
+from apps.db_users import availability as slots
+from .models import DailyAvailabilityStats, TopContributor
 import json
 from web_project import TemplateLayout
 
@@ -26,86 +27,52 @@ class DashboardView(TemplateView):
         context['start_date'] = start_date.isoformat()
         context['end_date'] = end_date.isoformat()
 
-        # Volunteers and Seekers Data
-        contacts_volunteers = ContactForm.objects.filter(
-            is_volunteer=True
-        )
-        contacts_seekers = ContactForm.objects.filter(
-            is_volunteer=False
-        )
+        roles = {'volunteers': True, 'seekers': False}
+        stats = self.get_stats(roles, start_date, end_date)
 
-        # Total active volunteers
-        context['total_active_volunteers'] = contacts_volunteers.distinct().count()
+        # Totals, from the daily statistics maintained on each ContactForm change
+        context['total_active_volunteers'] = stats['total_volunteers']
+        context['total_seekers'] = stats['total_seekers']
+        context['weekend_volunteers_count'] = stats['weekend_volunteers']
+        context['weekend_seekers_count'] = stats['weekend_seekers']
+        context['weekday_volunteers_count'] = stats['weekday_volunteers']
+        context['weekday_seekers_count'] = stats['weekday_seekers']
+        context['re_registered_volunteers_count'] = stats['re_registered_volunteers']
+        context['pairings_created_count'] = stats['pairings_created']
 
-        # Total seekers
-        context['total_seekers'] = contacts_seekers.distinct().count()
-
-        # Weekend volunteers
-        weekend_contacts_volunteers = contacts_volunteers.filter(
-            Q(saturday_all_day=True) | Q(saturday_morning=True) | Q(saturday_afternoon=True) | Q(saturday_evening=True) |
-            Q(sunday_all_day=True) | Q(sunday_morning=True) | Q(sunday_afternoon=True) | Q(sunday_evening=True)
-        )
-        context['weekend_volunteers_count'] = weekend_contacts_volunteers.count()
-
-        # Weekend seekers
-        weekend_contacts_seekers = contacts_seekers.filter(
-            Q(saturday_all_day=True) | Q(saturday_morning=True) | Q(saturday_afternoon=True) | Q(saturday_evening=True) |
-            Q(sunday_all_day=True) | Q(sunday_morning=True) | Q(sunday_afternoon=True) | Q(sunday_evening=True)
-        )
-        context['weekend_seekers_count'] = weekend_contacts_seekers.count()
-
-        # Re-registered volunteers
-        re_registered_volunteers = contacts_volunteers.values('first_name', 'last_name').annotate(
-            participation_count=Count('id')
-        ).filter(participation_count__gt=1)
-        context['re_registered_volunteers_count'] = re_registered_volunteers.count()
-
-        # Count pairings created based on buddy_id
-        pairings_created = ContactForm.objects.filter(
-            buddy_id__isnull=False,  # Counting only those with a buddy_id
-            start_date__gte=start_date,
-            end_date__lte=end_date
-        ).count()
-        context['pairings_created_count'] = pairings_created
-
-        # Prepare data for charts
-        context['weekday_volunteers_count'] = contacts_volunteers.filter(
-            Q(monday_all_day=True) | Q(tuesday_all_day=True) | Q(wednesday_all_day=True) | 
-            Q(thursday_all_day=True) | Q(friday_all_day=True)
-        ).count()
-
-        context['weekday_seekers_count'] = contacts_seekers.filter(
-            Q(monday_all_day=True) | Q(tuesday_all_day=True) | Q(wednesday_all_day=True) | 
-            Q(thursday_all_day=True) | Q(friday_all_day=True)
-        ).count()
-
-        # Gather top contributors
-        date_diff = F('end_date') - F('start_date')
-        top_contributors = contacts_volunteers.values('first_name', 'last_name').annotate(
-            total_days=Sum(date_diff)
-        ).order_by('-total_days')[:5]
-        context['top_contributors'] = list(top_contributors)
+        # Top contributors, ranked with the daily statistics
+        context['top_contributors'] = list(TopContributor.objects.values('first_name', 'last_name', 'total_days'))
 
         # Prepare availability data for charts
         dates_window = [today + timedelta(days=i) for i in range(14)]
-        contacts_by_dates_slots_volunteers = {
-            date.strftime('%Y-%m-%d'): {
-                slot: contacts_volunteers.filter(**{f"{date.strftime('%A').lower()}_{slot}": True}).count()
-                for slot in ['all_day', 'morning', 'afternoon', 'evening']
-            }
-            for date in dates_window
+        daily_slots = {
+            (row[0], row[1]): dict(zip(slots.SLOTS, row[2:]))
+            for row in DailyAvailabilityStats.objects.filter(date__range=(dates_window[0], dates_window[-1]))
+            .values_list('date', 'is_volunteer', *slots.SLOTS)
         }
-        context['contacts_by_dates_slots_volunteers'] = json.dumps(contacts_by_dates_slots_volunteers)
-
-        contacts_by_dates_slots_seekers = {
-            date.strftime('%Y-%m-%d'): {
-                slot: contacts_seekers.filter(**{f"{date.strftime('%A').lower()}_{slot}": True}).count()
-                for slot in ['all_day', 'morning', 'afternoon', 'evening']
+        empty_slots = dict.fromkeys(slots.SLOTS, 0)
+        for role, is_volunteer in roles.items():
+            contacts_by_dates_slots = {
+                date.strftime('%Y-%m-%d'): daily_slots.get((date, is_volunteer), empty_slots)
+                for date in dates_window
             }
-            for date in dates_window
-        }
-        context['contacts_by_dates_slots_seekers'] = json.dumps(contacts_by_dates_slots_seekers)
+            context[f'contacts_by_dates_slots_{role}'] = json.dumps(contacts_by_dates_slots)
 
         context['dates'] = [date.strftime('%Y-%m-%d') for date in dates_window]
 
-        return context
\ No newline at end of file
+        return context
+
+    @staticmethod
+    def get_stats(roles, start_date, end_date):
+        """Every count of the dashboard, summed over the daily statistics in a single query."""
+        counts = {
+            # Contacts with a buddy whose period starts within the selected range
+            'pairings_created': Sum('pairings', filter=Q(date__range=(start_date, end_date)), default=0),
+        }
+        for role, is_volunteer in roles.items():
+            role_filter = Q(is_volunteer=is_volunteer)
+            counts[f'total_{role}'] = Sum('registrations', filter=role_filter, default=0)
+            counts[f'weekend_{role}'] = Sum('weekend', filter=role_filter, default=0)
+            counts[f'weekday_{role}'] = Sum('weekday_all_day', filter=role_filter, default=0)
+            counts[f're_registered_{role}'] = Sum('re_registrations', filter=role_filter, default=0)
+        return DailyAvailabilityStats.objects.aggregate(**counts)
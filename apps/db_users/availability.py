@@ -0,0 +1,82 @@
+"""
+Compact representation of the weekly availability of a ContactForm.
+
+Each of the 28 `<day>_<slot>` boolean fields maps to one bit of the
+`availability` integer column: bit `4 * day + slot`, with days from Monday (0)
+to Sunday (6) and slots in the SLOTS order. Two contacts share a slot when
+`a.availability & b.availability` is non-zero.
+"""
+from typing import Any, Dict, Iterable, List, Union
+
+DAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+SLOTS = ['all_day', 'morning', 'afternoon', 'evening']
+
+DAY_LABELS = {
+    'monday': 'Lundi',
+    'tuesday': 'Mardi',
+    'wednesday': 'Mercredi',
+    'thursday': 'Jeudi',
+    'friday': 'Vendredi',
+    'saturday': 'Samedi',
+    'sunday': 'Dimanche',
+}
+SLOT_LABELS = {
+    'all_day': 'toute la journée',
+    'morning': 'matin',
+    'afternoon': 'après-midi',
+    'evening': 'soir',
+}
+
+# Field names in bit order
+SLOT_FIELDS = [f'{day}_{slot}' for day in DAYS for slot in SLOTS]
+SLOT_BITS = {field: 1 << index for index, field in enumerate(SLOT_FIELDS)}
+FIELD_LABELS = {f'{day}_{slot}': f'{DAY_LABELS[day]} {SLOT_LABELS[slot]}' for day in DAYS for slot in SLOTS}
+
+ALL_SLOTS_MASK = (1 << len(SLOT_FIELDS)) - 1
+
+
+def slot_bit(day: str, slot: str) -> int:
+    return SLOT_BITS[f'{day}_{slot}']
+
+
+def day_mask(day: str) -> int:
+    """Mask of the four slots of a day."""
+    return 0b1111 << (4 * DAYS.index(day))
+
+
+def mask_from_slots(fields: Iterable[str]) -> int:
+    """Mask of the given `<day>_<slot>` field names."""
+    mask = 0
+    for field in fields:
+        mask |= SLOT_BITS[field]
+    return mask
+
+
+def slot_mask(slot: str) -> int:
+    """Mask of a slot on every day of the week."""
+    return mask_from_slots(f'{day}_{slot}' for day in DAYS)
+
+
+WEEKEND_MASK = day_mask('saturday') | day_mask('sunday')
+WEEKDAYS_MASK = ALL_SLOTS_MASK & ~WEEKEND_MASK
+
+
+def mask_from_fields(source: Union[Dict[str, Any], Any]) -> int:
+    """Mask of a ContactForm instance, or of a dict of its boolean fields."""
+    if isinstance(source, dict):
+        return mask_from_slots(field for field in SLOT_FIELDS if source.get(field))
+    return mask_from_slots(field for field in SLOT_FIELDS if getattr(source, field, False))
+
+
+def slots_in_mask(mask: int) -> List[str]:
+    """Field names of the slots set in `mask`, in week order."""
+    return [field for field in SLOT_FIELDS if mask & SLOT_BITS[field]]
+
+
+def fields_from_mask(mask: int) -> Dict[str, bool]:
+    return {field: bool(mask & SLOT_BITS[field]) for field in SLOT_FIELDS}
+
+
+def labels_from_mask(mask: int) -> List[str]:
+    """Readable labels ("Lundi matin", ...) of the slots set in `mask`."""
+    return [FIELD_LABELS[field] for field in slots_in_mask(mask)]
@@ -0,0 +1,29 @@
+"""ContactForm factories shared by the app tests."""
+from datetime import date, timedelta
+from typing import Iterable, List
+
+from apps.modules import geo
+from .availability import fields_from_mask, mask_from_slots
+from .models import ContactForm
+
+
+def build_contact(index: int = 0, slots: Iterable[str] = ('monday_morning',), **fields) -> ContactForm:
+    """Unsaved contact available in `slots` for the next week, `fields` override the defaults."""
+    today = date.today()
+    availability = mask_from_slots(slots)
+    values = {
+        'first_name': f'Prénom{index}', 'last_name': 'Nom', 'email': f'contact{index}@example.com',
+        'phone': '0601020304', 'submit_at': today, 'start_date': today, 'end_date': today + timedelta(days=7),
+        'availability': availability, **fields_from_mask(availability),
+    }
+    values.update(fields)
+    if values.get('lat') is not None and values.get('lon') is not None:
+        # bulk_create() skips save(), which derives the cell from the coordinates
+        values['grid_cell'] = geo.grid_cell(values['lat'], values['lon'])
+    return ContactForm(**values)
+
+
+def create_contacts(count: int, slots: Iterable[str] = ('monday_morning',), **fields) -> List[ContactForm]:
+    """Create `count` contacts with bulk_create(), which sends no signals."""
+    slots = list(slots)
+    return ContactForm.objects.bulk_create([build_contact(index, slots, **fields) for index in range(count)])
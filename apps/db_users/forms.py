@@ -4,7 +4,9 @@ from .models import ContactForm  # Importez le modèle AidRequest
 class ContactFormForm(forms.ModelForm):
     class Meta:
         model = ContactForm
-        fields = '__all__'
+        # Pairing is done by the matching engine, never by the person filling the form,
+        # and the address is geocoded on submission
+        exclude = ['buddy', 'lat', 'lon']
         widgets = {
             'start_date': forms.DateInput(attrs={'type': 'date', 'class': 'form-control form-control-lg'}),
             'end_date': forms.DateInput(attrs={'type': 'date', 'class': 'form-control form-control-lg'}),
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:02
+
+from django.db import migrations, models
+
+from apps.db_users.availability import SLOT_FIELDS, mask_from_fields
+
+
+def backfill_availability(apps, schema_editor):
+    ContactForm = apps.get_model('db_users', 'ContactForm')
+    contacts = list(ContactForm.objects.only('id', *SLOT_FIELDS))
+    for contact in contacts:
+        contact.availability = mask_from_fields(contact)
+    ContactForm.objects.bulk_update(contacts, ['availability'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db_users', '0002_alter_contactform_buddy_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactform',
+            name='availability',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_availability, migrations.RunPython.noop),
+    ]
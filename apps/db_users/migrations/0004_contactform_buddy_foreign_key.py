@@ -0,0 +1,55 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_buddy_ids(apps, schema_editor):
+    """Convert the string ids to the new foreign key, dropping ids of missing contacts."""
+    ContactForm = apps.get_model('db_users', 'ContactForm')
+    existing = set(ContactForm.objects.values_list('id', flat=True))
+    contacts = []
+    for contact in ContactForm.objects.exclude(buddy_id=None).only('id', 'buddy_id'):
+        try:
+            buddy_id = int(contact.buddy_id)
+        except ValueError:
+            continue
+        if buddy_id in existing:
+            contact.buddy_ref_id = buddy_id
+            contacts.append(contact)
+    ContactForm.objects.bulk_update(contacts, ['buddy_ref'], batch_size=500)
+
+
+def copy_buddy_refs(apps, schema_editor):
+    ContactForm = apps.get_model('db_users', 'ContactForm')
+    contacts = list(ContactForm.objects.exclude(buddy_ref=None).only('id', 'buddy_ref'))
+    for contact in contacts:
+        contact.buddy_id = str(contact.buddy_ref_id)
+    ContactForm.objects.bulk_update(contacts, ['buddy_id'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db_users', '0003_contactform_availability'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactform',
+            name='buddy_ref',
+            field=models.ForeignKey(
+                blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+',
+                to='db_users.contactform',
+            ),
+        ),
+        migrations.RunPython(copy_buddy_ids, copy_buddy_refs),
+        migrations.RemoveField(
+            model_name='contactform',
+            name='buddy_id',
+        ),
+        # The column keeps its buddy_id name
+        migrations.RenameField(
+            model_name='contactform',
+            old_name='buddy_ref',
+            new_name='buddy',
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db_users', '0004_contactform_buddy_foreign_key'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactform',
+            index=models.Index(fields=['first_name', 'id'], name='contact_first_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactform',
+            index=models.Index(fields=['submit_at', 'id'], name='contact_submit_at_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db_users', '0005_contactform_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactform',
+            index=models.Index(fields=['is_volunteer', 'start_date', 'end_date'], name='contact_role_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactform',
+            index=models.Index(fields=['last_name', 'first_name', 'id'], name='contact_last_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactform',
+            index=models.Index(fields=['start_date', 'id'], name='contact_start_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactform',
+            index=models.Index(fields=['end_date', 'id'], name='contact_end_date_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db_users', '0006_contactform_table_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactform',
+            name='grid_cell',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='contactform',
+            name='lat',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='contactform',
+            name='lon',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
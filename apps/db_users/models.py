@@ -1,4 +1,27 @@
 from django.db import models
+from django.db.models import Count, F, Q
+
+from apps.modules import geo
+from . import availability as slots
+
+
+class ContactFormQuerySet(models.QuerySet):
+    def available_in(self, *fields, mask=0):
+        """Contacts available in any of the given `<day>_<slot>` fields (or bits of `mask`)."""
+        mask |= slots.mask_from_slots(fields)
+        alias = f'_available_{mask}'
+        return self.alias(**{alias: F('availability').bitand(mask)}).filter(**{f'{alias}__gt': 0})
+
+    def available_in_all(self, *fields, mask=0):
+        """Contacts available in every given `<day>_<slot>` field (and bit of `mask`)."""
+        mask |= slots.mask_from_slots(fields)
+        alias = f'_available_{mask}'
+        return self.alias(**{alias: F('availability').bitand(mask)}).filter(**{alias: mask})
+
+    def slot_counts(self):
+        """Number of contacts available per `<day>_<slot>` field, in a single aggregate query."""
+        return self.aggregate(**{field: Count('id', filter=Q(**{field: True})) for field in slots.SLOT_FIELDS})
+
 
 class ContactForm(models.Model):
     first_name = models.CharField(max_length=100)
@@ -46,9 +69,59 @@ class ContactForm(models.Model):
     sunday_afternoon = models.BooleanField(default=False)
     sunday_evening = models.BooleanField(default=False)
     
+    # The 28 slots above as a bitmask, see apps/db_users/availability.py. Kept in sync
+    # by save(); bulk_create()/update() callers must set it themselves.
+    availability = models.PositiveIntegerField(default=0, editable=False, db_index=True)
+
     is_volunteer = models.BooleanField(default=True)
-    buddy_id = models.CharField(max_length=20, blank=True, null=True)
-    
+    # Geocoded address, see set_location(); grid_cell is the apps.modules.geo cell of the point,
+    # kept in sync by save() like availability
+    lat = models.FloatField(blank=True, null=True)
+    lon = models.FloatField(blank=True, null=True)
+    grid_cell = models.CharField(max_length=20, blank=True, default='', editable=False, db_index=True)
+    # Paired contact, both contacts of a pair point to each other
+    buddy = models.ForeignKey('self', blank=True, null=True, on_delete=models.SET_NULL, related_name='+')
+
+    objects = ContactFormQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of the contacts table and of the buddy pairs
+            models.Index(fields=['first_name', 'id'], name='contact_first_name_idx'),
+            models.Index(fields=['submit_at', 'id'], name='contact_submit_at_idx'),
+            # Filters and sort keys of the contacts table (buddy_id is indexed as a foreign key)
+            models.Index(fields=['is_volunteer', 'start_date', 'end_date'], name='contact_role_period_idx'),
+            models.Index(fields=['last_name', 'first_name', 'id'], name='contact_last_name_idx'),
+            models.Index(fields=['start_date', 'id'], name='contact_start_date_idx'),
+            models.Index(fields=['end_date', 'id'], name='contact_end_date_idx'),
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
+    def save(self, *args, **kwargs):
+        self.availability = slots.mask_from_fields(self)
+        self.grid_cell = geo.grid_cell(self.lat, self.lon) if self.lat is not None and self.lon is not None else ''
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            derived = set()
+            if set(update_fields) & set(slots.SLOT_FIELDS):
+                derived.add('availability')
+            if set(update_fields) & {'lat', 'lon'}:
+                derived.add('grid_cell')
+            kwargs['update_fields'] = {*update_fields, *derived}
+        super().save(*args, **kwargs)
+
+    def set_location(self, coordinates):
+        """Set the geocoded `(lat, lon)` of the address, or clear it with None."""
+        self.lat, self.lon = coordinates or (None, None)
+
+    @property
+    def availability_slots(self):
+        """Field names of the slots this contact is available in."""
+        return slots.slots_in_mask(self.availability)
+
+    @property
+    def availability_labels(self):
+        return slots.labels_from_mask(self.availability)
+
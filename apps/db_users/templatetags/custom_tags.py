@@ -6,6 +6,9 @@ register = template.Library()
 @register.filter
 def get_object_from_id(buddy_id):
     """Fetch ContactForm object based on buddy_id"""
+    if isinstance(buddy_id, ContactForm):
+        # Already loaded, e.g. `contact.buddy` with select_related()
+        return buddy_id
     try:
         return ContactForm.objects.get(id=buddy_id)
     except ContactForm.DoesNotExist:
@@ -1,3 +1,20 @@
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from apps.modules.weather import default_forecast
+from forcast.models import WeatherSnapshot
+
+
+class ForecastPageTests(TestCase):
+    def setUp(self):
+        WeatherSnapshot.objects.create(
+            source=WeatherSnapshot.SOURCE_FORECAST, location='48.77,2.27', data=default_forecast(),
+        )
+        WeatherSnapshot.objects.create(source=WeatherSnapshot.SOURCE_RECOSANTE_J1, location='92019', data={'raep': {}})
+
+    def test_invalid_location_falls_back_to_the_default(self):
+        for params in ({'lat': 'abc', 'lon': '2.27'}, {'lat': '48.77'}, {'lat': '95', 'lon': '2.27'}):
+            response = self.client.get(reverse('forcast'), params)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertIsNotNone(response.context['data_updated_at'])
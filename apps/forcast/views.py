@@ -1,15 +1,11 @@
-import os
-import requests
 import logging
-from typing import Dict, Any
-import dotenv
 from django.views.generic import TemplateView
-from apps.modules.forcast import WeatherData, RecosanteAPI
+from apps.modules.weather import WeatherData, RecosanteAPI, daily_outlook, get_heat_threshold, location_from_params
+from apps.modules.cache import round_location
+from forcast.models import WeatherSnapshot
+from forcast.snapshots import latest_data_many
 from web_project import TemplateLayout
 
-# Load environment variables from a .env file
-dotenv.load_dotenv()
-
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -19,24 +15,14 @@ class CombinedData(TemplateView):
         context = TemplateLayout.init(self, super().get_context_data(**kwargs))
         pollen_data = kwargs.get('pollen_data', {})
         # Fetch weather data
-        lat = self.request.GET.get('lat', 48.7651)
-        lon = self.request.GET.get('lon', 2.2666)
-
-        try:
-            weather_data_instance = WeatherData(lat=float(lat), lon=float(lon))
-            weather_data = weather_data_instance.get_weather_forecast()
-        except ValueError as e:
-            logger.error(f"Failed to fetch weather data: {e}")
-            weather_data = {
-                'plus1H': {'feels_like': 'N/A', 'temperature': 'N/A'},
-                'plus24H': {'feels_like': 'N/A', 'temperature': 'N/A'},
-                'min_temp': 'N/A',
-                'max_temp': 'N/A'
-            }
-
-        # Fetch pollution and pollen data
-        recosante_api = RecosanteAPI()
-        recosante_data = recosante_api.fetch_data()
+        lat, lon = location_from_params(self.request.GET)
+
+        if 'weather_data' in kwargs:
+            # Data already fetched once by get()
+            weather_data = kwargs['weather_data']
+            recosante_data = kwargs['recosante_data']
+        else:
+            weather_data, recosante_data, context['data_updated_at'] = self.fetch_data(lat, lon)
 
         # Extract pollution and pollen data
         pollution_data = recosante_data.get('indice_atmo', {})
@@ -79,18 +65,47 @@ class CombinedData(TemplateView):
         # Add weather forecast for the next 24 hours
         context['next_24H'] = weather_data.get('plus24H', {})
 
+        # Per-day outlook of the 5-day forecast, for heatwave warnings
+        context['heat_threshold'] = get_heat_threshold()
+        context['daily_outlook'] = daily_outlook(weather_data, context['heat_threshold'])
+        context['heatwave_hours'] = sum(day['hours_above'] for day in context['daily_outlook'])
+
         return context
 
+    @staticmethod
+    def fetch_data(lat, lon):
+        """
+        Read the latest forecast and J+1 Recosante snapshots stored by `manage.py poll_weather`,
+        missing ones are fetched from the upstream APIs concurrently.
+        """
+        default_weather = {
+            'plus1H': {'feels_like': 'N/A', 'temperature': 'N/A'},
+            'plus24H': {'feels_like': 'N/A', 'temperature': 'N/A'},
+            'min_temp': 'N/A',
+            'max_temp': 'N/A'
+        }
+        fetch_weather = WeatherData(lat=lat, lon=lon).get_weather_forecast
+
+        # J+1 pollution and pollen data for Châtenay-Malabry
+        recosante_api = RecosanteAPI(insee_code='92019', days_ahead=1)
+
+        data = latest_data_many({
+            'weather': (WeatherSnapshot.SOURCE_FORECAST, round_location(lat, lon), fetch_weather, default_weather),
+            'recosante': (
+                WeatherSnapshot.SOURCE_RECOSANTE_J1, recosante_api.params['insee'], recosante_api.fetch_data, {},
+            ),
+        })
+        weather_data, weather_updated_at = data['weather']
+        recosante_data, recosante_updated_at = data['recosante']
+
+        # Oldest timestamp of the data shown on the page
+        data_updated_at = min(filter(None, [weather_updated_at, recosante_updated_at]), default=None)
+        return weather_data, recosante_data, data_updated_at
+
     def get(self, request, *args, **kwargs):
-        lat = request.GET.get('lat', 48.7651)
-        lon = request.GET.get('lon', 2.2666)
-        
-        # Fetch data
-        weather_data_instance = WeatherData(lat=float(lat), lon=float(lon))
-        weather_data = weather_data_instance.get_weather_forecast()
+        lat, lon = location_from_params(request.GET)
 
-        recosante_api = RecosanteAPI()
-        recosante_data = recosante_api.fetch_data()
+        weather_data, recosante_data, data_updated_at = self.fetch_data(lat, lon)
 
         # Extract data
         pollution_data = recosante_data.get('indice_atmo', {})
@@ -102,7 +117,9 @@ class CombinedData(TemplateView):
             weather_data=weather_data,
             pollution_data=pollution_data,
             pollen_data=pollen_data,
-            episodes_pollution_data=episodes_pollution_data
+            episodes_pollution_data=episodes_pollution_data,
+            recosante_data=recosante_data,
+            data_updated_at=data_updated_at,
         )
 
         return self.render_to_response(context)
\ No newline at end of file
@@ -1,5 +1,8 @@
 from django.views.generic import TemplateView
-from apps.modules.streaming import WeatherData, RecosanteAPI
+from apps.modules.weather import WeatherData, RecosanteAPI, location_from_params
+from apps.modules.cache import round_location
+from forcast.models import WeatherSnapshot
+from forcast.snapshots import latest_data_many
 from web_project import TemplateLayout
 
 class CombinedData(TemplateView):
@@ -36,15 +39,23 @@ class CombinedData(TemplateView):
         return context
 
     def get(self, request, *args, **kwargs):
-        lat = request.GET.get('lat', 48.7651)
-        lon = request.GET.get('lon', 2.2666)
+        lat, lon = location_from_params(request.GET)
         
-        # Fetch data
-        weather_data_instance = WeatherData(lat=float(lat), lon=float(lon))
-        weather_data = weather_data_instance.get_weather()
-
+        # Read the latest snapshots stored by `manage.py poll_weather`, missing ones
+        # are fetched from the upstream APIs concurrently
+        weather_data_instance = WeatherData(lat=lat, lon=lon)
         recosante_api = RecosanteAPI()
-        recosante_data = recosante_api.fetch_data()
+        data = latest_data_many({
+            'weather': (
+                WeatherSnapshot.SOURCE_WEATHER, round_location(lat, lon),
+                weather_data_instance.get_weather, WeatherData._default_weather_response(),
+            ),
+            'recosante': (
+                WeatherSnapshot.SOURCE_RECOSANTE, recosante_api.params['insee'], recosante_api.fetch_data, {},
+            ),
+        })
+        weather_data, weather_updated_at = data['weather']
+        recosante_data, recosante_updated_at = data['recosante']
 
         # Extract data
         pollution_data = recosante_data.get('indice_atmo', {})
@@ -56,7 +67,9 @@ class CombinedData(TemplateView):
             weather_data=weather_data,
             pollution_data=pollution_data,
             pollen_data=pollen_data,
-            episodes_pollution_data=episodes_pollution_data
+            episodes_pollution_data=episodes_pollution_data,
+            # Oldest timestamp of the data shown on the page
+            data_updated_at=min(filter(None, [weather_updated_at, recosante_updated_at]), default=None),
         )
 
         return self.render_to_response(context)
\ No newline at end of file
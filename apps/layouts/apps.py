@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class LayoutsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.layouts"
+
+    def ready(self):
+        # Resolve the layout bootstrap classes once, rather than on the first requests
+        from web_project.template_helpers.theme import TemplateHelper  # pylint: disable=import-outside-toplevel
+
+        TemplateHelper.warm_layouts()
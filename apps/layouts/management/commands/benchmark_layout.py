@@ -0,0 +1,35 @@
+import timeit
+
+from django.core.management.base import BaseCommand
+from web_project import TemplateLayout
+from web_project.template_helpers import theme
+from web_project.template_helpers.theme import TemplateHelper
+
+class Command(BaseCommand):
+    help = 'Measure the per-request overhead of TemplateLayout.init, with and without the layout registry.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+
+        def layout_init():
+            TemplateLayout.init(None, {})
+
+        def blank_init():
+            # Pages on the blank layout, e.g. LoginView, init the layout twice
+            context = TemplateLayout.init(None, {})
+            TemplateHelper.set_layout("layout_blank.html", context)
+
+        def unregistered_init():
+            # Resolution of the bootstrap class on every call, as before the registry
+            theme._bootstrap_classes.clear()
+            theme._layout_contexts.clear()
+            TemplateLayout.init(None, {})
+
+        TemplateHelper.warm_layouts()
+        for name, function in (('registry', layout_init), ('blank page', blank_init), ('no registry', unregistered_init)):
+            elapsed = timeit.timeit(function, number=iterations)
+            self.stdout.write(f"{name:>12}: {elapsed / iterations * 1e6:.2f}µs per TemplateLayout.init")
+        TemplateHelper.warm_layouts()
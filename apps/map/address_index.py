@@ -0,0 +1,89 @@
+"""
+In-memory prefix index of the imported addresses, used by the address autocomplete.
+
+Labels are split into accent-free lowercase tokens. The index keeps the sorted list of
+distinct tokens with, for each one, the array of addresses containing it, so every
+query token is resolved with a binary search over the token prefixes. The index is
+built once per process and rebuilt when the version of the addresses changes.
+"""
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, List, Set
+
+from django.db.models import Count, Max
+
+from apps.modules.versioning import VersionedIndex, table_version
+from .models import Address
+
+DEFAULT_LIMIT = 5
+MAX_LIMIT = 20
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def normalize(text: str) -> List[str]:
+    """Lowercase, accent-free tokens of `text` ("Châtenay-Malabry" -> ["chatenay", "malabry"])."""
+    text = ''.join(char for char in unicodedata.normalize('NFKD', text.lower()) if not unicodedata.combining(char))
+    return _TOKEN_RE.findall(text)
+
+
+class AddressIndex:
+    def __init__(self, addresses):
+        self.features: List[Dict[str, Any]] = []
+        self.lengths = array('H')
+        postings: Dict[str, Set[int]] = {}
+        for address in addresses:
+            position = len(self.features)
+            self.features.append(address.to_feature())
+            self.lengths.append(len(address.label))
+            for token in normalize(address.label):
+                postings.setdefault(token, set()).add(position)
+        self.tokens = sorted(postings)
+        self.postings = [array('I', sorted(postings[token])) for token in self.tokens]
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def _matching(self, prefix: str) -> Set[int]:
+        """Addresses having a token starting with `prefix`."""
+        matches: Set[int] = set()
+        i = bisect_left(self.tokens, prefix)
+        while i < len(self.tokens) and self.tokens[i].startswith(prefix):
+            matches.update(self.postings[i])
+            i += 1
+        return matches
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+        """Features whose label has a token starting with each query token, shortest labels first."""
+        tokens = sorted(set(normalize(query)), key=len, reverse=True)
+        if not tokens:
+            return []
+        # Longest tokens first, they have the fewest matches
+        matches = self._matching(tokens[0])
+        for token in tokens[1:]:
+            if not matches:
+                break
+            matches &= self._matching(token)
+        ranked = sorted(matches, key=lambda position: (self.lengths[position], position))
+        return [self.features[position] for position in ranked[:limit]]
+
+
+def get_version() -> str:
+    """Imported, edited (`updated_at`) and deleted (count) addresses change the version, in every process."""
+    return table_version(Address.objects.all(), Max('updated_at'), Count('id'))
+
+
+_index = VersionedIndex(
+    'address', lambda: AddressIndex(Address.objects.order_by('label').iterator(chunk_size=2000)), get_version,
+)
+
+
+def get_index() -> AddressIndex:
+    """The process-wide index, rebuilt from the database when the addresses changed."""
+    return _index.get()
+
+
+def search(query: str, limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+    return get_index().search(query, min(max(limit, 1), MAX_LIMIT))
@@ -1,3 +1,18 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Address, CoolPlace
+
+
+@admin.register(Address)
+class AddressAdmin(admin.ModelAdmin):
+    list_display = ('label', 'postcode', 'lat', 'lon')
+    list_filter = ('postcode',)
+    search_fields = ('label', 'ban_id')
+    show_full_result_count = False
+
+
+@admin.register(CoolPlace)
+class CoolPlaceAdmin(admin.ModelAdmin):
+    list_display = ('name', 'kind', 'address', 'phone', 'lat', 'lon', 'updated_at')
+    list_filter = ('kind',)
+    search_fields = ('name', 'address')
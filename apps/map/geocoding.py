@@ -0,0 +1,121 @@
+"""
+Geocoding of free-text addresses, with the local address index first.
+
+Addresses are looked up in the imported BAN addresses (`address_index`), then in
+the given already-resolved addresses, and only then on api-adresse.data.gouv.fr:
+one /search/ call for a single address, one /search/csv/ call per batch otherwise.
+"""
+import csv
+import io
+import logging
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+import requests
+from django.conf import settings
+
+from apps.modules import http_client
+from . import address_index
+
+logger = logging.getLogger(__name__)
+
+Coordinates = Tuple[float, float]
+
+SEARCH_URL = 'https://api-adresse.data.gouv.fr/search/'
+CSV_URL = 'https://api-adresse.data.gouv.fr/search/csv/'
+# Upstream results scoring lower are ignored
+MIN_SCORE = 0.5
+DEFAULT_BATCH_SIZE = 1000
+
+
+def address_key(address: str) -> str:
+    """Key of an address ignoring case, accents and punctuation."""
+    return ' '.join(address_index.normalize(address))
+
+
+def upstream_enabled() -> bool:
+    return getattr(settings, 'GEOCODING_UPSTREAM', True)
+
+
+def _coordinates(feature) -> Coordinates:
+    lon, lat = feature['geometry']['coordinates']
+    return lat, lon
+
+
+def geocode_local(address: str) -> Optional[Coordinates]:
+    """Coordinates of the imported address whose label has all the words of `address`."""
+    features = address_index.search(address, 1)
+    if not features:
+        return None
+    # The index matches word prefixes, "1 rue" would also find "10 rue"
+    label = features[0]['properties']['label']
+    if set(address_index.normalize(address)) <= set(address_index.normalize(label)):
+        return _coordinates(features[0])
+    return None
+
+
+def geocode_upstream(address: str) -> Optional[Coordinates]:
+    try:
+        response = http_client.get(SEARCH_URL, params={'q': address, 'limit': 1})
+        response.raise_for_status()
+        features = response.json().get('features', [])
+    except (requests.RequestException, ValueError) as e:
+        logger.error(f"Geocoding of {address!r} failed: {e}")
+        return None
+    if features and features[0]['properties'].get('score', 0) >= MIN_SCORE:
+        return _coordinates(features[0])
+    return None
+
+
+def geocode(address: str, known: Optional[Mapping[str, Coordinates]] = None) -> Optional[Coordinates]:
+    """Coordinates of `address`, or None. `known` maps `address_key()`s to resolved coordinates."""
+    if len(address.strip()) < 3:
+        return None
+    coordinates = (known or {}).get(address_key(address)) or geocode_local(address)
+    if coordinates is None and upstream_enabled():
+        coordinates = geocode_upstream(address)
+    return coordinates
+
+
+def geocode_batch_upstream(addresses: Iterable[str]) -> Dict[str, Coordinates]:
+    """Resolve addresses with a single call to the CSV geocoder."""
+    content = io.StringIO()
+    writer = csv.writer(content)
+    writer.writerow(['address'])
+    writer.writerows([address] for address in addresses)
+    try:
+        response = http_client.request(
+            'POST', CSV_URL, files={'data': ('addresses.csv', content.getvalue().encode())},
+            data={'columns': 'address'},
+        )
+        response.raise_for_status()
+    except requests.RequestException as e:
+        logger.error(f"Batch geocoding failed: {e}")
+        return {}
+
+    resolved = {}
+    for row in csv.DictReader(io.StringIO(response.content.decode('utf-8-sig'))):
+        try:
+            if float(row.get('result_score') or 0) >= MIN_SCORE:
+                resolved[row['address']] = (float(row['latitude']), float(row['longitude']))
+        except (KeyError, ValueError):
+            continue
+    return resolved
+
+
+def geocode_many(addresses: Iterable[str], known: Optional[Mapping[str, Coordinates]] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, upstream: Optional[bool] = None) -> Dict[str, Optional[Coordinates]]:
+    """Coordinates of each distinct address, each one being resolved once."""
+    known = known or {}
+    upstream = upstream_enabled() if upstream is None else upstream
+    results: Dict[str, Optional[Coordinates]] = {}
+    missing = []
+    for address in set(addresses):
+        coordinates = known.get(address_key(address)) or geocode_local(address)
+        results[address] = coordinates
+        if coordinates is None and len(address.strip()) >= 3:
+            missing.append(address)
+
+    if missing and upstream:
+        for start in range(0, len(missing), batch_size):
+            results.update(geocode_batch_upstream(missing[start:start + batch_size]))
+    return results
@@ -0,0 +1,95 @@
+import csv
+import gzip
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.map.models import Address
+
+BATCH_SIZE = 2000
+UPDATE_FIELDS = ['housenumber', 'street', 'postcode', 'citycode', 'city', 'label', 'lat', 'lon', 'updated_at']
+
+
+def address_from_row(row) -> Address:
+    """Address of a row of the BAN CSV export (adresses-<département>.csv)."""
+    housenumber = f"{row['numero']} {row.get('rep', '')}".strip() if row.get('numero') not in (None, '', '99999') else ''
+    return Address(
+        ban_id=row['id'],
+        housenumber=housenumber,
+        street=row['nom_voie'],
+        postcode=row['code_postal'],
+        citycode=row['code_insee'],
+        city=row['nom_commune'],
+        label=f"{housenumber} {row['nom_voie']} {row['code_postal']} {row['nom_commune']}".strip(),
+        lat=float(row['lat']),
+        lon=float(row['lon']),
+    )
+
+
+class Command(BaseCommand):
+    help = 'Import a Base Adresse Nationale CSV extract (adresse.data.gouv.fr) for the address autocomplete.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV file, optionally gzipped, or '-' for stdin.")
+        parser.add_argument(
+            '--postcode', action='append', default=None,
+            help='Postcode to import, can be repeated (default: ADDRESS_POSTCODES).',
+        )
+        parser.add_argument(
+            '--replace', action='store_true',
+            help='Delete the addresses of these postcodes missing from the file.',
+        )
+
+    def open(self, path):
+        if path == '-':
+            return sys.stdin
+        if path.endswith('.gz'):
+            return gzip.open(path, 'rt', encoding='utf-8', newline='')
+        return open(path, encoding='utf-8', newline='')  # pylint: disable=consider-using-with
+
+    def handle(self, *args, **options):
+        postcodes = set(options['postcode'] or getattr(settings, 'ADDRESS_POSTCODES', []))
+        imported = skipped = 0
+        ban_ids = set()
+
+        try:
+            source = self.open(options['path'])
+        except OSError as e:
+            raise CommandError(f"Cannot read {options['path']}: {e}") from e
+
+        with source, transaction.atomic():
+            batch = []
+            for row in csv.DictReader(source, delimiter=';'):
+                if postcodes and row.get('code_postal') not in postcodes:
+                    continue
+                try:
+                    address = address_from_row(row)
+                except (KeyError, ValueError):
+                    skipped += 1
+                    continue
+                batch.append(address)
+                ban_ids.add(address.ban_id)
+                if len(batch) >= BATCH_SIZE:
+                    imported += self.save(batch)
+                    batch = []
+            imported += self.save(batch)
+
+            deleted = 0
+            if options['replace']:
+                stale = Address.objects.exclude(ban_id__in=ban_ids)
+                if postcodes:
+                    stale = stale.filter(postcode__in=postcodes)
+                deleted, _ = stale.delete()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{imported} addresses imported, {deleted} deleted, {skipped} invalid rows skipped."
+        ))
+
+    @staticmethod
+    def save(batch) -> int:
+        Address.objects.bulk_create(
+            batch, update_conflicts=True, unique_fields=['ban_id'], update_fields=UPDATE_FIELDS,
+        )
+        return len(batch)
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Address',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ban_id', models.CharField(max_length=50, unique=True)),
+                ('housenumber', models.CharField(blank=True, max_length=20)),
+                ('street', models.CharField(max_length=200)),
+                ('postcode', models.CharField(max_length=5)),
+                ('citycode', models.CharField(max_length=5)),
+                ('city', models.CharField(max_length=100)),
+                ('label', models.CharField(max_length=255)),
+                ('lat', models.FloatField()),
+                ('lon', models.FloatField()),
+            ],
+            options={
+                'ordering': ['label'],
+                'indexes': [models.Index(fields=['postcode'], name='address_postcode_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('map', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CoolPlace',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('kind', models.CharField(choices=[('public_places', 'Lieu public climatisé'), ('park', 'Parc'), ('drinking_water', 'Fontaine publique (potable)'), ('non_drinking_water', "Point d'eau non potable")], max_length=20)),
+                ('address', models.CharField(blank=True, max_length=255)),
+                ('phone', models.CharField(blank=True, max_length=20)),
+                ('lat', models.FloatField()),
+                ('lon', models.FloatField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['name'],
+                'indexes': [models.Index(fields=['kind'], name='coolplace_kind_idx')],
+            },
+        ),
+    ]
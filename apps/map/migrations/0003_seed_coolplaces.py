@@ -0,0 +1,50 @@
+from django.db import migrations
+
+# The places previously hardcoded in map.html and home_page.html. Coordinates come
+# from home_page.html when both pages listed a place, from map.html otherwise.
+PLACES = [
+    ("Centre Communal d’Action Sociale", 'public_places', "26 rue du Docteur Le Savoureux", "01 46 83 46 82",
+     48.7606, 2.2589),
+    ("Cinéma Le Rex", 'public_places', "364 avenue de la Division Leclerc", "01 40 83 16 85",
+     48.765820958051215, 2.259873405997262),
+    ("Espace Séniors", 'public_places', "291-293 avenue de la Division Leclerc", "01 46 32 46 69",
+     48.76464287485584, 2.2799412458230184),
+    ("Médiathèque", 'public_places', "7-9 rue des Vallées", "01 46 83 45 48", 48.7576, 2.2579),
+    ("Pavillon des Arts et du Patrimoine", 'public_places', "98 rue Jean Longuet", "01 47 02 75 22",
+     48.7672137222992, 2.279124161043493),
+    ("Coulée Verte", 'drinking_water', "Avenue Sully Prudhomme", "", 48.7677830136355, 2.2891088215439126),
+    ("Jardin de l’Aigle Blanc", 'drinking_water', "Rue de Chateaubriand", "", 48.77409876009363, 2.2691806285229026),
+    ("Jardins LaVallée", 'drinking_water', "Quartier LaVallée", "", 48.766645965325324, 2.2892076709756704),
+    ("Fontaine publique", 'non_drinking_water', "Centre-ville, Rue Jean Longuet", "",
+     48.769947175285594, 2.2803509895275607),
+    ("Fontaine publique", 'non_drinking_water', "Quartier Petit Châtenay, Place Allende", "", 48.7680, 2.2825),
+    ("Fontaine publique", 'non_drinking_water', "Quartier LaVallée, Place LaVallée", "", 48.7670, 2.2845),
+    ("Parc Henri Barbusse", 'park', "Parc Henri Barbusse, Châtenay-Malabry", "01 46 83 46 90", 48.7580, 2.3000),
+    ("Parc de la Hotoie", 'park', "Parc de la Hotoie, Châtenay-Malabry", "01 46 83 46 91", 48.7590, 2.3015),
+    ("Parc des Jardins", 'park', "Parc des Jardins, Châtenay-Malabry", "01 46 83 46 92", 48.7600, 2.3030),
+]
+
+
+def create_places(apps, schema_editor):
+    CoolPlace = apps.get_model('map', 'CoolPlace')
+    CoolPlace.objects.bulk_create([
+        CoolPlace(name=name, kind=kind, address=address, phone=phone, lat=lat, lon=lon)
+        for name, kind, address, phone, lat, lon in PLACES
+    ])
+
+
+def delete_places(apps, schema_editor):
+    CoolPlace = apps.get_model('map', 'CoolPlace')
+    for name, kind, address, _, _, _ in PLACES:
+        CoolPlace.objects.filter(name=name, kind=kind, address=address).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('map', '0002_coolplace'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_places, delete_places),
+    ]
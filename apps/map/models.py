@@ -1,3 +1,90 @@
 from django.db import models
 
-# Create your models here.
+
+class Address(models.Model):
+    """Address of the Base Adresse Nationale, imported with `manage.py import_addresses`."""
+
+    ban_id = models.CharField(max_length=50, unique=True)
+    housenumber = models.CharField(max_length=20, blank=True)
+    street = models.CharField(max_length=200)
+    postcode = models.CharField(max_length=5)
+    citycode = models.CharField(max_length=5)
+    city = models.CharField(max_length=100)
+    label = models.CharField(max_length=255)
+    lat = models.FloatField()
+    lon = models.FloatField()
+    # Part of the version of the autocomplete index, see address_index.get_version()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['label']
+        indexes = [
+            models.Index(fields=['postcode'], name='address_postcode_idx'),
+        ]
+
+    def __str__(self):
+        return self.label
+
+    def to_feature(self) -> dict:
+        """GeoJSON feature shaped like the results of api-adresse.data.gouv.fr/search/."""
+        return {
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': [self.lon, self.lat]},
+            'properties': {
+                'label': self.label,
+                'score': 1.0,
+                'housenumber': self.housenumber,
+                'id': self.ban_id,
+                'name': f"{self.housenumber} {self.street}".strip(),
+                'postcode': self.postcode,
+                'citycode': self.citycode,
+                'city': self.city,
+                'street': self.street,
+                'type': 'housenumber' if self.housenumber else 'street',
+            },
+        }
+
+
+class CoolPlace(models.Model):
+    """Place where to cool down or find water during a heat wave, shown on the maps."""
+
+    KIND_PUBLIC_PLACE = 'public_places'
+    KIND_PARK = 'park'
+    KIND_DRINKING_WATER = 'drinking_water'
+    KIND_NON_DRINKING_WATER = 'non_drinking_water'
+    KIND_CHOICES = [
+        (KIND_PUBLIC_PLACE, 'Lieu public climatisé'),
+        (KIND_PARK, 'Parc'),
+        (KIND_DRINKING_WATER, 'Fontaine publique (potable)'),
+        (KIND_NON_DRINKING_WATER, "Point d'eau non potable"),
+    ]
+
+    name = models.CharField(max_length=200)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    address = models.CharField(max_length=255, blank=True)
+    phone = models.CharField(max_length=20, blank=True)
+    lat = models.FloatField()
+    lon = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['name']
+        indexes = [
+            models.Index(fields=['kind'], name='coolplace_kind_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def to_feature(self) -> dict:
+        return {
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': [self.lon, self.lat]},
+            'properties': {
+                'id': self.pk,
+                'name': self.name,
+                'type': self.kind,
+                'address': self.address,
+                'phone': self.phone,
+            },
+        }
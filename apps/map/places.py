@@ -0,0 +1,157 @@
+"""
+In-memory indexes of the cool places, serving the map markers and nearest places.
+
+Places are bucketed in the `geo.cell_of` cells of their coordinates, so a bounding
+box query only looks at the cells it covers instead of every place, and each type
+of place has a k-d tree over the projected coordinates for k-nearest queries. The
+indexes are built once per process and rebuilt when the version of the places changes.
+"""
+import heapq
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.db.models import Count, Max
+
+from apps.modules import geo
+from apps.modules.versioning import VersionedIndex, table_version
+from .models import CoolPlace
+
+BBox = Tuple[float, float, float, float]  # west, south, east, north
+DEFAULT_K = 5
+MAX_K = 50
+
+
+class KDTree:
+    """
+    Static 2-d tree of `(x, y, position)` points, in metres (`geo.project`).
+
+    The points are kept in a single list laid out like a balanced tree: each range
+    is split at its median on alternating axes, so no node objects are created and
+    a k-nearest query only visits O(k + log n) points on average.
+    """
+
+    def __init__(self, points: Iterable[Tuple[float, float, int]]):
+        self.points = list(points)
+        self._build(0, len(self.points), 0)
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _build(self, low: int, high: int, axis: int):
+        if high - low <= 1:
+            return
+        self.points[low:high] = sorted(self.points[low:high], key=itemgetter(axis))
+        middle = (low + high) // 2
+        self._build(low, middle, 1 - axis)
+        self._build(middle + 1, high, 1 - axis)
+
+    def nearest(self, x: float, y: float, k: int) -> List[Tuple[float, int]]:
+        """(squared distance, position) of the `k` points closest to (x, y), closest first."""
+        heap: List[Tuple[float, int]] = []  # k best so far, as (-squared distance, position)
+        stack = [(0, len(self.points), 0)]
+        while stack:
+            low, high, axis = stack.pop()
+            if low >= high:
+                continue
+            middle = (low + high) // 2
+            point_x, point_y, position = self.points[middle]
+            squared = (point_x - x) ** 2 + (point_y - y) ** 2
+            if len(heap) < k:
+                heapq.heappush(heap, (-squared, position))
+            elif squared < -heap[0][0]:
+                heapq.heapreplace(heap, (-squared, position))
+            delta = (x - point_x) if axis == 0 else (y - point_y)
+            near, far = ((low, middle), (middle + 1, high)) if delta < 0 else ((middle + 1, high), (low, middle))
+            # The far side may only hold closer points when the splitting line is closer than the k-th best
+            if len(heap) < k or delta * delta < -heap[0][0]:
+                stack.append((*far, 1 - axis))
+            stack.append((*near, 1 - axis))
+        return sorted((-squared, position) for squared, position in heap)
+
+
+class PlaceIndex:
+    def __init__(self, places):
+        self.features: List[Dict[str, Any]] = []
+        self.kinds: List[str] = []
+        self.points: List[Tuple[float, float]] = []
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        projected: Dict[str, List[Tuple[float, float, int]]] = {}
+        for place in places:
+            position = len(self.features)
+            self.features.append(place.to_feature())
+            self.kinds.append(place.kind)
+            self.points.append((place.lat, place.lon))
+            self.cells.setdefault(geo.cell_of(place.lat, place.lon), []).append(position)
+            projected.setdefault(place.kind, []).append((*geo.project(place.lat, place.lon), position))
+        self.trees = {kind: KDTree(points) for kind, points in projected.items()}
+        # Queries for every type search a single tree
+        self.tree = KDTree(point for points in projected.values() for point in points)
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def _candidates(self, bbox: BBox) -> Iterable[int]:
+        """Positions of the places in the cells intersecting `bbox`."""
+        west, south, east, north = bbox
+        x0, y0 = geo.cell_of(south, west)
+        x1, y1 = geo.cell_of(north, east)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self.cells):
+            # Wide boxes cover more cells than there are occupied ones
+            for (x, y), positions in self.cells.items():
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    yield from positions
+        else:
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    yield from self.cells.get((x, y), ())
+
+    def search(self, bbox: Optional[BBox] = None, kinds: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """Features of the places inside `bbox` (every place when None) of one of `kinds` (any when empty)."""
+        kinds = set(kinds)
+        if bbox is None:
+            positions = range(len(self.features))
+        else:
+            west, south, east, north = bbox
+            positions = sorted(
+                position for position in self._candidates(bbox)
+                if south <= self.points[position][0] <= north and west <= self.points[position][1] <= east
+            )
+        return [self.features[position] for position in positions if not kinds or self.kinds[position] in kinds]
+
+    def nearest(self, lat: float, lon: float, k: int = DEFAULT_K, kinds: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """
+        Features of the `k` places closest to (lat, lon) of one of `kinds` (any when empty),
+        closest first, with their `distance` in metres in the properties.
+        """
+        x, y = geo.project(lat, lon)
+        kinds = list(kinds)
+        trees = [self.trees[kind] for kind in kinds if kind in self.trees] if kinds else [self.tree]
+        closest = heapq.nsmallest(k, (found for tree in trees for found in tree.nearest(x, y, k)))
+        results = []
+        for _, position in closest:
+            feature = self.features[position]
+            place_lat, place_lon = self.points[position]
+            distance = round(geo.distance(lat, lon, place_lat, place_lon))
+            results.append({**feature, 'properties': {**feature['properties'], 'distance': distance}})
+        return results
+
+
+def get_version() -> str:
+    """Added, edited (`updated_at`) and deleted (count) places change the version, in every process."""
+    return table_version(CoolPlace.objects.all(), Max('updated_at'), Count('id'))
+
+
+_index = VersionedIndex('cool places', lambda: PlaceIndex(CoolPlace.objects.order_by('name', 'id')), get_version)
+
+
+def get_index() -> PlaceIndex:
+    """The process-wide index, rebuilt from the database when the places changed."""
+    return _index.get()
+
+
+def search(bbox: Optional[BBox] = None, kinds: Iterable[str] = ()) -> List[Dict[str, Any]]:
+    return get_index().search(bbox, kinds)
+
+
+def nearest(lat: float, lon: float, k: int = DEFAULT_K, kinds: Iterable[str] = ()) -> List[Dict[str, Any]]:
+    return get_index().nearest(lat, lon, min(max(k, 1), MAX_K), kinds)
@@ -1,3 +1,183 @@
-from django.test import TestCase
+import os
+import random
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.modules.cache import make_key
+from apps.modules.weather import WeatherData
+from forcast.models import WeatherSnapshot
+from . import address_index, places
+from .models import Address, CoolPlace
+
+BAN_HEADER = 'id;id_fantoir;numero;rep;nom_voie;code_postal;code_insee;nom_commune;x;y;lon;lat'
+BAN_ROWS = [
+    '92019_0420_00012;92019_0420;12;;Rue Jean Longuet;92290;92019;Châtenay-Malabry;0;0;2.2637;48.7663',
+    '92019_0420_00014_bis;92019_0420;14;bis;Rue Jean Longuet;92290;92019;Châtenay-Malabry;0;0;2.2639;48.7661',
+    '92019_0105_00003;92019_0105;3;;Avenue de la Division Leclerc;92290;92019;Châtenay-Malabry;0;0;2.2710;48.7700',
+    '92019_0230_00001;92019_0230;1;;Place de l’Église;92290;92019;Châtenay-Malabry;0;0;2.2650;48.7650',
+    '92002_0010_00005;92002_0010;5;;Rue Jean Longuet;92160;92002;Antony;0;0;2.2960;48.7540',
+    '92019_9999_00001;92019_9999;1;;Rue sans coordonnées;92290;92019;Châtenay-Malabry;0;0;;',
+]
+
+
+class AddressIndexTests(TestCase):
+    def setUp(self):
+        caches['addresses'].clear()
+        self.import_rows(BAN_ROWS)
+
+    def import_rows(self, rows):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as f:
+            f.write('\n'.join([BAN_HEADER, *rows]) + '\n')
+        self.addCleanup(os.unlink, f.name)
+        with open(os.devnull, 'w') as devnull:
+            call_command('import_addresses', f.name, stdout=devnull)
+
+    def labels(self, query, **kwargs):
+        return [feature['properties']['label'] for feature in address_index.search(query, **kwargs)]
+
+    def test_import(self):
+        # Other postcodes and rows without coordinates are skipped
+        self.assertEqual(Address.objects.count(), 4)
+        address = Address.objects.get(ban_id='92019_0420_00014_bis')
+        self.assertEqual(address.label, '14 bis Rue Jean Longuet 92290 Châtenay-Malabry')
+
+    def test_prefix_search(self):
+        self.assertEqual(self.labels('12 rue jean lon'), ['12 Rue Jean Longuet 92290 Châtenay-Malabry'])
+        self.assertEqual(len(self.labels('longuet')), 2)
+        self.assertEqual(self.labels('eglise chatenay'), ['1 Place de l’Église 92290 Châtenay-Malabry'])
+        self.assertEqual(self.labels('rue inconnue'), [])
+        self.assertEqual(len(self.labels('chatenay', limit=2)), 2)
+
+    def test_index_is_rebuilt_on_change(self):
+        self.assertEqual(self.labels('leclerc')[0], '3 Avenue de la Division Leclerc 92290 Châtenay-Malabry')
+
+        Address.objects.filter(ban_id='92019_0105_00003').delete()
+
+        self.assertEqual(self.labels('leclerc'), [])
+
+    def test_import_by_another_process_is_seen(self):
+        self.assertEqual(self.labels('voltaire'), [])
+        # Like an import run by `manage.py` in another process, with its own caches
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                                   'LOCATION': 'import-process'}}):
+            self.import_rows([
+                '92019_0700_00003;92019_0700;3;;Avenue Voltaire;92290;92019;Châtenay-Malabry;0;0;2.2700;48.7700',
+                # Same address, renamed street
+                '92019_0420_00012;92019_0420;12;;Rue Jean Longuet prolongée;92290;92019;Châtenay-Malabry;0;0;'
+                '2.2637;48.7663',
+            ])
+
+        self.assertEqual(self.labels('voltaire'), ['3 Avenue Voltaire 92290 Châtenay-Malabry'])
+        self.assertEqual(self.labels('prolongee'), ['12 Rue Jean Longuet prolongée 92290 Châtenay-Malabry'])
+
+    @override_settings(ADDRESS_AUTOCOMPLETE_FALLBACK=False)
+    def test_autocomplete_view(self):
+        response = self.client.get(reverse('address_autocomplete'), {'q': '14 Jean'})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['type'], 'FeatureCollection')
+        feature, = data['features']
+        self.assertEqual(feature['geometry']['coordinates'], [2.2639, 48.7661])
+        self.assertEqual(feature['properties']['housenumber'], '14 bis')
+        self.assertEqual(self.client.get(reverse('address_autocomplete'), {'q': 'ru'}).json()['features'], [])
+
+    def test_upstream_fallback_on_miss(self):
+        upstream = [{'type': 'Feature', 'properties': {'label': '2 Rue Neuve 92290 Châtenay-Malabry'}}]
+        with mock.patch('apps.volonteers.views.search_upstream', return_value=upstream) as search_upstream:
+            self.client.get(reverse('address_autocomplete'), {'q': 'rue neuve'})
+            response = self.client.get(reverse('address_autocomplete'), {'q': 'Rue Neuve'})
+            self.client.get(reverse('address_autocomplete'), {'q': 'longuet'})
+
+        self.assertEqual(response.json()['features'], upstream)
+        # Cached per normalized query, and never called for local matches
+        search_upstream.assert_called_once()
+        # Apart from the weather entries, which it must not evict
+        key = make_key('addresses', 'rue+neuve', 5)
+        self.assertIsNotNone(caches['addresses'].get(key))
+        self.assertIsNone(caches['weather'].get(key))
+
+
+class CoolPlaceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        CoolPlace.objects.all().delete()
+        CoolPlace.objects.bulk_create([
+            CoolPlace(name='Médiathèque', kind=CoolPlace.KIND_PUBLIC_PLACE, lat=48.7576, lon=2.2579),
+            CoolPlace(name='Coulée Verte', kind=CoolPlace.KIND_DRINKING_WATER, lat=48.7678, lon=2.2891),
+            CoolPlace(name='Parc de Sceaux', kind=CoolPlace.KIND_PARK, lat=48.7740, lon=2.3000),
+            CoolPlace(name='Fontaine de Nantes', kind=CoolPlace.KIND_DRINKING_WATER, lat=47.2184, lon=-1.5536),
+        ])
+
+    def names(self, **params):
+        response = self.client.get(reverse('map_places'), params)
+        self.assertEqual(response.status_code, 200)
+        return [feature['properties']['name'] for feature in response.json()['features']]
+
+    def test_bbox_and_type_filters(self):
+        bbox = '2.25,48.75,2.29,48.77'
+        self.assertEqual(self.names(bbox=bbox), ['Coulée Verte', 'Médiathèque'])
+        self.assertEqual(self.names(bbox=bbox, type='drinking_water'), ['Coulée Verte'])
+        self.assertEqual(self.names(bbox=bbox, type='park,public_places'), ['Médiathèque'])
+        self.assertEqual(len(self.names()), 4)
+        self.assertEqual(self.names(bbox='-5,40,8,51', type='drinking_water'), ['Coulée Verte', 'Fontaine de Nantes'])
+
+    def test_invalid_parameters(self):
+        for params in ({'bbox': '2.25,48.75'}, {'bbox': '2.29,48.75,2.25,48.77'}, {'type': 'pool'}):
+            self.assertEqual(self.client.get(reverse('map_places'), params).status_code, 400)
+
+    def test_etag_follows_the_places(self):
+        response = self.client.get(reverse('map_places'), {'bbox': '2.25,48.75,2.29,48.77'})
+        etag = response['ETag']
+        self.assertEqual(self.client.get(
+            reverse('map_places'), {'bbox': '2.25,48.75,2.29,48.77'}, HTTP_IF_NONE_MATCH=etag,
+        ).status_code, 304)
+
+        # bulk_create() sends no signal, like a place added by another process
+        CoolPlace.objects.bulk_create([
+            CoolPlace(name='Piscine', kind=CoolPlace.KIND_PUBLIC_PLACE, lat=48.7600, lon=2.2700),
+        ])
+
+        response = self.client.get(reverse('map_places'), {'bbox': '2.25,48.75,2.29,48.77'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Piscine', [feature['properties']['name'] for feature in response.json()['features']])
+
+    def test_map_pages_have_no_hardcoded_places(self):
+        # Stored snapshots keep the home page from calling the weather APIs
+        WeatherSnapshot.objects.create(source=WeatherSnapshot.SOURCE_RECOSANTE, location='92019', data={'raep': {}})
+        WeatherSnapshot.objects.create(
+            source=WeatherSnapshot.SOURCE_WEATHER, location='48.77,2.27', data=WeatherData._default_weather_response(),
+        )
+        for name in ('map', 'index'):
+            response = self.client.get(reverse(name))
+            self.assertContains(response, reverse('map_places'))
+            self.assertNotContains(response, 'Cinéma Le Rex')
+
+    def test_nearest_places(self):
+        response = self.client.get(reverse('map_nearest_places'), {'lat': 48.7663, 'lon': 2.2637, 'k': 2})
+
+        features = response.json()['features']
+        self.assertEqual([feature['properties']['name'] for feature in features], ['Médiathèque', 'Coulée Verte'])
+        self.assertAlmostEqual(features[0]['properties']['distance'], 1056, delta=5)
+        drinking = self.client.get(reverse('map_nearest_places'), {'lat': 47.2, 'lon': -1.5, 'type': 'drinking_water'})
+        self.assertEqual(
+            [feature['properties']['name'] for feature in drinking.json()['features']],
+            ['Fontaine de Nantes', 'Coulée Verte'],
+        )
+        for params in ({'lat': 48.7}, {'lat': 'nord', 'lon': 2.2}, {'lat': 48.7, 'lon': 2.2, 'k': 'all'}):
+            self.assertEqual(self.client.get(reverse('map_nearest_places'), params).status_code, 400)
+
+    def test_kd_tree_matches_a_linear_scan(self):
+        rng = random.Random(0)
+        points = [(rng.uniform(0, 10000), rng.uniform(0, 10000), position) for position in range(500)]
+        tree = places.KDTree(points)
+        for _ in range(50):
+            x, y = rng.uniform(-1000, 11000), rng.uniform(-1000, 11000)
+            expected = sorted(((px - x) ** 2 + (py - y) ** 2, position) for px, py, position in points)[:7]
+            self.assertEqual(tree.nearest(x, y, 7), expected)
+        self.assertEqual(places.KDTree([]).nearest(0, 0, 3), [])
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import MapView
+from .views import MapView, cool_places, nearest_places
 
 
 
@@ -10,5 +10,7 @@ urlpatterns = [
         "map",
       MapView.as_view(template_name="map.html"),
         name="map",
-    )
+    ),
+    path("map/places", cool_places, name="map_places"),
+    path("map/places/nearest", nearest_places, name="map_nearest_places"),
 ]
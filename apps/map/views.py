@@ -1,5 +1,24 @@
+import hashlib
+import json
+import math
+from typing import Any, Callable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_safe
 from django.views.generic import TemplateView
+
+from apps.modules.page_cache import DEFAULT_PAGE_MAX_AGE
 from web_project import TemplateLayout
+from . import places
+from .models import CoolPlace
+
+# Bounding boxes are widened to this many decimals (~1 km), so nearby viewports share a cached response
+BBOX_PRECISION = 2
+PLACES_CACHE_TIMEOUT = 24 * 60 * 60
 
 
 class MapView(TemplateView):
@@ -10,3 +29,100 @@ class MapView(TemplateView):
         context['default_location'] = [48.765, 2.266]  # Châtenay-Malabry coordinates
         context['default_location_name'] = "Châtenay-Malabry"
         return context
+
+
+def parse_bbox(value: Optional[str]) -> Optional[places.BBox]:
+    """`west,south,east,north` in degrees, widened to BBOX_PRECISION decimals."""
+    if not value:
+        return None
+    try:
+        west, south, east, north = (float(part) for part in value.split(','))
+    except ValueError as e:
+        raise ValueError("bbox must be west,south,east,north") from e
+    if not (-180 <= west <= east <= 180 and -90 <= south <= north <= 90):
+        raise ValueError("bbox out of range")
+    scale = 10 ** BBOX_PRECISION
+    return (math.floor(west * scale) / scale, math.floor(south * scale) / scale,
+            math.ceil(east * scale) / scale, math.ceil(north * scale) / scale)
+
+
+def parse_kinds(value: Optional[str]) -> List[str]:
+    """Comma-separated place types, all of them when empty."""
+    kinds = sorted({kind for kind in (value or '').split(',') if kind and kind != 'all'})
+    known = {kind for kind, _ in CoolPlace.KIND_CHOICES}
+    if not set(kinds) <= known:
+        raise ValueError(f"type must be among {', '.join(sorted(known))}")
+    return kinds
+
+
+def parse_position(request) -> Tuple[float, float]:
+    try:
+        lat, lon = float(request.GET['lat']), float(request.GET['lon'])
+    except (KeyError, ValueError) as e:
+        raise ValueError("lat and lon must be numbers") from e
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError("lat or lon out of range")
+    return lat, lon
+
+
+def parse_k(value: Optional[str]) -> int:
+    """Number of nearest places, DEFAULT_K when empty, clamped to 1..MAX_K."""
+    try:
+        k = int(value) if value else places.DEFAULT_K
+    except ValueError as e:
+        raise ValueError("k must be an integer") from e
+    return min(max(k, 1), places.MAX_K)
+
+
+def places_response(request, key_parts: Tuple[Any, ...], build: Callable[[], dict],
+                    store: bool = True) -> HttpResponse:
+    """
+    JSON response of `build()`, validated with an ETag on the places version.
+
+    Clients having the response of the same `key_parts` get a 304 without touching
+    the index. With `store`, responses are also kept in the cache for other clients.
+    """
+    key = hashlib.md5('|'.join(str(part) for part in (places.get_version(), *key_parts)).encode()).hexdigest()
+    etag = quote_etag(key)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        content = cache.get(f'cool_places:response:{key}') if store else None
+        if content is None:
+            content = json.dumps(build(), ensure_ascii=False)
+            if store:
+                cache.set(f'cool_places:response:{key}', content, PLACES_CACHE_TIMEOUT)
+        response = HttpResponse(content, content_type='application/json')
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'PAGE_MAX_AGE', DEFAULT_PAGE_MAX_AGE))
+    return response
+
+
+@require_safe
+def cool_places(request):
+    """GeoJSON FeatureCollection of the cool places inside `bbox`, optionally of the given `type`s."""
+    try:
+        bbox = parse_bbox(request.GET.get('bbox'))
+        kinds = parse_kinds(request.GET.get('type'))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return places_response(request, ('bbox', bbox, ','.join(kinds)), lambda: {
+        'type': 'FeatureCollection', 'bbox': bbox, 'features': places.search(bbox, kinds),
+    })
+
+
+@require_safe
+def nearest_places(request):
+    """
+    GeoJSON FeatureCollection of the `k` cool places closest to `lat`, `lon`, optionally
+    of the given `type`s, closest first with their `distance` in metres.
+    """
+    try:
+        lat, lon = parse_position(request)
+        kinds = parse_kinds(request.GET.get('type'))
+        k = parse_k(request.GET.get('k'))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    # Positions are too varied to be worth caching, lookups take well under a millisecond
+    return places_response(request, ('nearest', lat, lon, ','.join(kinds), k), lambda: {
+        'type': 'FeatureCollection', 'features': places.nearest(lat, lon, k, kinds),
+    }, store=False)
@@ -0,0 +1,94 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+# Overall time a page may spend waiting on upstream APIs, in seconds
+DEFAULT_BUDGET = 4.0
+THREAD_NAME_PREFIX = 'upstream'
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide, bounded pool used for upstream calls."""
+    global _executor  # pylint: disable=global-statement
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'UPSTREAM_MAX_WORKERS', DEFAULT_MAX_WORKERS),
+                thread_name_prefix=THREAD_NAME_PREFIX,
+            )
+    return _executor
+
+
+def get_timeout(source: str) -> Optional[float]:
+    return getattr(settings, 'UPSTREAM_TIMEOUTS', {}).get(source)
+
+
+class UpstreamBatch:
+    """
+    Issue all upstream calls of a page at once and collect their results.
+
+    Calls start as soon as they are added. Calls sharing the same `key` are only
+    executed once per batch. `run()` waits at most `budget` seconds overall and at
+    most the per-call timeout for each call; a call that fails or runs late yields
+    its `default`. Late calls keep running in the pool, so their result still
+    lands in the upstream cache for the next request.
+    """
+
+    def __init__(self, budget: Optional[float] = None):
+        self.budget = budget if budget is not None else getattr(settings, 'UPSTREAM_BUDGET', DEFAULT_BUDGET)
+        self.started = time.monotonic()
+        self._futures: Dict[Hashable, Future] = {}
+        self._calls: Dict[str, Tuple[Hashable, Optional[float], Any]] = {}
+
+    def add(self, name: str, key: Hashable, func: Callable[[], Any],
+            timeout: Optional[float] = None, default: Any = None):
+        if key not in self._futures:
+            self._futures[key] = self._submit(func)
+        self._calls[name] = (key, timeout, default)
+
+    @staticmethod
+    def _submit(func: Callable[[], Any]) -> Future:
+        if not threading.current_thread().name.startswith(THREAD_NAME_PREFIX):
+            return get_executor().submit(func)
+        # Already running inside the pool: waiting on another pool task could
+        # deadlock once every worker is busy, so run the call inline instead.
+        future = Future()
+        try:
+            future.set_result(func())
+        except Exception as e:  # pylint: disable=broad-except
+            future.set_exception(e)
+        return future
+
+    def run(self) -> Dict[str, Any]:
+        deadline = self.started + self.budget
+        results = {}
+        for name, (key, timeout, default) in self._calls.items():
+            call_deadline = deadline if timeout is None else min(deadline, self.started + timeout)
+            try:
+                results[name] = self._futures[key].result(timeout=max(0, call_deadline - time.monotonic()))
+            except FutureTimeoutError:
+                logger.warning(f"Upstream call {name} did not answer within its time budget")
+                results[name] = default
+            except Exception as e:  # pylint: disable=broad-except
+                logger.error(f"Upstream call {name} failed: {e}")
+                results[name] = default
+        return results
+
+
+def gather(calls: Dict[str, Tuple[Hashable, Callable[[], Any]]], budget: Optional[float] = None,
+           default: Any = None) -> Dict[str, Any]:
+    """Shortcut running `{name: (key, func)}` concurrently in a single batch."""
+    batch = UpstreamBatch(budget)
+    for name, (key, func) in calls.items():
+        batch.add(name, key, func, default=default)
+    return batch.run()
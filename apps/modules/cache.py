@@ -0,0 +1,176 @@
+import logging
+import threading
+import time
+from datetime import date
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import InvalidCacheBackendError, caches
+
+logger = logging.getLogger(__name__)
+
+# Default freshness (in seconds) for each upstream source
+DEFAULT_TTLS = {
+    'weather': 10 * 60,
+    'forecast': 30 * 60,
+    'recosante': 60 * 60,
+    'addresses': 24 * 60 * 60,
+}
+# How long an expired entry may still be served while it is being refreshed
+DEFAULT_STALE_TTL = 60 * 60
+# Upper bound for a background refresh, after which another worker may retry
+REFRESH_LOCK_TIMEOUT = 30
+
+STAT_KINDS = ('hits', 'misses', 'stale')
+
+
+# Sources kept out of the 'weather' cache, so they never evict the weather entries
+DEFAULT_SOURCE_CACHE_ALIASES = {
+    'addresses': 'addresses',
+}
+
+
+def get_cache(source: Optional[str] = None):
+    """Return the cache used for upstream responses of `source` ('weather' alias, or 'default')."""
+    aliases = getattr(settings, 'UPSTREAM_CACHE_ALIASES', DEFAULT_SOURCE_CACHE_ALIASES)
+    alias = aliases.get(source) or getattr(settings, 'WEATHER_CACHE_ALIAS', 'weather')
+    try:
+        return caches[alias]
+    except InvalidCacheBackendError:
+        return caches['default']
+
+
+def get_stats_cache():
+    """Return the cache of the hit/miss counters ('stats' alias, or 'default'), never culled by the data."""
+    alias = getattr(settings, 'WEATHER_STATS_CACHE_ALIAS', 'stats')
+    try:
+        return caches[alias]
+    except InvalidCacheBackendError:
+        return caches['default']
+
+
+def get_ttl(source: str) -> int:
+    ttls = getattr(settings, 'WEATHER_CACHE_TTLS', {})
+    return ttls.get(source, DEFAULT_TTLS.get(source, DEFAULT_TTLS['weather']))
+
+
+def get_stale_ttl() -> int:
+    return getattr(settings, 'WEATHER_CACHE_STALE_TTL', DEFAULT_STALE_TTL)
+
+
+def round_location(lat: float, lon: float, precision: int = 2) -> str:
+    """Round coordinates (~1 km at 2 decimals) so nearby requests share an entry."""
+    return f"{round(float(lat), precision):.{precision}f},{round(float(lon), precision):.{precision}f}"
+
+
+def make_key(source: str, *parts: Any) -> str:
+    return ':'.join(['upstream', source, *(str(part) for part in parts)])
+
+
+def _stat_key(source: str, kind: str) -> str:
+    return make_key('stats', source, kind)
+
+
+def _record(source: str, kind: str):
+    cache = get_stats_cache()
+    key = _stat_key(source, kind)
+    try:
+        cache.add(key, 0, None)
+        cache.incr(key)
+    except ValueError:
+        # The counter was evicted between add() and incr(); start over.
+        cache.set(key, 1, None)
+
+
+def get_stats(sources: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, int]]:
+    """Return hit/miss/stale counters per source."""
+    cache = get_stats_cache()
+    sources = list(sources or DEFAULT_TTLS)
+    keys = {_stat_key(source, kind): (source, kind) for source in sources for kind in STAT_KINDS}
+    values = cache.get_many(list(keys))
+    stats = {source: {kind: 0 for kind in STAT_KINDS} for source in sources}
+    for key, (source, kind) in keys.items():
+        stats[source][kind] = values.get(key, 0)
+    return stats
+
+
+def reset_stats(sources: Optional[Iterable[str]] = None):
+    sources = list(sources or DEFAULT_TTLS)
+    get_stats_cache().delete_many([_stat_key(source, kind) for source in sources for kind in STAT_KINDS])
+
+
+def _refresh(cache, source: str, key: str, fetch: Callable[[], Any], is_valid: Callable[[Any], bool]) -> Any:
+    value = fetch()
+    if is_valid(value):
+        entry = {'value': value, 'fetched_at': time.time()}
+        cache.set(key, entry, get_ttl(source) + get_stale_ttl())
+    else:
+        # Never cache fallback responses, the next request should retry upstream.
+        logger.warning(f"Not caching invalid {source} response for {key}")
+    return value
+
+
+def _refresh_in_background(cache, source: str, key: str, fetch: Callable[[], Any],
+                           is_valid: Callable[[Any], bool]):
+    lock_key = f"{key}:refreshing"
+    # cache.add() is atomic, so a single worker refreshes a given entry at a time.
+    if not cache.add(lock_key, 1, REFRESH_LOCK_TIMEOUT):
+        return
+
+    def run():
+        try:
+            _refresh(cache, source, key, fetch, is_valid)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.error(f"Background refresh of {key} failed: {e}")
+        finally:
+            cache.delete(lock_key)
+
+    threading.Thread(target=run, name=f"refresh-{source}", daemon=True).start()
+
+
+def cached_fetch(source: str, key_parts: Iterable[Any], fetch: Callable[[], Any],
+                 is_valid: Callable[[Any], bool] = bool) -> Any:
+    """
+    Return the cached response of `fetch` for `source` and `key_parts`.
+
+    Fresh entries are returned directly. Expired entries that are still within the
+    stale window are returned immediately while a background thread refreshes them,
+    so a user never waits on an upstream refresh once a location has been seen.
+    """
+    cache = get_cache(source)
+    key = make_key(source, *key_parts)
+    entry = cache.get(key)
+
+    if entry is not None:
+        if time.time() - entry['fetched_at'] < get_ttl(source):
+            _record(source, 'hits')
+        else:
+            _record(source, 'stale')
+            _refresh_in_background(cache, source, key, fetch, is_valid)
+        return entry['value']
+
+    _record(source, 'misses')
+    return _refresh(cache, source, key, fetch, is_valid)
+
+
+def cached(source: str, key_func: Callable[[Any], Iterable[Any]], is_valid: Callable[[Any], bool] = bool):
+    """
+    Decorator caching the result of an upstream fetch method.
+
+    `key_func` receives the instance and returns the key parts, e.g. the rounded
+    location and the date. The undecorated method stays available as `.uncached`.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            return cached_fetch(source, key_func(self), lambda: method(self, *args, **kwargs), is_valid)
+
+        wrapper.uncached = method
+        return wrapper
+
+    return decorator
+
+
+def today() -> str:
+    return date.today().isoformat()
@@ -0,0 +1,49 @@
+"""
+Distances and grid cells for the commune-sized spatial queries of the site.
+
+Coordinates are projected on a plane tangent at REFERENCE_LAT (equirectangular
+projection), which is accurate to a few metres over a few kilometres around
+Châtenay-Malabry. The plane is cut in square cells of GRID_CELL_SIZE metres, whose
+"x:y" key is stored next to the coordinates so nearby rows can be found with an
+indexed `grid_cell__in` lookup.
+"""
+import math
+from typing import List, Tuple
+
+EARTH_RADIUS = 6371008.8  # metres, mean radius
+REFERENCE_LAT = 48.77
+GRID_CELL_SIZE = 500  # metres
+
+_METRES_PER_DEGREE = math.pi * EARTH_RADIUS / 180
+_METRES_PER_DEGREE_LON = _METRES_PER_DEGREE * math.cos(math.radians(REFERENCE_LAT))
+
+
+def distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in metres (haversine)."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(a))
+
+
+def project(lat: float, lon: float) -> Tuple[float, float]:
+    """Plane coordinates in metres, see the module docstring."""
+    return lon * _METRES_PER_DEGREE_LON, lat * _METRES_PER_DEGREE
+
+
+def cell_of(lat: float, lon: float, size: float = GRID_CELL_SIZE) -> Tuple[int, int]:
+    x, y = project(lat, lon)
+    return math.floor(x / size), math.floor(y / size)
+
+
+def grid_cell(lat: float, lon: float) -> str:
+    """Key of the GRID_CELL_SIZE cell containing the point, as stored on the models."""
+    x, y = cell_of(lat, lon)
+    return f"{x}:{y}"
+
+
+def cells_within(lat: float, lon: float, radius: float) -> List[str]:
+    """Keys of the GRID_CELL_SIZE cells intersecting the square around the point."""
+    x, y = cell_of(lat, lon)
+    reach = math.ceil(radius / GRID_CELL_SIZE)
+    return [f"{i}:{j}" for i in range(x - reach, x + reach + 1) for j in range(y - reach, y + reach + 1)]
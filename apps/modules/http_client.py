@@ -0,0 +1,207 @@
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'connect_timeout': 3.05,
+    'read_timeout': 10,
+    # Retries after the first attempt, on connection errors, timeouts and RETRY_STATUSES
+    'retries': 2,
+    'backoff': 0.3,
+    'jitter': 0.3,
+    'pool_maxsize': 10,
+    # Consecutive failures opening the circuit, and how long it stays open (seconds)
+    'failure_threshold': 5,
+    'reset_timeout': 30,
+}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised without calling upstream while the circuit of a host is open."""
+
+
+def get_config(host: str) -> Dict[str, Any]:
+    """Return the outbound settings for a host (OUTBOUND_HTTP, with per-host overrides)."""
+    config = getattr(settings, 'OUTBOUND_HTTP', {})
+    return {**DEFAULTS, **config.get('default', {}), **config.get('hosts', {}).get(host, {})}
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open trial call."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+
+    def cancel_trial(self):
+        """End a half-open trial that did not reach upstream, so the next call may try again."""
+        with self._lock:
+            self._trial_running = False
+
+
+class HostClient:
+    """Pooled keep-alive session, breaker and metrics for one upstream host."""
+
+    def __init__(self, host: str):
+        self.host = host
+        self.config = get_config(host)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.config['pool_maxsize'])
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.breaker = CircuitBreaker(self.config['failure_threshold'], self.config['reset_timeout'])
+        self.metrics = {'requests': 0, 'errors': 0, 'retries': 0, 'short_circuited': 0, 'total_latency': 0.0}
+        self._metrics_lock = threading.Lock()
+
+    def _count(self, **increments):
+        with self._metrics_lock:
+            for name, value in increments.items():
+                self.metrics[name] += value
+
+    def _sleep_before_retry(self, attempt: int):
+        delay = self.config['backoff'] * (2 ** attempt) + random.uniform(0, self.config['jitter'])
+        self._count(retries=1)
+        time.sleep(delay)
+
+    def _record_failure(self):
+        was_closed = self.breaker.state == 'closed'
+        self.breaker.record_failure()
+        if self.breaker.state == 'open':
+            logger.warning(f"Circuit {'opened' if was_closed else 'still open'} for {self.host}")
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        if not self.breaker.allow():
+            self._count(short_circuited=1)
+            raise CircuitOpenError(f"Circuit open for {self.host}, not calling upstream")
+
+        kwargs.setdefault('timeout', (self.config['connect_timeout'], self.config['read_timeout']))
+        retries = self.config['retries'] if method.upper() in ('GET', 'HEAD') else 0
+
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._count(requests=1, errors=1, total_latency=time.monotonic() - started)
+                if attempt < retries:
+                    self._sleep_before_retry(attempt)
+                    attempt += 1
+                    continue
+                self._record_failure()
+                raise
+            except requests.RequestException:
+                # Not retried (invalid URL, too many redirects, broken body...), but still a failed call
+                self._count(requests=1, errors=1, total_latency=time.monotonic() - started)
+                self._record_failure()
+                raise
+            except Exception:
+                self.breaker.cancel_trial()
+                raise
+
+            self._count(requests=1, total_latency=time.monotonic() - started)
+            if response.status_code not in RETRY_STATUSES:
+                self.breaker.record_success()
+                return response
+
+            self._count(errors=1)
+            if attempt < retries:
+                self._sleep_before_retry(attempt)
+                attempt += 1
+                continue
+            self._record_failure()
+            return response
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            metrics = dict(self.metrics)
+        metrics['average_latency'] = metrics['total_latency'] / metrics['requests'] if metrics['requests'] else 0.0
+        metrics['circuit'] = self.breaker.state
+        return metrics
+
+
+_clients: Dict[str, HostClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(url: str) -> HostClient:
+    host = urlsplit(url).netloc
+    with _clients_lock:
+        if host not in _clients:
+            _clients[host] = HostClient(host)
+        return _clients[host]
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Send a request through the pooled client of the URL's host.
+
+    Raises `requests.RequestException` (including `CircuitOpenError`) like
+    `requests.request`, so callers keep their existing fallbacks.
+    """
+    return get_client(url).request(method, url, **kwargs)
+
+
+def get(url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
+    return request('GET', url, params=params, **kwargs)
+
+
+def get_metrics() -> Dict[str, Dict[str, Any]]:
+    """Return per-host request/error/latency counters and circuit state."""
+    with _clients_lock:
+        clients = list(_clients.values())
+    return {client.host: client.get_metrics() for client in clients}
+
+
+def reset():
+    """Forget all clients, their pools, breakers and metrics."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.session.close()
+        _clients.clear()
+
@@ -0,0 +1,132 @@
+import hashlib
+import logging
+import time
+from functools import wraps
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Max
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from django.utils.translation import get_language
+
+from forcast.models import WeatherSnapshot
+from .cache import round_location
+from .versioning import table_version
+
+logger = logging.getLogger(__name__)
+
+# Cached pages and fragments live at most this long, in seconds, even without a new snapshot
+DEFAULT_PAGE_CACHE_TIMEOUT = 5 * 60
+# How long browsers and proxies may reuse a page without revalidating it, in seconds
+DEFAULT_PAGE_MAX_AGE = 60
+# Query parameters changing the content of the public pages
+DEFAULT_PARAMS = ('lat', 'lon')
+
+
+class PageCacheInfo(NamedTuple):
+    """Set on the request as `request.page_cache`, for the {% cache %} fragments of the page."""
+    version: str
+    location: str
+    timeout: int
+
+
+def get_cache():
+    return caches[getattr(settings, 'PAGE_CACHE_ALIAS', 'default')]
+
+
+def get_timeout() -> int:
+    return getattr(settings, 'PAGE_CACHE_TIMEOUT', DEFAULT_PAGE_CACHE_TIMEOUT)
+
+
+def get_snapshot_version() -> str:
+    """
+    Current version of the weather snapshots, part of every page and fragment key.
+
+    Snapshots are only inserted (by the poller) or deleted, both of which change the
+    highest id, so storing a snapshot in any process invalidates the pages of all.
+    """
+    return table_version(WeatherSnapshot.objects.all(), Max('id'))
+
+
+def get_location(request, params: Iterable[str] = DEFAULT_PARAMS) -> str:
+    """The query parameters of the page, coordinates rounded like the upstream cache keys."""
+    values = {name: request.GET.get(name, '') for name in params}
+    if set(params) >= {'lat', 'lon'} and values['lat'] and values['lon']:
+        try:
+            values['lat'], values['lon'] = round_location(values['lat'], values['lon']).split(',')
+        except ValueError:
+            pass
+    return '&'.join(f'{name}={value}' for name, value in values.items())
+
+
+def get_page_cache_info(request) -> PageCacheInfo:
+    """The info set by `cache_public_page`, or the one of an undecorated view."""
+    info = getattr(request, 'page_cache', None)
+    if info is None:
+        info = PageCacheInfo(get_snapshot_version(), get_location(request), get_timeout())
+    return info
+
+
+def page_cache_key(request, info: PageCacheInfo) -> str:
+    key = f"{request.path}|{info.location}|{get_language()}|{info.version}"
+    return 'page_cache:page:' + hashlib.md5(key.encode()).hexdigest()
+
+
+def _set_validators(response, etag: str, last_modified: float):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_vary_headers(response, ('Accept-Language', 'Cookie'))
+
+
+def cache_public_page(view: Optional[Callable] = None, *, params: Iterable[str] = DEFAULT_PARAMS):
+    """
+    Cache the rendered page for anonymous visitors.
+
+    Pages are keyed on the path, the `params` query parameters, the language and
+    the snapshot version, so a new snapshot invalidates them all. Responses carry
+    an ETag and a Last-Modified date for conditional GETs. Authenticated users
+    (staff pages, admin links in the layout) always get a freshly rendered page,
+    and so do responses setting cookies, e.g. a CSRF token.
+    """
+    if view is None:
+        return lambda view: cache_public_page(view, params=params)
+    params = tuple(params)
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        timeout = get_timeout()
+        info = PageCacheInfo(get_snapshot_version(), get_location(request, params), timeout)
+        request.page_cache = info
+        if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+            response = view(request, *args, **kwargs)
+            patch_cache_control(response, private=True)
+            patch_vary_headers(response, ('Cookie',))
+            return response
+
+        cache = get_cache()
+        key = page_cache_key(request, info)
+        entry = cache.get(key)
+        if entry is None:
+            response = view(request, *args, **kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                response.render()
+            # Pages with a form embed the visitor's CSRF token, the middleware sets its cookie afterwards
+            uses_csrf = request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+            if response.status_code != 200 or response.cookies or response.streaming or uses_csrf:
+                return response
+            etag = quote_etag(hashlib.md5(response.content).hexdigest())
+            entry = (response.content, response.get('Content-Type'), etag, time.time())
+            cache.set(key, entry, timeout)
+        else:
+            content, content_type, _, _ = entry
+            response = HttpResponse(content, content_type=content_type)
+
+        _, _, etag, rendered_at = entry
+        _set_validators(response, etag, rendered_at)
+        patch_cache_control(response, public=True, max_age=getattr(settings, 'PAGE_MAX_AGE', DEFAULT_PAGE_MAX_AGE))
+        return get_conditional_response(request, etag=etag, last_modified=int(rendered_at), response=response)
+
+    return wrapper
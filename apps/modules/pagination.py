@@ -0,0 +1,200 @@
+import base64
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Q
+from django.http import QueryDict
+
+logger = logging.getLogger(__name__)
+
+CURSOR_PARAM = 'cursor'
+# How long an approximate count may be reused, in seconds
+COUNT_CACHE_TIMEOUT = 60
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor that was not produced by the paginator (or by another ordering)."""
+
+
+class CursorPage:
+    """One page of a CursorPaginator, iterable like a Django Page."""
+
+    def __init__(self, object_list: List[Any], paginator: 'CursorPaginator',
+                 next_cursor: Optional[str], previous_cursor: Optional[str], params: Optional[QueryDict] = None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        # Query parameters (e.g. request.GET) kept in the links to other pages
+        self.params = params
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+    def _querystring(self, cursor: Optional[str]) -> str:
+        params = QueryDict(mutable=True) if self.params is None else self.params.copy()
+        params.pop(CURSOR_PARAM, None)
+        if cursor:
+            params[CURSOR_PARAM] = cursor
+        return params.urlencode()
+
+    @property
+    def next_querystring(self) -> str:
+        return self._querystring(self.next_cursor)
+
+    @property
+    def previous_querystring(self) -> str:
+        return self._querystring(self.previous_cursor)
+
+    @property
+    def first_querystring(self) -> str:
+        return self._querystring(None)
+
+
+class CursorPaginator:
+    """
+    Keyset pagination over a queryset.
+
+    Pages are located with a `WHERE (sort key, id) > (last row)` condition instead of
+    an OFFSET, so any page costs the same single indexed query. `ordering` must end
+    with a unique field (usually 'id') and should match a composite index. Cursors
+    are opaque strings encoding the sort key of the boundary row and the direction.
+    """
+
+    def __init__(self, queryset, ordering: Sequence[str], per_page: int = 10):
+        if not ordering or ordering[-1].lstrip('-') not in ('id', 'pk'):
+            raise ValueError("ordering must end with 'id' (or '-id') so that cursors are unique")
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.per_page = per_page
+        self.fields = [field.lstrip('-') for field in self.ordering]
+
+    def _model_field(self, name: str):
+        opts = self.queryset.model._meta
+        return opts.pk if name == 'pk' else opts.get_field(name)
+
+    def encode_cursor(self, obj: Any, previous: bool = False) -> str:
+        values = [self._model_field(name).value_to_string(obj) for name in self.fields]
+        payload = {'v': values, 'o': self.ordering, 'p': previous}
+        return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor: str) -> Dict[str, Any]:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            if payload['o'] != self.ordering or len(payload['v']) != len(self.fields):
+                raise InvalidCursor("Cursor does not match the current ordering")
+            values = [self._model_field(name).to_python(value) for name, value in zip(self.fields, payload['v'])]
+        except InvalidCursor:
+            raise
+        except Exception as e:  # pylint: disable=broad-except
+            raise InvalidCursor(f"Invalid cursor: {e}") from e
+        return {'values': values, 'previous': bool(payload['p'])}
+
+    def _after(self, values: List[Any], ordering: List[str]) -> Q:
+        """Rows strictly after `values` in `ordering`: (a > x) OR (a = x AND b > y) OR ..."""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    @staticmethod
+    def _reverse(ordering: List[str]) -> List[str]:
+        return [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+
+    def page(self, cursor: Optional[str] = None, params: Optional[QueryDict] = None) -> CursorPage:
+        """Return the page starting after `cursor` (first page when None). Raises InvalidCursor."""
+        position = self.decode_cursor(cursor) if cursor else None
+        previous = position is not None and position['previous']
+        ordering = self._reverse(self.ordering) if previous else self.ordering
+
+        queryset = self.queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(position['values'], ordering))
+        # One extra row tells whether there is a page beyond this one
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if previous:
+            rows.reverse()
+
+        if not rows:
+            if position is None:
+                return CursorPage([], self, None, None, params)
+            # The rows past the cursor are gone: like Paginator.get_page() with a page
+            # number out of range, show the last page (the first one going backwards)
+            return self.page(None, params) if previous else self._last_page(params)
+        has_next = has_more if not previous else True
+        has_previous = (has_more if previous else position is not None)
+        return CursorPage(
+            rows, self,
+            next_cursor=self.encode_cursor(rows[-1]) if has_next else None,
+            previous_cursor=self.encode_cursor(rows[0], previous=True) if has_previous else None,
+            params=params,
+        )
+
+    def _last_page(self, params: Optional[QueryDict] = None) -> CursorPage:
+        rows = list(self.queryset.order_by(*self._reverse(self.ordering))[:self.per_page + 1])
+        has_previous = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        rows.reverse()
+        return CursorPage(
+            rows, self, next_cursor=None,
+            previous_cursor=self.encode_cursor(rows[0], previous=True) if has_previous else None,
+            params=params,
+        )
+
+    def get_page(self, params: Optional[QueryDict] = None) -> CursorPage:
+        """Return the page of the cursor found in `params` (e.g. request.GET), or the first page."""
+        cursor = params.get(CURSOR_PARAM) if params is not None else None
+        try:
+            return self.page(cursor, params)
+        except InvalidCursor as e:
+            logger.warning(f"{e}, showing the first page")
+            return self.page(None, params)
+
+    def approximate_count(self) -> int:
+        return approximate_count(self.queryset)
+
+
+def approximate_count(queryset) -> int:
+    """
+    Cheap row count for display purposes.
+
+    Unfiltered tables on PostgreSQL use the planner statistics; other querysets are
+    counted exactly, and the result is cached for COUNT_CACHE_TIMEOUT seconds.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql' and not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return int(row[0])
+
+    sql, params = queryset.query.sql_with_params()
+    key = 'pagination:count:' + hashlib.md5(f"{sql}{params}".encode()).hexdigest()
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, COUNT_CACHE_TIMEOUT)
+    return count
@@ -0,0 +1,252 @@
+import base64
+import json
+from datetime import date, timedelta
+from unittest import mock
+
+import requests
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse, QueryDict
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from apps.db_users.factories import build_contact
+from apps.db_users.models import ContactForm
+from forcast.models import WeatherSnapshot
+from . import cache as upstream_cache, http_client, page_cache
+from .pagination import CURSOR_PARAM, CursorPaginator, InvalidCursor
+
+
+class SyncThread:
+    """Stands in for threading.Thread, running the background refresh on start()."""
+
+    def __init__(self, target, **kwargs):
+        self.target = target
+
+    def start(self):
+        self.target()
+
+
+@override_settings(WEATHER_CACHE_TTLS={'weather': 60}, WEATHER_CACHE_STALE_TTL=600)
+class CachedFetchTests(SimpleTestCase):
+    def setUp(self):
+        upstream_cache.get_cache().clear()
+        upstream_cache.reset_stats(['weather'])
+        clock = mock.patch('apps.modules.cache.time.time', return_value=1000.0)
+        self.now = clock.start()
+        self.addCleanup(clock.stop)
+        self.fetch = mock.Mock(return_value={'temperature': 21})
+
+    def get(self):
+        return upstream_cache.cached_fetch('weather', ('48.77,2.27',), self.fetch)
+
+    def test_fresh_entry_is_served_from_cache(self):
+        self.assertEqual(self.get(), {'temperature': 21})
+        self.assertEqual(self.get(), {'temperature': 21})
+
+        self.fetch.assert_called_once()
+        self.assertEqual(upstream_cache.get_stats(['weather'])['weather'], {'hits': 1, 'misses': 1, 'stale': 0})
+
+    @mock.patch('apps.modules.cache.threading.Thread', SyncThread)
+    def test_stale_entry_is_served_while_refreshed(self):
+        self.get()
+        self.now.return_value = 1000.0 + 120
+        self.fetch.return_value = {'temperature': 25}
+
+        # The stale value is returned, the refresh stores the new one for the next request
+        self.assertEqual(self.get(), {'temperature': 21})
+        self.assertEqual(self.get(), {'temperature': 25})
+        self.assertEqual(self.fetch.call_count, 2)
+        self.assertEqual(upstream_cache.get_stats(['weather'])['weather']['stale'], 1)
+
+    @mock.patch('apps.modules.cache.threading.Thread')
+    def test_single_refresh_while_locked(self, thread):
+        self.get()
+        self.now.return_value = 1000.0 + 120
+
+        self.get()
+        self.get()
+
+        # The first refresh holds the lock until it finishes
+        thread.assert_called_once()
+
+    def test_invalid_response_is_not_cached(self):
+        self.fetch.return_value = {}
+
+        self.get()
+        self.get()
+
+        self.assertEqual(self.fetch.call_count, 2)
+
+    def test_counters_survive_culling_the_data(self):
+        self.get()
+        self.get()
+
+        upstream_cache.get_cache().clear()
+
+        self.assertEqual(upstream_cache.get_stats(['weather'])['weather']['hits'], 1)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        clock = mock.patch('apps.modules.http_client.time.monotonic', return_value=100.0)
+        self.now = clock.start()
+        self.addCleanup(clock.stop)
+        self.breaker = http_client.CircuitBreaker(failure_threshold=2, reset_timeout=30)
+
+    def open_circuit(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, 'closed')
+
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, 'open')
+        self.assertFalse(self.breaker.allow())
+
+    def test_single_trial_when_half_open(self):
+        self.open_circuit()
+        self.now.return_value = 130.0
+
+        self.assertEqual(self.breaker.state, 'half-open')
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+
+    def test_trial_success_closes(self):
+        self.open_circuit()
+        self.now.return_value = 130.0
+        self.breaker.allow()
+
+        self.breaker.record_success()
+
+        self.assertEqual(self.breaker.state, 'closed')
+        self.assertTrue(self.breaker.allow())
+
+    def test_trial_failure_reopens(self):
+        self.open_circuit()
+        self.now.return_value = 130.0
+        self.breaker.allow()
+
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, 'open')
+        self.now.return_value = 160.0
+        self.assertTrue(self.breaker.allow())
+
+    def test_any_request_error_ends_the_trial(self):
+        client = http_client.HostClient('example.com')
+        client.config.update(retries=0)
+        client.breaker = self.breaker
+        self.open_circuit()
+        self.now.return_value = 130.0
+
+        errors = [requests.exceptions.ChunkedEncodingError('broken'), requests.exceptions.TooManyRedirects('loop')]
+        with mock.patch.object(client.session, 'request', side_effect=errors):
+            with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+                client.request('GET', 'https://example.com/')
+            self.assertEqual(self.breaker.state, 'open')
+
+            self.now.return_value = 160.0
+            with self.assertRaises(requests.exceptions.TooManyRedirects):
+                client.request('GET', 'https://example.com/')
+
+        # Neither trial was left running: the next half-open period lets a call through
+        self.now.return_value = 190.0
+        self.assertTrue(self.breaker.allow())
+
+
+class CursorPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Three contacts per submission day, so pages split rows sharing the sort key
+        ContactForm.objects.bulk_create([
+            build_contact(index, submit_at=date.today() - timedelta(days=index // 3)) for index in range(25)
+        ])
+
+    def setUp(self):
+        self.paginator = CursorPaginator(ContactForm.objects.all(), ('-submit_at', 'id'), per_page=10)
+        self.expected = list(ContactForm.objects.order_by('-submit_at', 'id').values_list('id', flat=True))
+
+    def ids(self, page):
+        return [contact.id for contact in page]
+
+    def test_next_and_previous_round_trip(self):
+        pages = [self.paginator.page()]
+        while pages[-1].has_next():
+            pages.append(self.paginator.page(pages[-1].next_cursor))
+
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual([contact_id for page in pages for contact_id in self.ids(page)], self.expected)
+        self.assertFalse(pages[0].has_previous())
+
+        page = pages[-1]
+        for expected in reversed(pages[:-1]):
+            page = self.paginator.page(page.previous_cursor)
+            self.assertEqual(self.ids(page), self.ids(expected))
+        self.assertFalse(page.has_previous())
+        self.assertTrue(page.has_next())
+
+    def test_invalid_cursors(self):
+        cursor = self.paginator.page().next_cursor
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        other_ordering = CursorPaginator(ContactForm.objects.all(), ('submit_at', 'id')).encode_cursor(
+            ContactForm.objects.first())
+        tampered = base64.urlsafe_b64encode(json.dumps({**payload, 'v': ['not a date', 1]}).encode()).decode()
+
+        for invalid in ('garbage', cursor[:-3], other_ordering, tampered):
+            with self.assertRaises(InvalidCursor):
+                self.paginator.page(invalid)
+            # Views fall back to the first page
+            with self.assertLogs('apps.modules.pagination', 'WARNING'):
+                page = self.paginator.get_page(QueryDict(f'{CURSOR_PARAM}={invalid}'))
+            self.assertEqual(self.ids(page), self.expected[:10])
+
+    def test_empty_page_links_back(self):
+        second = self.paginator.page(self.paginator.page().next_cursor)
+        ContactForm.objects.filter(id__in=self.expected[20:]).delete()
+
+        # The third page is now empty, the last remaining page is shown instead
+        page = self.paginator.page(second.next_cursor)
+
+        self.assertEqual(self.ids(page), self.expected[10:20])
+        self.assertFalse(page.has_next())
+        self.assertEqual(self.ids(self.paginator.page(page.previous_cursor)), self.expected[:10])
+
+    def test_querystring_keeps_other_parameters(self):
+        page = self.paginator.get_page(QueryDict('sort=first_name'))
+
+        self.assertEqual(QueryDict(page.next_querystring)['sort'], 'first_name')
+        self.assertEqual(self.ids(self.paginator.get_page(QueryDict(page.next_querystring))), self.expected[10:20])
+        self.assertEqual(page.first_querystring, 'sort=first_name')
+
+
+class PageCacheTests(TestCase):
+    def setUp(self):
+        page_cache.get_cache().clear()
+        self.view = mock.Mock(side_effect=lambda request: HttpResponse('page'))
+        self.cached_view = page_cache.cache_public_page(self.view)
+
+    def get(self):
+        request = RequestFactory().get('/cards/', {'lat': '48.7651', 'lon': '2.2666'})
+        request.user = AnonymousUser()
+        return self.cached_view(request)
+
+    def test_page_is_served_from_cache(self):
+        first, second = self.get(), self.get()
+
+        self.view.assert_called_once()
+        self.assertEqual(second.content, b'page')
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_snapshot_stored_by_another_process_invalidates_pages(self):
+        self.get()
+
+        # bulk_create() sends no signal, like a snapshot stored by the poller process
+        for _ in range(2):
+            WeatherSnapshot.objects.bulk_create([WeatherSnapshot(source='weather', location='48.77,2.27', data={})])
+            self.get()
+
+        self.assertEqual(self.view.call_count, 3)
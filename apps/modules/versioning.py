@@ -0,0 +1,50 @@
+"""
+Versions of database tables, for the per-process data derived from them.
+
+The version is read from the rows themselves (e.g. the highest id, the latest
+`updated_at` and the row count), so a change committed by any process - a web
+worker, the admin, a management command or the poller - is seen by every other
+process on its next read, without a cache shared between them.
+"""
+import hashlib
+import logging
+import threading
+import time
+from typing import Callable, Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+def table_version(queryset, *aggregates) -> str:
+    """Short digest of the `aggregates` of `queryset`, e.g. `Max('updated_at'), Count('id')`."""
+    values = queryset.aggregate(*aggregates)
+    return hashlib.md5(repr(sorted(values.items())).encode()).hexdigest()[:16]
+
+
+class VersionedIndex(Generic[T]):
+    """
+    Object built once per process from the database, e.g. a search index.
+
+    `get()` reads the version of the source rows with `version()`, a single cheap
+    aggregate, and rebuilds the object with `build()` when it changed.
+    """
+
+    def __init__(self, name: str, build: Callable[[], T], version: Callable[[], str]):
+        self.name = name
+        self.build = build
+        self.version = version
+        self._value: Optional[T] = None
+        self._value_version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        version = self.version()
+        with self._lock:
+            if self._value is None or self._value_version != version:
+                started = time.monotonic()
+                self._value = self.build()
+                self._value_version = version
+                logger.info(f"Built the {self.name} index in {time.monotonic() - started:.3f}s")
+            return self._value
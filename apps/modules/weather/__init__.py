@@ -0,0 +1,13 @@
+"""
+OpenWeather and Recosante clients, parsers, records and the columnar forecast series.
+
+Views, the snapshot poller and the JSON API all go through `WeatherData` and
+`RecosanteAPI`; both return the plain dicts of the records' `to_dict()`.
+"""
+from .clients import DEFAULT_INSEE_CODE, DEFAULT_LAT, DEFAULT_LON, RecosanteAPI, WeatherData, location_from_params
+from .parsers import deg_to_cardinal, get_advice, parse_current, parse_forecast, parse_recosante
+from .records import (
+    NOT_AVAILABLE, AirQuality, CurrentConditions, Forecast, ForecastPoint, Pollen, PollutionEpisodes,
+    RecosanteIndices, UVIndex, WeatherVigilance, default_forecast,
+)
+from .series import DEFAULT_HEAT_THRESHOLD, DailySummary, ForecastSeries, daily_outlook, get_heat_threshold, heat_index
@@ -0,0 +1,129 @@
+import logging
+import os
+from datetime import date, timedelta
+from typing import Any, Dict, Mapping, Tuple
+
+import requests
+
+from apps.modules import http_client
+from apps.modules.cache import cached, round_location, today
+from . import parsers
+from .records import CurrentConditions, default_forecast
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LAT, DEFAULT_LON = 48.7651, 2.2666  # Châtenay-Malabry
+DEFAULT_INSEE_CODE = '92019'
+OPENWEATHER_URL = 'https://api.openweathermap.org/data/2.5/'
+# Malformed payloads are logged and answered with the default response, like network errors
+PARSE_ERRORS = (KeyError, IndexError, TypeError, ValueError)
+
+
+def location_from_params(params: Mapping[str, str]) -> Tuple[float, float]:
+    """`lat` and `lon` of the query parameters, the default location when missing, invalid or out of range."""
+    try:
+        lat, lon = float(params.get('lat', DEFAULT_LAT)), float(params.get('lon', DEFAULT_LON))
+    except (TypeError, ValueError):
+        return DEFAULT_LAT, DEFAULT_LON
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return DEFAULT_LAT, DEFAULT_LON
+    return lat, lon
+
+
+class WeatherData:
+    """OpenWeather current conditions and forecast for a location."""
+
+    def __init__(self, lat: float = DEFAULT_LAT, lon: float = DEFAULT_LON):
+        self.lat = lat
+        self.lon = lon
+        self.api_key = os.getenv('OPENWEATHER_API_KEY')
+
+    def set_location(self, lat: float, lon: float):
+        self.lat = lat
+        self.lon = lon
+
+    def _fetch(self, endpoint: str) -> Dict[str, Any]:
+        response = http_client.get(OPENWEATHER_URL + endpoint, params={
+            'lat': self.lat, 'lon': self.lon, 'appid': self.api_key, 'units': 'metric', 'lang': 'fr',
+        })
+        response.raise_for_status()
+        return response.json()
+
+    @cached('weather', lambda self: (round_location(self.lat, self.lon), today()),
+            is_valid=lambda data: data.get('temperature') != 'N/A')
+    def get_weather(self) -> Dict[str, Any]:
+        if not self.api_key:
+            logger.error("OpenWeather API key is not set.")
+            return self._default_weather_response()
+        try:
+            return parsers.parse_current(self._fetch('weather')).to_dict()
+        except requests.RequestException as e:
+            logger.error(f"HTTP Request failed: {e}")
+        except PARSE_ERRORS as e:
+            logger.error(f"Unexpected OpenWeather weather response: {e!r}")
+        return self._default_weather_response()
+
+    @cached('forecast', lambda self: (round_location(self.lat, self.lon), today()),
+            is_valid=lambda data: 'min_temp' in data)
+    def get_weather_forecast(self) -> Dict[str, Any]:
+        if not self.api_key:
+            logger.error("OpenWeather API key is not set.")
+            return self._default_forecast_response()
+        try:
+            forecast = parsers.parse_forecast(self._fetch('forecast'))
+        except requests.RequestException as e:
+            logger.error(f"HTTP Request failed: {e}")
+            return self._default_forecast_response()
+        except PARSE_ERRORS as e:
+            logger.error(f"Unexpected OpenWeather forecast response: {e!r}")
+            return self._default_forecast_response()
+        if forecast is None:
+            logger.error("No forecast data available.")
+            return self._default_forecast_response()
+        return forecast.to_dict()
+
+    deg_to_cardinal = staticmethod(parsers.deg_to_cardinal)
+    get_advice = staticmethod(parsers.get_advice)
+
+    @staticmethod
+    def _default_weather_response() -> Dict[str, Any]:
+        return CurrentConditions().to_dict()
+
+    @staticmethod
+    def _default_forecast_response() -> Dict[str, Any]:
+        return default_forecast()
+
+
+class RecosanteAPI:
+    """Recosante indices (air quality, pollen, UV, weather vigilance) of a commune, today or `days_ahead`."""
+    API_URL = "https://api.recosante.beta.gouv.fr/v1/"
+    # Time of day of the indices requested for the next days
+    FORECAST_TIME = '12:00'
+
+    def __init__(self, insee_code: str = DEFAULT_INSEE_CODE, days_ahead: int = 0):
+        self.params = {
+            'insee': insee_code,
+            'show_raep': 'true',  # Pollen data
+            'show_indice_uv': 'true',  # UV Index data
+        }
+        if days_ahead:
+            self.date = (date.today() + timedelta(days=days_ahead)).isoformat()
+            self.params.update({'date': self.date, 'time': self.FORECAST_TIME})
+        else:
+            self.date = today()
+
+    @cached('recosante', lambda self: (self.params['insee'], self.date, self.params.get('time', 'now')))
+    def fetch_data(self) -> Dict[str, Any]:
+        try:
+            response = http_client.get(self.API_URL, params=self.params)
+            response.raise_for_status()
+            return self.parse_data(response.json())
+        except requests.RequestException as e:
+            logger.error(f"Erreur lors de la récupération des données de l'API Recosante: {e}")
+        except PARSE_ERRORS as e:
+            logger.error(f"Réponse inattendue de l'API Recosante: {e!r}")
+        return {}
+
+    @staticmethod
+    def parse_data(data: Dict[str, Any]) -> Dict[str, Any]:
+        return parsers.parse_recosante(data).to_dict()
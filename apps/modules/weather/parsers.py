@@ -0,0 +1,184 @@
+"""
+Parsers turning the raw OpenWeather and Recosante JSON payloads into records.
+
+Parsers never fetch anything, so they can be tested and benchmarked on stored payloads.
+"""
+from typing import Any, Dict, Optional
+
+from .records import (
+    NOT_AVAILABLE, AirQuality, CurrentConditions, Forecast, ForecastPoint, Pollen, PollutionEpisodes,
+    RecosanteIndices, UVIndex, WeatherVigilance,
+)
+from .series import ForecastSeries
+
+CARDINAL_DIRECTIONS = ('Nord', 'Nord-Est', 'Est', 'Sud-Est', 'Sud', 'Sud-Ouest', 'Ouest', 'Nord-Ouest')
+# Entries of the 3-hourly forecast list shown as "+1h" and "+24h", or the last one of a shorter list
+NEXT_HOUR_INDEX = 1
+NEXT_DAY_INDEX = 8
+POLLUTANTS = ('PM10', 'PM2,5', 'NO2', 'O3', 'SO2')
+
+TEMPERATURE_ADVICE = (
+    (-10, "Il fait extrêmement froid aujourd'hui. Portez des vêtements très chauds et évitez les sorties prolongées."),
+    (0, "Il fait très froid. Habillez-vous en plusieurs couches pour rester au chaud."),
+    (10, "Il fait frais. Portez une veste chaude."),
+    (20, "La température est agréable. Une veste légère ou un pull suffira."),
+    (30, "Il fait chaud. Portez des vêtements légers et buvez beaucoup d'eau."),
+    (40, "Il fait très chaud. Restez à l'ombre et buvez beaucoup d'eau."),
+)
+EXTREME_HEAT_ADVICE = "Il fait extrêmement chaud. Prenez des mesures pour vous protéger de la chaleur excessive."
+POLLUTION_ADVICE = {
+    'Bonne': "L'air est de bonne qualité. Profitez de votre journée à l'extérieur.",
+    'Moyenne': "L'air est de qualité moyenne. Faites attention si vous êtes sensible aux allergies.",
+    'Dégradée': "L'air est dégradé. Limitez les activités physiques en extérieur, surtout pour les personnes sensibles.",
+    'Mauvaise': "L'air est de mauvaise qualité. Évitez les activités physiques à l'extérieur et restez à l'intérieur si possible.",
+    'Très mauvaise': "L'air est très mauvais. Restez à l'intérieur et utilisez un purificateur d'air si disponible.",
+    'Extrêmement mauvaise': "L'air est extrêmement mauvais. Évitez de sortir et portez un masque si vous devez absolument sortir.",
+}
+UNKNOWN_POLLUTION_ADVICE = "État de l'air non précisé, restez vigilant."
+
+
+def deg_to_cardinal(deg: float) -> str:
+    return CARDINAL_DIRECTIONS[int((deg % 360 + 22.5) / 45) % 8]
+
+
+def get_advice(temp: float, pollution_index: Optional[str] = None) -> str:
+    """Clothing advice for the temperature, followed by the air quality advice when an index is given."""
+    advice = next((text for upper, text in TEMPERATURE_ADVICE if temp < upper), EXTREME_HEAT_ADVICE)
+    if pollution_index is not None:
+        advice = f"{advice} {POLLUTION_ADVICE.get(pollution_index, UNKNOWN_POLLUTION_ADVICE)}"
+    return advice
+
+
+def parse_current(payload: Dict[str, Any]) -> CurrentConditions:
+    """Parse a /data/2.5/weather response, raises KeyError/IndexError on a malformed payload."""
+    main = payload['main']
+    wind = payload['wind']
+    temperature = round(main['temp'], 1)
+    return CurrentConditions(
+        temperature=temperature,
+        location=payload['name'],
+        description=payload['weather'][0]['description'].capitalize(),
+        wind_speed=round(wind['speed'] * 3.6, 1),  # m/s to km/h
+        wind_direction=deg_to_cardinal(wind['deg']),
+        max_temp=round(main['temp_max'], 1),
+        min_temp=round(main['temp_min'], 1),
+        feel_like=round(main['feels_like'], 1),
+        advice=get_advice(temperature),
+    )
+
+
+def parse_forecast_point(entry: Dict[str, Any]) -> ForecastPoint:
+    main = entry['main']
+    return ForecastPoint(
+        datetime=entry.get('dt_txt', NOT_AVAILABLE),
+        temperature=main.get('temp', NOT_AVAILABLE),
+        feels_like=main.get('feels_like', NOT_AVAILABLE),
+        weather=entry['weather'][0].get('description', NOT_AVAILABLE),
+        wind_speed=entry['wind'].get('speed', NOT_AVAILABLE),
+    )
+
+
+def parse_forecast(payload: Dict[str, Any]) -> Optional[Forecast]:
+    """
+    Parse a /data/2.5/forecast response in a single pass over its 3-hourly entries.
+
+    Every entry goes into the columnar series. Returns None when the list is empty.
+    """
+    entries = payload.get('list', [])
+    if not entries:
+        return None
+
+    series = ForecastSeries(utc_offset=payload.get('city', {}).get('timezone', 0))
+    for entry in entries:
+        main = entry['main']
+        series.append(entry['dt'], main['temp'], main['feels_like'], main['humidity'], entry['wind']['speed'])
+
+    last = len(entries) - 1
+    return Forecast(
+        plus1H=parse_forecast_point(entries[min(NEXT_HOUR_INDEX, last)]),
+        plus24H=parse_forecast_point(entries[min(NEXT_DAY_INDEX, last)]),
+        min_temp=min(series.temperature),
+        max_temp=max(series.temperature),
+        series=series,
+    )
+
+
+def _indice(data: Dict[str, Any]) -> Dict[str, Any]:
+    return data.get('indice', {})
+
+
+def _advice(data: Dict[str, Any], default: str) -> str:
+    return data.get('advice', {}).get('main', default)
+
+
+def parse_episodes_pollution(data: Dict[str, Any]) -> PollutionEpisodes:
+    indice = _indice(data)
+    return PollutionEpisodes(
+        label=indice.get('label', 'Aucune donnée'),
+        details=tuple(
+            {'label': item.get('label', 'Inconnu'), 'level': item.get('level', NOT_AVAILABLE)}
+            for item in indice.get('details', [])
+        ),
+        sources=tuple(data.get('sources', [])),
+        validity=data.get('validity', {}),
+    )
+
+
+def parse_indice_atmo(data: Dict[str, Any]) -> AirQuality:
+    indice = _indice(data)
+    levels = dict.fromkeys(POLLUTANTS, NOT_AVAILABLE)
+    for detail in indice.get('details', []):
+        label = detail.get('label', '').upper()
+        if label in levels:
+            levels[label] = _indice(detail).get('label', NOT_AVAILABLE)
+    return AirQuality(
+        advice=_advice(data, 'Aucun conseil disponible'),
+        air_quality_levels=levels,
+        overall_index=indice.get('label', NOT_AVAILABLE),
+    )
+
+
+def parse_indice_uv(data: Dict[str, Any]) -> UVIndex:
+    indice = _indice(data)
+    return UVIndex(
+        advice=_advice(data, "Aucun conseil lié à l'UV disponible."),
+        label=indice.get('label', 'Indice UV inconnu'),
+        value=indice.get('value', NOT_AVAILABLE),
+    )
+
+
+def parse_raep(data: Dict[str, Any]) -> Pollen:
+    return Pollen(
+        advice=_advice(data, 'Aucun conseil lié au pollen disponible.'),
+        pollen_levels={
+            detail.get('label', '').lower(): _indice(detail).get('label', NOT_AVAILABLE)
+            for detail in _indice(data).get('details', [])
+        },
+    )
+
+
+def parse_vigilance_meteo(data: Dict[str, Any]) -> WeatherVigilance:
+    details = []
+    for detail in _indice(data).get('details', []):
+        indice = detail['indice']
+        validity = indice.get('validity', {})
+        details.append({
+            'label': indice.get('label', 'Inconnu'),
+            'color': indice.get('color', 'Green'),
+            'validity': {
+                'start': validity.get('start', 'Heure de début non spécifiée'),
+                'end': validity.get('end', 'Heure de fin non spécifiée'),
+            },
+        })
+    return WeatherVigilance(advice=_advice(data, 'Aucun conseil météo spécifique disponible.'), details=tuple(details))
+
+
+def parse_recosante(payload: Dict[str, Any]) -> RecosanteIndices:
+    return RecosanteIndices(
+        commune=payload.get('commune', {}),
+        episodes_pollution=parse_episodes_pollution(payload.get('episodes_pollution', {})),
+        indice_atmo=parse_indice_atmo(payload.get('indice_atmo', {})),
+        indice_uv=parse_indice_uv(payload.get('indice_uv', {})),
+        raep=parse_raep(payload.get('raep', {})),
+        vigilance_meteo=parse_vigilance_meteo(payload.get('vigilance_meteo', {})),
+    )
@@ -0,0 +1,127 @@
+"""
+Typed records of the OpenWeather and Recosante responses.
+
+Records are slotted and immutable. `to_dict()` gives the plain dict shape stored in
+the cache and in WeatherSnapshot rows, and used by the templates and the JSON API.
+"""
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Tuple, Union
+
+from .series import ForecastSeries
+
+NOT_AVAILABLE = 'N/A'
+
+Number = Union[float, str]  # 'N/A' when the value is missing
+
+
+@dataclass(frozen=True, slots=True)
+class CurrentConditions:
+    temperature: Number = NOT_AVAILABLE
+    location: str = 'Inconnue'
+    description: str = 'Aucune donnée disponible'
+    wind_speed: Number = NOT_AVAILABLE  # km/h
+    wind_direction: str = NOT_AVAILABLE
+    max_temp: Number = NOT_AVAILABLE
+    min_temp: Number = NOT_AVAILABLE
+    feel_like: Number = NOT_AVAILABLE
+    advice: str = 'Aucun conseil disponible pour le moment.'
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @property
+    def is_available(self) -> bool:
+        return self.temperature != NOT_AVAILABLE
+
+
+@dataclass(frozen=True, slots=True)
+class ForecastPoint:
+    datetime: str = NOT_AVAILABLE
+    temperature: Number = NOT_AVAILABLE
+    feels_like: Number = NOT_AVAILABLE
+    weather: str = NOT_AVAILABLE
+    wind_speed: Number = NOT_AVAILABLE  # m/s, as returned by OpenWeather
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True, slots=True)
+class Forecast:
+    plus1H: ForecastPoint  # pylint: disable=invalid-name
+    plus24H: ForecastPoint  # pylint: disable=invalid-name
+    min_temp: float
+    max_temp: float
+    series: ForecastSeries
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'plus1H': self.plus1H.to_dict(),
+            'plus24H': self.plus24H.to_dict(),
+            'min_temp': self.min_temp,
+            'max_temp': self.max_temp,
+            'series': self.series.to_dict(),
+        }
+
+
+def default_forecast() -> Dict[str, Any]:
+    """Dict served when no forecast is available, without min/max so it is never cached."""
+    point = {'temperature': NOT_AVAILABLE, 'description': 'Aucune donnée disponible', 'wind_speed': NOT_AVAILABLE}
+    return {'plus1H': dict(point), 'plus24H': dict(point)}
+
+
+@dataclass(frozen=True, slots=True)
+class PollutionEpisodes:
+    label: str = 'Aucune donnée'
+    details: Tuple[Dict[str, Any], ...] = ()
+    sources: Tuple[Any, ...] = ()
+    validity: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class AirQuality:
+    advice: str = 'Aucun conseil disponible'
+    air_quality_levels: Dict[str, str] = field(default_factory=dict)
+    overall_index: str = NOT_AVAILABLE
+
+
+@dataclass(frozen=True, slots=True)
+class UVIndex:
+    advice: str = "Aucun conseil lié à l'UV disponible."
+    label: str = 'Indice UV inconnu'
+    value: Any = NOT_AVAILABLE
+
+
+@dataclass(frozen=True, slots=True)
+class Pollen:
+    advice: str = 'Aucun conseil lié au pollen disponible.'
+    pollen_levels: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class WeatherVigilance:
+    advice: str = 'Aucun conseil météo spécifique disponible.'
+    details: Tuple[Dict[str, Any], ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class RecosanteIndices:
+    commune: Dict[str, Any]
+    episodes_pollution: PollutionEpisodes
+    indice_atmo: AirQuality
+    indice_uv: UVIndex
+    raep: Pollen
+    vigilance_meteo: WeatherVigilance
+
+    def to_dict(self) -> Dict[str, Any]:
+        # asdict() turns the tuples back into lists, as in the JSON stored before
+        return _lists(asdict(self))
+
+
+def _lists(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _lists(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_lists(item) for item in value]
+    return value
+
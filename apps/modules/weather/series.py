@@ -0,0 +1,150 @@
+"""
+Columnar 5-day forecast series.
+
+The 3-hourly OpenWeather forecast is kept as one typed `array` per measure rather
+than a list of dicts, and aggregations run on whole columns and day slices.
+"""
+import math
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+
+# Temperature (°C) above which forecast hours count towards a heatwave
+DEFAULT_HEAT_THRESHOLD = 30.0
+# Spacing of the OpenWeather forecast points, used when a series has a single point
+DEFAULT_STEP_HOURS = 3
+DAY = 24 * 60 * 60
+
+COLUMNS = {
+    'timestamps': 'q',  # seconds since the epoch, UTC
+    'temperature': 'd',  # °C
+    'feels_like': 'd',  # °C
+    'humidity': 'd',  # %
+    'wind_speed': 'd',  # m/s
+}
+
+
+def get_heat_threshold() -> float:
+    return getattr(settings, 'FORECAST_HEAT_THRESHOLD', DEFAULT_HEAT_THRESHOLD)
+
+
+def heat_index(temp: float, humidity: float) -> float:
+    """NOAA heat index in °C (Steadman below 80 °F, Rothfusz regression above)."""
+    t = temp * 9 / 5 + 32
+    hi = 0.5 * (t + 61 + (t - 68) * 1.2 + humidity * 0.094)
+    if (hi + t) / 2 >= 80:
+        hi = (-42.379 + 2.04901523 * t + 10.14333127 * humidity - 0.22475541 * t * humidity
+              - 6.83783e-3 * t * t - 5.481717e-2 * humidity * humidity + 1.22874e-3 * t * t * humidity
+              + 8.5282e-4 * t * humidity * humidity - 1.99e-6 * t * t * humidity * humidity)
+        if humidity < 13 and 80 <= t <= 112:
+            hi -= (13 - humidity) / 4 * math.sqrt((17 - abs(t - 95)) / 17)
+        elif humidity > 85 and 80 <= t <= 87:
+            hi += (humidity - 85) / 10 * (87 - t) / 5
+    return (hi - 32) * 5 / 9
+
+
+@dataclass(frozen=True, slots=True)
+class DailySummary:
+    date: str  # YYYY-MM-DD, local time of the forecast location
+    min_temp: float
+    max_temp: float
+    mean_temp: float
+    max_heat_index: float
+    hours_above: int  # forecast hours at or above the heat threshold
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'date': self.date,
+            'min_temp': round(self.min_temp, 1),
+            'max_temp': round(self.max_temp, 1),
+            'mean_temp': round(self.mean_temp, 1),
+            'max_heat_index': round(self.max_heat_index, 1),
+            'hours_above': self.hours_above,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class ForecastSeries:
+    timestamps: array = field(default_factory=lambda: array('q'))
+    temperature: array = field(default_factory=lambda: array('d'))
+    feels_like: array = field(default_factory=lambda: array('d'))
+    humidity: array = field(default_factory=lambda: array('d'))
+    wind_speed: array = field(default_factory=lambda: array('d'))
+    utc_offset: int = 0  # seconds, OpenWeather's city.timezone
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def step_hours(self) -> int:
+        if len(self.timestamps) < 2:
+            return DEFAULT_STEP_HOURS
+        return (self.timestamps[1] - self.timestamps[0]) // 3600
+
+    def append(self, timestamp: int, temperature: float, feels_like: float, humidity: float, wind_speed: float):
+        self.timestamps.append(timestamp)
+        self.temperature.append(temperature)
+        self.feels_like.append(feels_like)
+        self.humidity.append(humidity)
+        self.wind_speed.append(wind_speed)
+
+    def heat_index(self) -> array:
+        return array('d', map(heat_index, self.temperature, self.humidity))
+
+    def hours_above(self, threshold: float = DEFAULT_HEAT_THRESHOLD, column: str = 'temperature',
+                    start: int = 0, stop: Optional[int] = None) -> int:
+        """Forecast hours in [start:stop] at or above `threshold` for `column` (or 'heat_index')."""
+        values = self.heat_index() if column == 'heat_index' else getattr(self, column)
+        return sum(value >= threshold for value in values[start:stop]) * self.step_hours
+
+    def day_slices(self) -> List[slice]:
+        """One slice per local calendar day, the points being sorted by time."""
+        slices = []
+        start = 0
+        days = [(timestamp + self.utc_offset) // DAY for timestamp in self.timestamps]
+        for i in range(1, len(days) + 1):
+            if i == len(days) or days[i] != days[start]:
+                slices.append(slice(start, i))
+                start = i
+        return slices
+
+    def daily(self, threshold: float = DEFAULT_HEAT_THRESHOLD) -> List[DailySummary]:
+        heat = self.heat_index()
+        summaries = []
+        for day in self.day_slices():
+            temperature = self.temperature[day]
+            local = datetime.fromtimestamp(self.timestamps[day.start] + self.utc_offset, tz=timezone.utc)
+            summaries.append(DailySummary(
+                date=local.date().isoformat(),
+                min_temp=min(temperature),
+                max_temp=max(temperature),
+                mean_temp=sum(temperature) / len(temperature),
+                max_heat_index=max(heat[day]),
+                hours_above=self.hours_above(threshold, start=day.start, stop=day.stop),
+            ))
+        return summaries
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {name: getattr(self, name).tolist() for name in COLUMNS}
+        data['utc_offset'] = self.utc_offset
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> 'ForecastSeries':
+        """Series stored by `to_dict()`; an empty series for forecasts stored without one."""
+        if not data:
+            return cls()
+        return cls(
+            **{name: array(typecode, data.get(name, ())) for name, typecode in COLUMNS.items()},
+            utc_offset=data.get('utc_offset', 0),
+        )
+
+
+def daily_outlook(forecast: Dict[str, Any], threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Per-day summaries of a forecast dict stored by `WeatherData.get_weather_forecast`."""
+    threshold = get_heat_threshold() if threshold is None else threshold
+    series = ForecastSeries.from_dict(forecast.get('series'))
+    return [summary.to_dict() for summary in series.daily(threshold)]
@@ -1,6 +1,8 @@
 from django.views.generic import TemplateView
 from django.shortcuts import redirect
 from django.http import HttpResponseRedirect
+from apps.volonteers.geocoding import locate
+from apps.volonteers.jobs import enqueue_match
 from .forms import ContactFormForm
 from web_project import TemplateLayout
 
@@ -17,9 +19,11 @@ class FormLayoutsHelp(TemplateView):
     def post(self, request, *args, **kwargs):
         form = ContactFormForm(request.POST)
         if form.is_valid():
-            contact = form.save(commit=True)
+            contact = form.save(commit=False)
             contact.is_volunteer = False  # Explicitly set is_volunteer to False
+            locate(contact)
             contact.save()
+            enqueue_match(contact)
 
             # Redirect to prevent form resubmission issues
             return HttpResponseRedirect(request.path_info)
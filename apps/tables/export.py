@@ -0,0 +1,124 @@
+import csv
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from apps.db_users.availability import slots_in_mask
+from apps.db_users.models import ContactForm
+from .filters import filter_contacts
+
+# Rows fetched per database round trip, memory does not depend on the number of rows exported
+CHUNK_SIZE = 2000
+# Separator of the slots in the availability column of CSV exports
+SLOT_SEPARATOR = ' '
+# Spreadsheets evaluate cells starting with one of these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+# Signed numbers and phone numbers (`+33 6 01 02 03 04`) start with `+` or `-` but are no formulas
+PLAIN_NUMBER = re.compile(r'^[+-]?[\d .()-]+$')
+
+CONTACT_FIELDS = (
+    'id', 'first_name', 'last_name', 'email', 'phone', 'address', 'submit_at', 'start_date', 'end_date',
+    'is_volunteer', 'buddy_id', 'availability',
+)
+PAIR_FIELDS = (
+    'id', 'first_name', 'last_name', 'email', 'phone', 'address', 'availability',
+    'buddy_id', 'buddy__first_name', 'buddy__last_name', 'buddy__email', 'buddy__phone', 'buddy__address',
+    'buddy__availability',
+)
+PAIR_COLUMNS = (
+    'seeker_id', 'seeker_first_name', 'seeker_last_name', 'seeker_email', 'seeker_phone', 'seeker_address',
+    'seeker_availability', 'volunteer_id', 'volunteer_first_name', 'volunteer_last_name', 'volunteer_email',
+    'volunteer_phone', 'volunteer_address', 'volunteer_availability',
+)
+
+
+def contact_rows(filters: Dict[str, Any]) -> Tuple[Sequence[str], Iterator[List[Any]]]:
+    """Columns and rows of the contacts matching `filters`, availability as a list of `<day>_<slot>` fields."""
+    queryset = filter_contacts(filters).order_by('id').values_list(*CONTACT_FIELDS)
+    position = CONTACT_FIELDS.index('availability')
+
+    def rows():
+        for row in queryset.iterator(chunk_size=CHUNK_SIZE):
+            row = list(row)
+            row[position] = slots_in_mask(row[position])
+            yield row
+
+    return CONTACT_FIELDS, rows()
+
+
+def pair_rows(filters: Dict[str, Any]) -> Tuple[Sequence[str], Iterator[List[Any]]]:
+    """
+    Columns and rows of the buddy pairs, one row per pair.
+
+    The filters select the seeker of the pairs, or their volunteer when `is_volunteer`
+    is True, so the volunteers filter of the contacts table keeps its meaning.
+    """
+    if filters['is_volunteer']:
+        queryset = ContactForm.objects.filter(buddy__in=filter_contacts(filters).values('id'))
+    else:
+        queryset = filter_contacts(filters)
+    queryset = queryset.filter(is_volunteer=False, buddy__isnull=False)
+    queryset = queryset.order_by('id').values_list(*PAIR_FIELDS)
+    positions = [PAIR_FIELDS.index('availability'), PAIR_FIELDS.index('buddy__availability')]
+
+    def rows():
+        for row in queryset.iterator(chunk_size=CHUNK_SIZE):
+            row = list(row)
+            for position in positions:
+                row[position] = slots_in_mask(row[position])
+            yield row
+
+    return PAIR_COLUMNS, rows()
+
+
+DATASETS = {
+    'contacts': contact_rows,
+    'pairs': pair_rows,
+}
+
+
+class Echo:
+    """File-like object returning what is written, so csv.writer can feed a generator."""
+
+    def write(self, value):
+        return value
+
+
+def csv_cell(value: Any) -> Any:
+    """CSV value of a cell, text that a spreadsheet would run as a formula is quoted with a leading `'`."""
+    if isinstance(value, list):
+        value = SLOT_SEPARATOR.join(value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES) and not PLAIN_NUMBER.match(value):
+        return f"'{value}"
+    return value
+
+
+def csv_lines(columns: Sequence[str], rows: Iterable[List[Any]]) -> Iterator[str]:
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([csv_cell(value) for value in row])
+
+
+def json_lines(columns: Sequence[str], rows: Iterable[List[Any]]) -> Iterator[str]:
+    """A JSON array of objects, written one object per line."""
+    yield '['
+    separator = '\n'
+    for row in rows:
+        yield separator + json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder, ensure_ascii=False)
+        separator = ',\n'
+    yield '\n]\n'
+
+
+WRITERS = {
+    'csv': csv_lines,
+    'json': json_lines,
+}
+
+
+def export_lines(dataset: str, fmt: str, filters: Dict[str, Any]) -> Iterator[str]:
+    """Lines of the `dataset` ('contacts' or 'pairs') export in `fmt` ('csv' or 'json'), generated lazily."""
+    columns, rows = DATASETS[dataset](filters)
+    return WRITERS[fmt](columns, rows)
@@ -0,0 +1,83 @@
+import logging
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.http import QueryDict
+
+from apps.db_users import availability as slots
+from apps.db_users.models import ContactForm
+
+logger = logging.getLogger(__name__)
+
+# Whitelisted sort keys and the ordering each one uses, all backed by an index of ContactForm
+SORT_ORDERINGS = {
+    'first_name': ('first_name', 'id'),
+    'last_name': ('last_name', 'first_name', 'id'),
+    'start_date': ('start_date', 'id'),
+    'end_date': ('end_date', 'id'),
+}
+DEFAULT_SORT = 'first_name'
+ORDERS = ('asc', 'desc')
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid date filter {value!r}")
+        return None
+
+
+def _parse_bool(value: Optional[str]) -> Optional[bool]:
+    return {'True': True, 'False': False}.get(value)
+
+
+def _parse_slots(params: QueryDict) -> List[str]:
+    """Slot fields from `?availability=a&availability=b` or `?availability=a,b`, unknown ones dropped."""
+    fields = [field for value in params.getlist('availability') for field in value.split(',') if field]
+    return [field for field in fields if field in slots.SLOT_BITS]
+
+
+def parse_filters(params: QueryDict) -> Dict[str, Any]:
+    """Clean the filter and sort parameters of the contacts table, invalid values being ignored."""
+    sort = params.get('sort')
+    order = params.get('order')
+    return {
+        'start_date': _parse_date(params.get('start_date')),
+        'end_date': _parse_date(params.get('end_date')),
+        'is_volunteer': _parse_bool(params.get('is_volunteer')),
+        'availability': _parse_slots(params),
+        'sort': sort if sort in SORT_ORDERINGS else DEFAULT_SORT,
+        'order': order if order in ORDERS else 'asc',
+    }
+
+
+def filter_contacts(filters: Dict[str, Any], queryset=None):
+    """
+    Contacts matching `filters` (see `parse_filters`), filtered in SQL.
+
+    The dates select contacts whose availability period overlaps the given range,
+    and the slots contacts available in any of them.
+    """
+    queryset = ContactForm.objects.all() if queryset is None else queryset
+    if filters['is_volunteer'] is not None:
+        # `is_volunteer IN (1)` rather than the bare boolean condition Django emits on SQLite,
+        # which the planner cannot match with the leading column of contact_role_period_idx
+        queryset = queryset.filter(is_volunteer__in=[filters['is_volunteer']])
+    if filters['end_date'] is not None:
+        queryset = queryset.filter(start_date__lte=filters['end_date'])
+    if filters['start_date'] is not None:
+        queryset = queryset.filter(end_date__gte=filters['start_date'])
+    if filters['availability']:
+        queryset = queryset.available_in(*filters['availability'])
+    return queryset
+
+
+def get_ordering(filters: Dict[str, Any]) -> Tuple[str, ...]:
+    """Ordering of the whitelisted sort key, every field reversed when descending so the index is still used."""
+    ordering = SORT_ORDERINGS[filters['sort']]
+    if filters['order'] == 'desc':
+        return tuple(f'-{field}' for field in ordering)
+    return ordering
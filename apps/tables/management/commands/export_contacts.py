@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+
+from apps.db_users.availability import SLOT_FIELDS
+from apps.tables.export import DATASETS, WRITERS, export_lines
+from apps.tables.filters import parse_filters
+
+
+class Command(BaseCommand):
+    help = 'Export the contacts or the buddy pairs as CSV or JSON, with the filters of the contacts table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(DATASETS), help='contacts or pairs')
+        parser.add_argument('--format', dest='fmt', choices=sorted(WRITERS), default='csv')
+        parser.add_argument('--output', '-o', help='File to write, standard output by default.')
+        parser.add_argument('--start-date', help='Contacts available on or after this date (YYYY-MM-DD).')
+        parser.add_argument('--end-date', help='Contacts available on or before this date (YYYY-MM-DD).')
+        role = parser.add_mutually_exclusive_group()
+        role.add_argument('--volunteers', action='store_true', help='Volunteers only.')
+        role.add_argument('--seekers', action='store_true', help='Seekers only.')
+        parser.add_argument('--slot', action='append', choices=SLOT_FIELDS, default=[],
+                            help='Contacts available in this slot, can be repeated (any of them).')
+
+    def handle(self, *args, **options):
+        params = QueryDict(mutable=True)
+        params['start_date'] = options['start_date'] or ''
+        params['end_date'] = options['end_date'] or ''
+        if options['volunteers'] or options['seekers']:
+            params['is_volunteer'] = str(options['volunteers'])
+        params.setlist('availability', options['slot'])
+        filters = parse_filters(params)
+        for name in ('start_date', 'end_date'):
+            if options[name] and filters[name] is None:
+                raise CommandError(f"Invalid date: {options[name]}")
+        lines = export_lines(options['dataset'], options['fmt'], filters)
+
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+            output.writelines(lines)
+        self.stderr.write(f"Wrote {options['dataset']} to {options['output']}.")
@@ -0,0 +1,177 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.db_users.factories import build_contact
+from apps.db_users.models import ContactForm
+from .export import SLOT_SEPARATOR
+from .filters import filter_contacts, get_ordering, parse_filters
+
+
+def create_named_contacts():
+    today = date.today()
+    contacts = [
+        ('Alice', 'Martin', True, 0, 5, 'monday_morning'),
+        ('Bruno', 'Durand', False, 10, 20, 'monday_morning'),
+        ('Chloé', 'Bernard', True, 30, 40, 'sunday_evening'),
+    ]
+    return ContactForm.objects.bulk_create([
+        build_contact(
+            slots=[slot], first_name=first_name, last_name=last_name, email=f'{first_name.lower()}@example.com',
+            start_date=today + timedelta(days=start), end_date=today + timedelta(days=end), is_volunteer=is_volunteer,
+        )
+        for first_name, last_name, is_volunteer, start, end, slot in contacts
+    ])
+
+
+def contacts_query(querystring):
+    filters = parse_filters(QueryDict(querystring))
+    # First page of the table, as fetched by CursorPaginator
+    return filter_contacts(filters).order_by(*get_ordering(filters))[:11]
+
+
+class ContactFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_named_contacts()
+
+    def names(self, querystring):
+        return [contact.first_name for contact in contacts_query(querystring)]
+
+    def test_filters(self):
+        day = (date.today() + timedelta(days=15)).isoformat()
+        self.assertEqual(self.names('is_volunteer=True'), ['Alice', 'Chloé'])
+        self.assertEqual(self.names(f'start_date={day}'), ['Bruno', 'Chloé'])
+        self.assertEqual(self.names(f'end_date={day}'), ['Alice', 'Bruno'])
+        self.assertEqual(self.names(f'start_date={day}&end_date={day}'), ['Bruno'])
+        self.assertEqual(self.names('availability=sunday_evening,tuesday_morning'), ['Chloé'])
+        # Invalid values are ignored rather than failing the page
+        self.assertEqual(self.names('is_volunteer=maybe&start_date=soon&availability=never'), ['Alice', 'Bruno', 'Chloé'])
+
+    def test_whitelisted_sort(self):
+        self.assertEqual(self.names('sort=last_name'), ['Chloé', 'Bruno', 'Alice'])
+        self.assertEqual(self.names('sort=start_date&order=desc'), ['Chloé', 'Bruno', 'Alice'])
+        self.assertEqual(self.names('sort=email&order=desc'), ['Chloé', 'Bruno', 'Alice'])
+        self.assertEqual(self.names('sort=email'), ['Alice', 'Bruno', 'Chloé'])
+
+    def test_view_applies_filters(self):
+        response = self.client.get(reverse('tables-basic'), {'is_volunteer': 'False', 'sort': 'last_name'})
+        self.assertEqual([contact.first_name for contact in response.context['contacts']], ['Bruno'])
+        self.assertEqual(response.context['current_is_volunteer'], 'False')
+        self.assertEqual(response.context['current_sort'], 'last_name')
+
+
+class ContactExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        alice, bruno, _ = create_named_contacts()
+        ContactForm.objects.filter(id=alice.id).update(buddy=bruno)
+        ContactForm.objects.filter(id=bruno.id).update(buddy=alice)
+        cls.staff = User.objects.create_user('staff', password='secret', is_staff=True)
+
+    def export(self, dataset, fmt, **params):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('tables-export', args=[dataset, fmt]), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_staff_only(self):
+        response = self.client.get(reverse('tables-export', args=['contacts', 'csv']))
+        self.assertEqual(response.status_code, 302)
+
+    def test_csv_export_with_filters(self):
+        rows = list(csv.DictReader(io.StringIO(self.export('contacts', 'csv', is_volunteer='True'))))
+        self.assertEqual([row['first_name'] for row in rows], ['Alice', 'Chloé'])
+        self.assertEqual(rows[1]['availability'], 'sunday_evening')
+
+    def test_csv_export_neutralizes_formulas(self):
+        ContactForm.objects.filter(first_name='Chloé').update(
+            last_name='=HYPERLINK("http://example.com")', address='@SUM(A1)', phone='+1+cmd|" /C calc"!A0',
+        )
+        ContactForm.objects.filter(first_name='Alice').update(phone='+33601020304', address='-12 (bâtiment B)')
+
+        rows = csv.DictReader(io.StringIO(self.export('contacts', 'csv')))
+        row, = (row for row in rows if row['first_name'] == 'Chloé')
+
+        self.assertEqual(row['last_name'], '\'=HYPERLINK("http://example.com")')
+        self.assertEqual(row['address'], "'@SUM(A1)")
+        self.assertEqual(row['phone'], '\'+1+cmd|" /C calc"!A0')
+        # Phone numbers and other values that are no formulas are left alone
+        alice, = (row for row in csv.DictReader(io.StringIO(self.export('contacts', 'csv')))
+                  if row['first_name'] == 'Alice')
+        self.assertEqual((alice['phone'], alice['address']), ('+33601020304', "'-12 (bâtiment B)"))
+        # The JSON export is not read by spreadsheets and keeps the values as they are
+        contacts = json.loads(self.export('contacts', 'json'))
+        contact, = (contact for contact in contacts if contact['first_name'] == 'Chloé')
+        self.assertEqual(contact['address'], '@SUM(A1)')
+
+    def test_json_export(self):
+        contacts = json.loads(self.export('contacts', 'json'))
+        self.assertEqual(len(contacts), 3)
+        self.assertEqual(contacts[0]['availability'], ['monday_morning'])
+        self.assertEqual(contacts[0]['start_date'], date.today().isoformat())
+
+    def test_pairs_export(self):
+        pairs = json.loads(self.export('pairs', 'json'))
+        self.assertEqual(len(pairs), 1)
+        self.assertEqual((pairs[0]['seeker_first_name'], pairs[0]['volunteer_first_name']), ('Bruno', 'Alice'))
+
+    def test_pairs_export_with_volunteer_filters(self):
+        # Alice is available in the first days, her seeker Bruno only later
+        period = {'start_date': date.today().isoformat(), 'end_date': (date.today() + timedelta(days=5)).isoformat()}
+
+        volunteer_side = json.loads(self.export('pairs', 'json', is_volunteer='True', **period))
+        seeker_side = json.loads(self.export('pairs', 'json', is_volunteer='False', **period))
+
+        self.assertEqual([(pair['seeker_first_name'], pair['volunteer_first_name']) for pair in volunteer_side],
+                         [('Bruno', 'Alice')])
+        self.assertEqual(seeker_side, [])
+
+    def test_unknown_export(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('tables-export', args=['contacts', 'xml']))
+        # Rendered by the project 404 handler
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.context['status'], 404)
+
+    def test_command(self):
+        output = io.StringIO()
+        call_command('export_contacts', 'contacts', '--slot', 'monday_morning', '--slot', 'sunday_evening',
+                     '--seekers', stdout=output)
+        rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+        self.assertEqual([row['first_name'] for row in rows], ['Bruno'])
+        self.assertEqual(rows[0]['availability'].split(SLOT_SEPARATOR), ['monday_morning'])
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Checks the SQLite query plans')
+class ContactQueryPlanTests(TestCase):
+    def assertUsesIndex(self, querystring, index):
+        plan = contacts_query(querystring).explain()
+        self.assertIn(f'USING INDEX {index}', plan)
+        self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', plan)
+
+    def test_sort_keys_use_an_index(self):
+        self.assertUsesIndex('', 'contact_first_name_idx')
+        self.assertUsesIndex('sort=last_name&order=desc', 'contact_last_name_idx')
+        self.assertUsesIndex('sort=start_date', 'contact_start_date_idx')
+        self.assertUsesIndex('sort=end_date&order=desc', 'contact_end_date_idx')
+
+    def test_role_and_period_filters_use_an_index(self):
+        querystring = f'is_volunteer=True&end_date={date.today().isoformat()}'
+        # Count of the filtered contacts, then their first page
+        plans = [
+            filter_contacts(parse_filters(QueryDict(querystring))).explain(),
+            contacts_query(f'{querystring}&sort=start_date').explain(),
+        ]
+        for plan in plans:
+            self.assertIn('USING INDEX contact_role_period_idx (is_volunteer=? AND start_date<?)', plan)
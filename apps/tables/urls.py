@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import TableView
+from .views import ContactExportView, TableView
 
 
 
@@ -8,5 +8,10 @@ urlpatterns = [
         "tables/basic/",
         TableView.as_view(template_name="tables_basic.html"),
         name="tables-basic",
-    )
+    ),
+    path(
+        "tables/export/<slug:dataset>.<slug:fmt>",
+        ContactExportView.as_view(),
+        name="tables-export",
+    ),
 ]
@@ -1,40 +1,68 @@
+from datetime import date
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
 from django.views.generic import TemplateView
-from django.utils.dateparse import parse_date
-from datetime import date, timedelta
-from apps.volonteers.models import ContactForm
+from apps.db_users.availability import FIELD_LABELS, SLOT_FIELDS
+from apps.modules.pagination import CURSOR_PARAM, CursorPaginator
 from web_project import TemplateLayout
-from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
+from .export import DATASETS, WRITERS, export_lines
+from .filters import filter_contacts, get_ordering, parse_filters
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'json': 'application/json',
+}
 
 class TableView(TemplateView):
     template_name = 'contact_form_list.html'
     paginate_by = 10
 
     def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        
-        contact_list = ContactForm.objects.all().order_by('first_name')  # Fetch all contacts
-        
-        # Paginate the contacts
-        paginator = Paginator(contact_list, self.paginate_by)
-        page = self.request.GET.get('page', 1)
-
-        try:
-            contacts = paginator.page(page)
-        except PageNotAnInteger:
-            contacts = paginator.page(1)
-        except EmptyPage:
-            contacts = paginator.page(paginator.num_pages)
-
-        context['contacts'] = contacts
-        context['total_contacts'] = contact_list.count()
+        context = TemplateLayout.init(self, super().get_context_data(**kwargs))
+
+        # Filters and sort keys are applied in SQL, see apps/tables/filters.py
+        filters = parse_filters(self.request.GET)
+        contact_list = filter_contacts(filters)
+
+        # Paginate the contacts with a cursor, so that late pages are as fast as the first one
+        paginator = CursorPaginator(contact_list, get_ordering(filters), self.paginate_by)
+        context['contacts'] = paginator.get_page(self.request.GET)
+        context['total_contacts'] = paginator.approximate_count()
+
+        context['current_start_date'] = filters['start_date'].isoformat() if filters['start_date'] else ''
+        context['current_end_date'] = filters['end_date'].isoformat() if filters['end_date'] else ''
+        context['current_is_volunteer'] = '' if filters['is_volunteer'] is None else str(filters['is_volunteer'])
+        context['current_availability'] = filters['availability']
+        context['current_sort'] = filters['sort']
+        context['current_order'] = filters['order']
+
+        # Query string of the filters, kept by the sort links
+        params = self.request.GET.copy()
+        for name in (CURSOR_PARAM, 'sort', 'order'):
+            params.pop(name, None)
+        context['filter_querystring'] = params.urlencode()
 
         # Define availability options with corresponding model fields
         context['availability_slots'] = [
-            {'field': 'thursday_all_day', 'label': 'Jeudi toute la journée'},
-            {'field': 'thursday_morning', 'label': 'Jeudi matin'},
-            {'field': 'thursday_afternoon', 'label': 'Jeudi après-midi'},
-            {'field': 'thursday_evening', 'label': 'Jeudi soir'},
-            # Add more slots for other days...
+            {'field': field, 'label': FIELD_LABELS[field]} for field in SLOT_FIELDS
         ]
 
-        return context
\ No newline at end of file
+        return context
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class ContactExportView(View):
+    """Streaming CSV or JSON export of the contacts or buddy pairs, with the filters of TableView."""
+
+    def get(self, request, dataset, fmt):
+        if dataset not in DATASETS or fmt not in WRITERS:
+            raise Http404(f"Unknown export {dataset}.{fmt}")
+        filters = parse_filters(request.GET)
+        response = StreamingHttpResponse(
+            export_lines(dataset, fmt, filters), content_type=CONTENT_TYPES[fmt],
+        )
+        response['Content-Disposition'] = f'attachment; filename="{dataset}-{date.today():%Y%m%d}.{fmt}"'
+        return response
@@ -1,8 +1,8 @@
-from django.core.paginator import Paginator
-from django.db.models import Q
 from datetime import datetime, timedelta
 from django.views.generic import TemplateView
+from apps.db_users.availability import SLOT_FIELDS
 from apps.db_users.models import ContactForm
+from apps.modules.pagination import CursorPaginator
 from web_project import TemplateLayout
 
 
@@ -20,6 +20,7 @@ class BuddiesDashboardView(TemplateView):
         # Filtrer et paginer les buddies disponibles à partir de J+7
         filtered_buddies = self.filter_buddies_from_j7(start_date, availability_filters)
         buddy_pairs_page = self.paginate_buddy_pairs(filtered_buddies)
+        buddy_pairs_page.object_list = self.get_buddy_pairs(buddy_pairs_page.object_list)
 
         # Mise à jour du contexte
         context.update({
@@ -40,46 +41,33 @@ class BuddiesDashboardView(TemplateView):
 
     def filter_buddies_from_j7(self, start_date, availability_filters):
         """Filtrer les buddies disponibles à partir de J+7."""
-        # Filtrer par start_date >= J+7
-        buddies = ContactForm.objects.filter(submit_at__gte=start_date)
+        # Filtrer par start_date >= J+7, les buddies étant chargés par la même requête
+        buddies = ContactForm.objects.filter(submit_at__gte=start_date, buddy__isnull=False).select_related('buddy')
 
         # Appliquer les filtres de disponibilité, si disponibles
         if availability_filters:
-            availability_query = self.build_availability_query(availability_filters)
-            buddies = buddies.filter(availability_query)
+            buddies = buddies.available_in_all(*self.get_known_slots(availability_filters))
 
-        return self.get_buddy_pairs(buddies)
+        return buddies
 
-    def build_availability_query(self, availability_filters):
-        """Construire la requête Q pour filtrer par disponibilité."""
-        return Q(**{f"{availability}": True for availability in availability_filters})
+    def get_known_slots(self, availability_filters):
+        """Ignorer les créneaux inconnus passés dans l'URL."""
+        return [availability for availability in availability_filters if availability in SLOT_FIELDS]
 
     def get_buddy_pairs(self, buddies):
         """Retourner les paires de buddies avec leur disponibilité respective."""
-        buddy_pairs = []
-        for buddy in buddies:
-            paired_buddy = ContactForm.objects.filter(id=buddy.buddy_id).first()
-            if paired_buddy:
-                buddy_pairs.append({
-                    'person': buddy,
-                    'buddy': paired_buddy,
-                    'person_slots': self.get_availability_slots(buddy),
-                    'buddy_slots': self.get_availability_slots(paired_buddy)
-                })
-        return buddy_pairs
+        return [
+            {
+                'person': buddy,
+                'buddy': buddy.buddy,
+                'person_slots': self.get_availability_slots(buddy),
+                'buddy_slots': self.get_availability_slots(buddy.buddy)
+            }
+            for buddy in buddies
+        ]
 
     def get_availability_slots(self, buddy):
         """Retourner les créneaux de disponibilité d'un buddy sous forme lisible."""
-        availability_fields = [
-            'monday_all_day', 'monday_morning', 'monday_afternoon', 'monday_evening',
-            'tuesday_all_day', 'tuesday_morning', 'tuesday_afternoon', 'tuesday_evening',
-            'wednesday_all_day', 'wednesday_morning', 'wednesday_afternoon', 'wednesday_evening',
-            'thursday_all_day', 'thursday_morning', 'thursday_afternoon', 'thursday_evening',
-            'friday_all_day', 'friday_morning', 'friday_afternoon', 'friday_evening',
-            'saturday_all_day', 'saturday_morning', 'saturday_afternoon', 'saturday_evening',
-            'sunday_all_day', 'sunday_morning', 'sunday_afternoon', 'sunday_evening'
-        ]
-
         slot_labels = {
             'monday_all_day': 'Lundi Toute la journée',
             'monday_morning': 'Lundi Matin',
@@ -112,10 +100,10 @@ class BuddiesDashboardView(TemplateView):
         }
 
         # Filtrer et retourner les créneaux disponibles sous forme de liste
-        return [slot_labels[field] for field in availability_fields if getattr(buddy, field, False)]
+        return [slot_labels[field] for field in buddy.availability_slots]
 
-    def paginate_buddy_pairs(self, buddy_pairs):
-        """Paginer la liste des paires de buddies (10 par page)."""
-        paginator = Paginator(buddy_pairs, 10)
-        page_number = self.request.GET.get('page')
-        return paginator.get_page(page_number)
\ No newline at end of file
+    def paginate_buddy_pairs(self, buddies):
+        """Paginer les buddies en base de données par curseur (10 par page)."""
+        # L'ordre suit l'index contact_submit_at_idx
+        paginator = CursorPaginator(buddies, ('submit_at', 'id'), 10)
+        return paginator.get_page(self.request.GET)
\ No newline at end of file
@@ -1,5 +1,9 @@
-from django.contrib import admin
-from .models import ContactForm
+from django.contrib import admin, messages
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from .geocoding import locate
+from .matching import run_matching
+from .models import ContactForm, MatchJob
 
 @admin.register(ContactForm)
 class ContactFormAdmin(admin.ModelAdmin):
@@ -11,97 +15,60 @@ class ContactFormAdmin(admin.ModelAdmin):
     )
     list_filter = ('is_volunteer', 'start_date', 'end_date')
     search_fields = ('first_name', 'last_name', 'email', 'phone')
+    # The buddy columns are annotated in get_queryset(), no need to load the whole buddy row
+    list_select_related = False
+    # Skip the COUNT(*) of the whole table on filtered pages
+    show_full_result_count = False
+    actions = ['run_matching_for_selected']
 
     # Read-only fields
     readonly_fields = ('buddy_info',)
 
+    def get_queryset(self, request):
+        # Buddy name and role come with the page query, through the buddy_id join
+        return super().get_queryset(request).annotate(
+            buddy_name=Concat('buddy__first_name', Value(' '), 'buddy__last_name'),
+            buddy_is_volunteer=F('buddy__is_volunteer'),
+        )
+
     # Method to display the buddy information
     def buddy_info(self, obj):
         if obj.buddy_id:  # Check if a buddy is assigned
-            try:
-                buddy = ContactForm.objects.get(id=obj.buddy_id)
-                return f"{buddy.first_name} {buddy.last_name} ({'Volunteer' if buddy.is_volunteer else 'Seeker'})"
-            except ContactForm.DoesNotExist:
-                return "No buddy assigned"
+            return f"{obj.buddy_name} ({'Volunteer' if obj.buddy_is_volunteer else 'Seeker'})"
         return "No buddy assigned"
 
     buddy_info.short_description = 'Buddy Information'
 
     # Method to display available days
     def available_days(self, obj):
-        days = []
-        # Check availability for each day and time slot
-        if obj.monday_all_day:
-            days.append("Lundi toute la journée")
-        if obj.monday_morning:
-            days.append("Lundi matin")
-        if obj.monday_afternoon:
-            days.append("Lundi après-midi")
-        if obj.monday_evening:
-            days.append("Lundi soir")
-
-        if obj.tuesday_all_day:
-            days.append("Mardi toute la journée")
-        if obj.tuesday_morning:
-            days.append("Mardi matin")
-        if obj.tuesday_afternoon:
-            days.append("Mardi après-midi")
-        if obj.tuesday_evening:
-            days.append("Mardi soir")
-
-        if obj.wednesday_all_day:
-            days.append("Mercredi toute la journée")
-        if obj.wednesday_morning:
-            days.append("Mercredi matin")
-        if obj.wednesday_afternoon:
-            days.append("Mercredi après-midi")
-        if obj.wednesday_evening:
-            days.append("Mercredi soir")
-
-        if obj.thursday_all_day:
-            days.append("Jeudi toute la journée")
-        if obj.thursday_morning:
-            days.append("Jeudi matin")
-        if obj.thursday_afternoon:
-            days.append("Jeudi après-midi")
-        if obj.thursday_evening:
-            days.append("Jeudi soir")
-
-        if obj.friday_all_day:
-            days.append("Vendredi toute la journée")
-        if obj.friday_morning:
-            days.append("Vendredi matin")
-        if obj.friday_afternoon:
-            days.append("Vendredi après-midi")
-        if obj.friday_evening:
-            days.append("Vendredi soir")
-
-        if obj.saturday_all_day:
-            days.append("Samedi toute la journée")
-        if obj.saturday_morning:
-            days.append("Samedi matin")
-        if obj.saturday_afternoon:
-            days.append("Samedi après-midi")
-        if obj.saturday_evening:
-            days.append("Samedi soir")
-
-        if obj.sunday_all_day:
-            days.append("Dimanche toute la journée")
-        if obj.sunday_morning:
-            days.append("Dimanche matin")
-        if obj.sunday_afternoon:
-            days.append("Dimanche après-midi")
-        if obj.sunday_evening:
-            days.append("Dimanche soir")
-
+        days = obj.availability_labels
         return ", ".join(days) if days else "Aucune disponibilité"
 
     available_days.short_description = 'Jours Disponibles'  # Custom column title
 
+    @admin.action(description="Lancer l'appariement pour la sélection")
+    def run_matching_for_selected(self, request, queryset):
+        # Set-based matcher: the selected free seekers against the selected free volunteers
+        selected = ContactForm.objects.filter(pk__in=queryset.values('pk'))
+        matches = run_matching(seekers=selected, volunteers=selected, strategy='optimal')
+        if matches:
+            self.message_user(request, f"{len(matches)} binôme(s) créé(s).", messages.SUCCESS)
+        else:
+            self.message_user(
+                request, "Aucun binôme possible : sélectionnez des demandeurs et des bénévoles libres et compatibles.",
+                messages.WARNING,
+            )
+
+    def save_model(self, request, obj, form, change):
+        # A new or edited address is geocoded again, grid_cell follows in save()
+        if 'address' in form.changed_data:
+            locate(obj)
+        super().save_model(request, obj, form, change)
+
     # Fieldsets to group fields logically (optional)
     fieldsets = (
         (None, {
-            'fields': ('first_name', 'last_name', 'email', 'phone')
+            'fields': ('first_name', 'last_name', 'email', 'phone', 'address')
         }),
         ('Availability', {
             'fields': (
@@ -122,6 +89,14 @@ class ContactFormAdmin(admin.ModelAdmin):
         }),
     )
 
+@admin.register(MatchJob)
+class MatchJobAdmin(admin.ModelAdmin):
+    list_display = ('contact', 'status', 'attempts', 'matched_with', 'created_at', 'claimed_at', 'processed_at')
+    list_filter = ('status',)
+    list_select_related = ('contact',)
+    raw_id_fields = ('contact',)
+    readonly_fields = ('claimed_at', 'processed_at', 'attempts', 'matched_with', 'error')
+
 # Change the title of the admin site
 admin.site.site_header = "Accès mairie"
 admin.site.site_title = "Admin - Accès mairie"
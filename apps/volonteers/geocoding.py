@@ -0,0 +1,16 @@
+"""Geocoding of the contact addresses, on submission and when edited in the admin."""
+from typing import Optional
+
+from apps.db_users.models import ContactForm
+from apps.map.geocoding import Coordinates, address_key, geocode
+
+
+def geocode_contact(address: str) -> Optional[Coordinates]:
+    """Coordinates of the address, reusing those of a contact already geocoded at the same address."""
+    known = ContactForm.objects.filter(address=address, lat__isnull=False).values_list('lat', 'lon').first()
+    return geocode(address, {address_key(address): known} if known else None)
+
+
+def locate(contact: ContactForm):
+    """Set the coordinates of the contact from its address, saved with the contact."""
+    contact.set_location(geocode_contact(contact.address))
@@ -0,0 +1,65 @@
+import logging
+from datetime import timedelta
+from typing import List
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .matching import match_contact
+from .models import MatchJob
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+DEFAULT_LEASE = 10 * 60
+
+
+def enqueue_match(contact) -> MatchJob:
+    """Queue the matching of a newly saved contact."""
+    return MatchJob.objects.create(contact=contact)
+
+
+def claimable() -> Q:
+    """Pending jobs, and running ones whose worker held them longer than MATCH_JOB_LEASE seconds (it crashed)."""
+    expired = timezone.now() - timedelta(seconds=getattr(settings, 'MATCH_JOB_LEASE', DEFAULT_LEASE))
+    return Q(status=MatchJob.STATUS_PENDING) | Q(status=MatchJob.STATUS_RUNNING, claimed_at__lt=expired)
+
+
+def claim_jobs(limit: int) -> List[MatchJob]:
+    """Mark up to `limit` claimable jobs as running; jobs claimed by another worker are left out."""
+    ids = list(MatchJob.objects.filter(claimable()).values_list('id', flat=True)[:limit])
+    # The conditional update is atomic, so only one worker wins each job
+    claimed = [
+        job_id for job_id in ids
+        if MatchJob.objects.filter(claimable(), id=job_id).update(
+            status=MatchJob.STATUS_RUNNING, claimed_at=timezone.now(),
+        )
+    ]
+    return list(MatchJob.objects.filter(id__in=claimed))
+
+
+def process_job(job: MatchJob) -> MatchJob:
+    job.attempts += 1
+    try:
+        with transaction.atomic():
+            match = match_contact(job.contact_id)
+    except Exception as e:  # pylint: disable=broad-except
+        logger.error(f"Match job {job.id} for contact {job.contact_id} failed: {e}")
+        job.error = str(e)
+        job.status = MatchJob.STATUS_PENDING if job.attempts < MAX_ATTEMPTS else MatchJob.STATUS_FAILED
+    else:
+        if match is not None:
+            seeker_id, volunteer_id = match
+            job.matched_with = volunteer_id if job.contact_id == seeker_id else seeker_id
+        job.error = ''
+        job.status = MatchJob.STATUS_DONE
+    job.processed_at = timezone.now()
+    job.save(update_fields=['status', 'attempts', 'matched_with', 'error', 'processed_at'])
+    return job
+
+
+def process_pending(limit: int = 100) -> List[MatchJob]:
+    """Process the oldest pending jobs, returns them with their outcome."""
+    return [process_job(job) for job in claim_jobs(limit)]
@@ -0,0 +1,54 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from apps.db_users.availability import SLOT_BITS
+from apps.modules import geo
+from apps.volonteers.matching import STRATEGIES, Candidate, free_seekers, free_volunteers, get_radius, load_candidates
+
+class Command(BaseCommand):
+    help = 'Compare the match count and runtime of the matching strategies, on generated or current data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seekers', type=int, default=6000, help='Number of generated seekers')
+        parser.add_argument('--volunteers', type=int, default=6000, help='Number of generated volunteers')
+        parser.add_argument('--slots', type=int, default=3, help='Average number of weekly slots per contact')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--from-db', action='store_true', help='Use the free contacts of the database instead')
+        parser.add_argument(
+            '--radius', type=float, help='Maximum distance in metres between located contacts, 0 to ignore distances '
+                                         '(default: MATCHING_RADIUS)',
+        )
+        parser.add_argument('--area', type=float, default=4000, help='Side in metres of the square generated contacts live in')
+
+    def generate(self, count, first_id, slots, area, rng):
+        """Contacts available over a year, for up to a month, on a few random weekly slots, living in a square of `area` metres."""
+        bits = list(SLOT_BITS.values())
+        origin_x, origin_y = geo.project(geo.REFERENCE_LAT, 2.2666)
+        candidates = []
+        for offset in range(count):
+            start = rng.randint(0, 365)
+            availability = 0
+            for bit in rng.sample(bits, max(1, min(len(bits), round(rng.expovariate(1 / slots))))):
+                availability |= bit
+            candidates.append(Candidate(
+                first_id + offset, start, start + rng.randint(0, 30), availability,
+                origin_x + rng.uniform(0, area), origin_y + rng.uniform(0, area),
+            ))
+        return candidates
+
+    def handle(self, *args, **options):
+        if options['from_db']:
+            seekers, volunteers = load_candidates(free_seekers()), load_candidates(free_volunteers())
+        else:
+            rng = random.Random(options['seed'])
+            seekers = self.generate(options['seekers'], 0, options['slots'], options['area'], rng)
+            volunteers = self.generate(options['volunteers'], len(seekers), options['slots'], options['area'], rng)
+        radius = get_radius() if options['radius'] is None else options['radius']
+
+        self.stdout.write(f"{len(seekers)} seeker(s), {len(volunteers)} volunteer(s), radius {radius or 'none'}")
+        for name, strategy in STRATEGIES.items():
+            started = time.monotonic()
+            matches = strategy(seekers, volunteers, radius)
+            elapsed = time.monotonic() - started
+            self.stdout.write(f"{name:>8}: {len(matches)} match(es) in {elapsed:.3f}s")
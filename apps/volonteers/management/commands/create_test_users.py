@@ -1,10 +1,12 @@
 from django.core.management.base import BaseCommand
+from apps.db_users.availability import mask_from_fields
 from apps.db_users.models import ContactForm
+from apps.dashboard_volonteers.stats import rebuild_stats
 from faker import Faker
 import random
 from datetime import timedelta, date, datetime
 import unidecode
-import requests
+from apps.modules import http_client
 from django.core.exceptions import ValidationError
 
 class Command(BaseCommand):
@@ -12,7 +14,11 @@ class Command(BaseCommand):
 
     def fetch_real_addresses(self):
         # Fetch real addresses from Châtenay-Malabry via API call
-        response = requests.get("https://api-adresse.data.gouv.fr/search/?q=Châtenay-Malabry&postcode=92290&limit=100")
+        response = http_client.get(
+            "https://api-adresse.data.gouv.fr/search/",
+            params={'q': 'Châtenay-Malabry', 'postcode': '92290', 'limit': 100},
+        )
+        response.raise_for_status()
         data = response.json()
         if data['features']:
             return [f"{random.randint(1, 10)} {address['properties']['label']}" for address in data['features']]
@@ -102,6 +108,8 @@ class Command(BaseCommand):
                 'sunday_morning': availability['sunday_morning'],
                 'sunday_afternoon': availability['sunday_afternoon'],
                 'sunday_evening': availability['sunday_evening'],
+                # bulk_create() skips save(), which keeps the bitmask in sync
+                'availability': mask_from_fields(availability),
                 'is_volunteer': is_volunteer
             }
 
@@ -163,4 +171,7 @@ class Command(BaseCommand):
         for month_name, start_date, end_date, user_count in months:
             previous_users = create_users_for_month(month_name, start_date, end_date, user_count, previous_users)
 
+        # bulk_create() does not send the signals maintaining the dashboard statistics
+        rebuild_stats()
+
         self.stdout.write(self.style.SUCCESS('Successfully created test users with volunteers and seekers.'))
\ No newline at end of file
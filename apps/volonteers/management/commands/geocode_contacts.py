@@ -0,0 +1,58 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from apps.db_users.models import ContactForm
+from apps.map.geocoding import DEFAULT_BATCH_SIZE, address_key, geocode_many
+from apps.modules import geo
+
+UPDATE_BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = 'Geocode the addresses of the contacts without coordinates.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Geocode every contact again, not only the missing ones.')
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help='Addresses sent per call to the api-adresse.data.gouv.fr CSV geocoder.',
+        )
+        parser.add_argument(
+            '--local', action='store_true',
+            help='Only use the imported addresses and the contacts already geocoded, never the upstream API.',
+        )
+
+    def handle(self, *args, **options):
+        contacts = ContactForm.objects.all() if options['all'] else ContactForm.objects.filter(lat__isnull=True)
+
+        # Addresses already resolved for other contacts are not geocoded again
+        known = {}
+        if not options['all']:
+            for address, lat, lon in ContactForm.objects.filter(lat__isnull=False).values_list('address', 'lat', 'lon'):
+                known[address_key(address)] = (lat, lon)
+
+        addresses = set(contacts.values_list('address', flat=True).distinct())
+        resolved = geocode_many(
+            addresses, known, batch_size=options['batch_size'], upstream=False if options['local'] else None,
+        )
+
+        # Contacts sharing an address get the same values, one UPDATE per address by primary keys
+        by_address = defaultdict(list)
+        for pk, address in contacts.values_list('id', 'address'):
+            by_address[address].append(pk)
+        updated = 0
+        for address, pks in by_address.items():
+            coordinates = resolved.get(address)
+            if coordinates is None:
+                continue
+            lat, lon = coordinates
+            for start in range(0, len(pks), UPDATE_BATCH_SIZE):
+                updated += ContactForm.objects.filter(id__in=pks[start:start + UPDATE_BATCH_SIZE]).update(
+                    lat=lat, lon=lon, grid_cell=geo.grid_cell(lat, lon),
+                )
+
+        unresolved = sum(1 for coordinates in resolved.values() if coordinates is None)
+        self.stdout.write(self.style.SUCCESS(
+            f"{updated} contacts geocoded from {len(addresses)} distinct addresses, {unresolved} addresses not found."
+        ))
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.dashboard_volonteers.stats import process_refreshes
+from apps.volonteers.jobs import process_pending
+from apps.volonteers.models import MatchJob
+
+DEFAULT_INTERVAL = 5
+
+
+class Command(BaseCommand):
+    help = ('Process queued match jobs, matching each new contact against the unmatched pool, '
+            'and the queued refreshes of the dashboard statistics.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=DEFAULT_INTERVAL,
+            help='Seconds to wait when the queue is empty.',
+        )
+        parser.add_argument('--batch', type=int, default=100, help='Jobs claimed at a time.')
+        parser.add_argument('--once', action='store_true', help='Process the pending jobs and exit.')
+
+    def handle(self, *args, **options):
+        while True:
+            jobs = process_pending(options['batch'])
+            rows = process_refreshes()
+            if rows:
+                self.stdout.write(f"Refreshed {rows} daily statistics row(s).")
+            if jobs:
+                matched = sum(1 for job in jobs if job.matched_with is not None)
+                failed = sum(1 for job in jobs if job.status == MatchJob.STATUS_FAILED)
+                self.stdout.write(f"Processed {len(jobs)} job(s): {matched} matched, {failed} failed.")
+            elif options['once']:
+                break
+            else:
+                time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS('Match worker finished.'))
@@ -0,0 +1,513 @@
+import logging
+import math
+from bisect import bisect_left, bisect_right
+from functools import partial
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from apps.dashboard_volonteers.stats import refresh_contacts
+from apps.db_users.availability import SLOT_BITS, SLOT_FIELDS
+from apps.db_users.models import ContactForm
+from apps.modules import geo
+
+logger = logging.getLogger(__name__)
+
+
+class Candidate(NamedTuple):
+    """Compact view of a ContactForm row, dates as ordinals and position in metres (`geo.project`)."""
+    id: int
+    start: int
+    end: int
+    availability: int
+    x: Optional[float] = None
+    y: Optional[float] = None
+
+    @property
+    def located(self) -> bool:
+        return self.x is not None
+
+
+Match = Tuple[int, int]  # (seeker id, volunteer id)
+
+GRID_SIZE = 250  # metres, side of the GridIndex cells
+
+
+def get_radius() -> Optional[float]:
+    return getattr(settings, 'MATCHING_RADIUS', None)
+
+
+def make_candidate(pk, start_date, end_date, availability, lat=None, lon=None) -> Candidate:
+    if lat is None or lon is None:
+        return Candidate(pk, start_date.toordinal(), end_date.toordinal(), availability)
+    return Candidate(pk, start_date.toordinal(), end_date.toordinal(), availability, *geo.project(lat, lon))
+
+
+def planar_distance(first: Candidate, second: Candidate) -> float:
+    """Distance in metres between two located candidates."""
+    return math.hypot(first.x - second.x, first.y - second.y)
+
+
+def is_compatible(seeker: Candidate, volunteer: Candidate) -> bool:
+    """Dates overlap and at least one weekly slot is shared."""
+    return (seeker.start <= volunteer.end and volunteer.start <= seeker.end
+            and bool(seeker.availability & volunteer.availability))
+
+
+def load_candidates(queryset) -> List[Candidate]:
+    """Load the rows of `queryset` that can be matched, in a single query."""
+    rows = queryset.filter(availability__gt=0).values_list('id', 'start_date', 'end_date', 'availability', 'lat', 'lon')
+    return [make_candidate(*row) for row in rows]
+
+
+def free_seekers():
+    return ContactForm.objects.filter(is_volunteer=False, buddy_id__isnull=True)
+
+
+def free_volunteers():
+    return ContactForm.objects.filter(is_volunteer=True, buddy_id__isnull=True)
+
+
+class IntervalIndex:
+    """
+    Volunteers of one weekly slot, sorted by start date.
+
+    A segment tree keeps the latest end date of each range of volunteers, so the
+    first volunteer whose dates overlap `[start, end]` is found in O(log n) and a
+    matched volunteer is removed in O(log n).
+    """
+
+    def __init__(self, candidates: Iterable[Candidate]):
+        candidates = sorted(candidates, key=lambda candidate: candidate.start)
+        self.starts = [candidate.start for candidate in candidates]
+        self.ids = [candidate.id for candidate in candidates]
+        self.positions = {candidate.id: position for position, candidate in enumerate(candidates)}
+        self.size = 1
+        while self.size < len(candidates):
+            self.size *= 2
+        self.tree = [-1] * (2 * self.size)
+        for position, candidate in enumerate(candidates):
+            self.tree[self.size + position] = candidate.end
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def remove(self, candidate_id: int):
+        node = self.size + self.positions[candidate_id]
+        self.tree[node] = -1
+        node //= 2
+        while node:
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+            node //= 2
+
+    def find(self, start: int, end: int) -> Optional[int]:
+        """Id of the first remaining volunteer starting by `end` and ending on or after `start`."""
+        limit = bisect_right(self.starts, end)
+        if not limit:
+            return None
+        position = self._find(1, 0, self.size, limit, start)
+        return None if position is None else self.ids[position]
+
+    def _find(self, node: int, low: int, high: int, limit: int, start: int) -> Optional[int]:
+        if low >= limit or self.tree[node] < start:
+            return None
+        if high - low == 1:
+            return low
+        middle = (low + high) // 2
+        found = self._find(2 * node, low, middle, limit, start)
+        if found is None:
+            found = self._find(2 * node + 1, middle, high, limit, start)
+        return found
+
+    def find_all(self, start: int, end: int) -> List[int]:
+        """Ids of every remaining volunteer whose dates overlap `[start, end]`."""
+        limit = bisect_right(self.starts, end)
+        found = []
+        stack = [(1, 0, self.size)]
+        while stack:
+            node, low, high = stack.pop()
+            if low >= limit or self.tree[node] < start:
+                continue
+            if high - low == 1:
+                found.append(self.ids[low])
+                continue
+            middle = (low + high) // 2
+            stack.append((2 * node + 1, middle, high))
+            stack.append((2 * node, low, middle))
+        return found
+
+
+class SlotIndex:
+    """One IntervalIndex per weekly slot, volunteers being listed under each of their slots."""
+
+    def __init__(self, volunteers: Iterable[Candidate]):
+        self.volunteers = {volunteer.id: volunteer for volunteer in volunteers}
+        self.slots = {
+            bit: IntervalIndex(volunteer for volunteer in self.volunteers.values() if volunteer.availability & bit)
+            for bit in SLOT_BITS.values()
+        }
+
+    def find(self, seeker: Candidate) -> Optional[int]:
+        for field in SLOT_FIELDS:
+            bit = SLOT_BITS[field]
+            if seeker.availability & bit:
+                found = self.slots[bit].find(seeker.start, seeker.end)
+                if found is not None:
+                    return found
+        return None
+
+    def find_all(self, seeker: Candidate) -> List[int]:
+        found = set()
+        for bit, index in self.slots.items():
+            if seeker.availability & bit:
+                found.update(index.find_all(seeker.start, seeker.end))
+        return list(found)
+
+    def remove(self, volunteer_id: int):
+        availability = self.volunteers[volunteer_id].availability
+        for bit, index in self.slots.items():
+            if availability & bit:
+                index.remove(volunteer_id)
+
+
+class GridIndex:
+    """
+    Located volunteers bucketed per weekly slot in square cells of `size` metres.
+
+    Nearest-volunteer lookups visit the cells ring by ring around the seeker and stop
+    as soon as the next ring cannot hold a closer volunteer, so a lookup only looks at
+    the volunteers living around the seeker, never at the distance to every volunteer.
+    Only the cells of the seeker's slots are visited, and each cell lists its volunteers
+    by start date, so volunteers never available when the seeker is, or starting after
+    the seeker's end, are skipped without being looked at.
+    """
+
+    def __init__(self, volunteers: Iterable[Candidate], size: float = GRID_SIZE):
+        self.size = size
+        # Per slot and cell, the start dates and the volunteers sorted by start date
+        self.slots: Dict[int, Dict[Tuple[int, int], Tuple[List[int], List[Candidate]]]] = {
+            bit: {} for bit in SLOT_BITS.values()
+        }
+        # Earliest start date per slot, only ever too early once volunteers are removed
+        self.first_starts: Dict[int, int] = {}
+        located = (volunteer for volunteer in volunteers if volunteer.located)
+        for volunteer in sorted(located, key=lambda candidate: (candidate.start, candidate.id)):
+            cell = self._cell(volunteer)
+            for bit, cells in self.slots.items():
+                if volunteer.availability & bit:
+                    self.first_starts.setdefault(bit, volunteer.start)
+                    starts, bucket = cells.setdefault(cell, ([], []))
+                    starts.append(volunteer.start)
+                    bucket.append(volunteer)
+
+    def _cell(self, candidate: Candidate) -> Tuple[int, int]:
+        return math.floor(candidate.x / self.size), math.floor(candidate.y / self.size)
+
+    @staticmethod
+    def _ring(x: int, y: int, ring: int) -> Iterable[Tuple[int, int]]:
+        """Cells `ring` cells away (Chebyshev distance) from the cell (x, y)."""
+        if ring == 0:
+            yield x, y
+            return
+        for i in range(x - ring, x + ring + 1):
+            yield i, y - ring
+            yield i, y + ring
+        for j in range(y - ring + 1, y + ring):
+            yield x - ring, j
+            yield x + ring, j
+
+    def remove(self, volunteer: Candidate):
+        if volunteer.located:
+            cell = self._cell(volunteer)
+            for bit, cells in self.slots.items():
+                if volunteer.availability & bit and cell in cells:
+                    starts, bucket = cells[cell]
+                    for position in range(bisect_left(starts, volunteer.start), bisect_right(starts, volunteer.start)):
+                        if bucket[position].id == volunteer.id:
+                            del starts[position], bucket[position]
+                            break
+                    if not bucket:
+                        # Emptied cells are dropped, lookups then skip the slots left without volunteers
+                        del cells[cell]
+
+    def nearest(self, seeker: Candidate, radius: float,
+                accept: Callable[[Candidate], bool] = lambda volunteer: True) -> Optional[int]:
+        """Id of the closest accepted volunteer within `radius` metres of the located `seeker`."""
+        x, y = self._cell(seeker)
+        rings = math.ceil(radius / self.size)
+        # Volunteers exactly `radius` metres away are accepted
+        best_distance, best_id = math.nextafter(radius, math.inf), None
+
+        def visit(starts: List[int], bucket: List[Candidate]):
+            nonlocal best_distance, best_id
+            # Volunteers starting after the seeker's end come last and are never looked at
+            for volunteer in islice(bucket, bisect_right(starts, seeker.end)):
+                distance = math.hypot(volunteer.x - seeker.x, volunteer.y - seeker.y)
+                if distance < best_distance and accept(volunteer):
+                    best_distance, best_id = distance, volunteer.id
+
+        slots = [
+            cells for bit, cells in self.slots.items()
+            if seeker.availability & bit and cells and self.first_starts[bit] <= seeker.end
+        ]
+        if not slots:
+            return None
+        for ring in range(rings + 1):
+            # Volunteers of this ring and the next ones are at least (ring - 1) cells away
+            if best_id is not None and best_distance <= (ring - 1) * self.size:
+                break
+            for cell in self._ring(x, y, ring):
+                for cells in slots:
+                    if cell in cells:
+                        visit(*cells[cell])
+        return best_id
+
+
+def greedy_matches(seekers: List[Candidate], volunteers: List[Candidate],
+                   radius: Optional[float] = None) -> List[Match]:
+    """
+    Match seekers in order of start date with the first compatible free volunteer.
+
+    Each seeker costs at most one interval lookup per slot it is available in,
+    so the whole run is O((seekers + volunteers) * slots * log(volunteers)).
+
+    With a `radius`, located seekers get the nearest compatible volunteer within
+    `radius` metres (`GridIndex`), or else a compatible volunteer without coordinates.
+    Volunteers ending before the current seeker starts are dropped from the grid, as
+    no later seeker can match them.
+    """
+    index = SlotIndex(volunteers)
+    if radius:
+        grid = GridIndex(volunteers)
+        unlocated = SlotIndex(volunteer for volunteer in volunteers if not volunteer.located)
+        located = [volunteer for volunteer in volunteers if volunteer.located]
+        by_end = sorted(located, key=lambda candidate: candidate.end)
+        expired = 0
+    matches = []
+    for seeker in sorted(seekers, key=lambda candidate: (candidate.start, candidate.id)):
+        if radius:
+            # Seekers come by start date: volunteers ending before this one starts can't match anyone left
+            while expired < len(by_end) and by_end[expired].end < seeker.start:
+                grid.remove(by_end[expired])
+                expired += 1
+        if radius and seeker.located:
+            volunteer_id = grid.nearest(seeker, radius, partial(is_compatible, seeker))
+            if volunteer_id is None:
+                volunteer_id = unlocated.find(seeker)
+        else:
+            volunteer_id = index.find(seeker)
+        if volunteer_id is not None:
+            index.remove(volunteer_id)
+            if radius:
+                grid.remove(index.volunteers[volunteer_id])
+                if volunteer_id in unlocated.volunteers:
+                    unlocated.remove(volunteer_id)
+            matches.append((seeker.id, volunteer_id))
+    return matches
+
+
+def pair_score(seeker: Candidate, volunteer: Candidate) -> Tuple[int, int]:
+    """Number of shared weekly slots, then number of overlapping days."""
+    shared_slots = bin(seeker.availability & volunteer.availability).count('1')
+    overlap_days = min(seeker.end, volunteer.end) - max(seeker.start, volunteer.start) + 1
+    return shared_slots, overlap_days
+
+
+def compatibility_graph(seekers: List[Candidate], volunteers: List[Candidate],
+                        radius: Optional[float] = None) -> List[List[int]]:
+    """
+    For each seeker, the positions in `volunteers` of its compatible volunteers.
+
+    Neighbours are listed best pair first (see `pair_score`), so augmenting paths
+    prefer volunteers sharing more slots and days with the seeker. With a `radius`,
+    located seekers lose the located volunteers further than `radius` metres and get
+    the others nearest first, then the volunteers without coordinates.
+    """
+    index = SlotIndex(volunteers)
+    positions = {volunteer.id: position for position, volunteer in enumerate(volunteers)}
+    graph = []
+    for seeker in seekers:
+        ranked = []
+        for volunteer_id in index.find_all(seeker):
+            volunteer = index.volunteers[volunteer_id]
+            if radius and seeker.located and volunteer.located:
+                distance = planar_distance(seeker, volunteer)
+                if distance > radius:
+                    continue
+                ranked.append(((1, -distance), pair_score(seeker, volunteer), positions[volunteer_id]))
+            else:
+                ranked.append(((0, 0), pair_score(seeker, volunteer), positions[volunteer_id]))
+        ranked.sort(reverse=True)
+        graph.append([position for _, _, position in ranked])
+    return graph
+
+
+def optimal_matches(seekers: List[Candidate], volunteers: List[Candidate],
+                    radius: Optional[float] = None) -> List[Match]:
+    """
+    Maximum-cardinality matching of the compatibility graph (Hopcroft-Karp).
+
+    Runs in O(edges * sqrt(contacts)). The search is iterative, so long
+    augmenting paths do not hit the recursion limit.
+    """
+    graph = compatibility_graph(seekers, volunteers, radius)
+    unmatched = -1
+    infinity = len(seekers) + 1
+    seeker_match = [unmatched] * len(seekers)
+    volunteer_match = [unmatched] * len(volunteers)
+    distance = [infinity] * len(seekers)
+
+    def layer():
+        """Breadth-first layering from the free seekers; True when a free volunteer is reachable."""
+        queue = []
+        for seeker, volunteer in enumerate(seeker_match):
+            distance[seeker] = 0 if volunteer == unmatched else infinity
+            if volunteer == unmatched:
+                queue.append(seeker)
+        reachable = False
+        for seeker in queue:
+            for volunteer in graph[seeker]:
+                partner = volunteer_match[volunteer]
+                if partner == unmatched:
+                    reachable = True
+                elif distance[partner] == infinity:
+                    distance[partner] = distance[seeker] + 1
+                    queue.append(partner)
+        return reachable
+
+    def augment(root, next_edge):
+        """Depth-first search of an augmenting path along the layers, flipping it when found."""
+        stack, path = [root], []
+        while stack:
+            seeker = stack[-1]
+            if next_edge[seeker] < len(graph[seeker]):
+                volunteer = graph[seeker][next_edge[seeker]]
+                next_edge[seeker] += 1
+                partner = volunteer_match[volunteer]
+                if partner == unmatched:
+                    path.append(volunteer)
+                    for path_seeker, path_volunteer in zip(stack, path):
+                        seeker_match[path_seeker] = path_volunteer
+                        volunteer_match[path_volunteer] = path_seeker
+                    return True
+                if distance[partner] == distance[seeker] + 1:
+                    path.append(volunteer)
+                    stack.append(partner)
+            else:
+                # Dead end for this phase
+                distance[seeker] = infinity
+                stack.pop()
+                if path:
+                    path.pop()
+        return False
+
+    while layer():
+        next_edge = [0] * len(seekers)
+        for seeker, volunteer in enumerate(seeker_match):
+            if volunteer == unmatched:
+                augment(seeker, next_edge)
+
+    return [
+        (seekers[seeker].id, volunteers[volunteer].id)
+        for seeker, volunteer in enumerate(seeker_match) if volunteer != unmatched
+    ]
+
+
+STRATEGIES = {
+    'greedy': greedy_matches,
+    'optimal': optimal_matches,
+}
+
+
+def find_matches(seekers: List[Candidate], volunteers: List[Candidate], strategy: str = 'greedy',
+                 radius: Optional[float] = None) -> List[Match]:
+    return STRATEGIES[strategy](seekers, volunteers, radius)
+
+
+def save_matches(matches: List[Match]) -> List[Match]:
+    """
+    Pair the matched contacts in a single transaction.
+
+    Rows paired by someone else since they were loaded are skipped. Returns the
+    matches actually saved.
+    """
+    ids = [contact_id for match in matches for contact_id in match]
+    with transaction.atomic():
+        contacts = ContactForm.objects.select_for_update().filter(id__in=ids, buddy_id__isnull=True)
+        free = {contact.id: contact for contact in contacts.only('id', 'buddy')}
+        saved = []
+        for seeker_id, volunteer_id in matches:
+            if seeker_id not in free or volunteer_id not in free:
+                logger.info(f"Skipping match {seeker_id}/{volunteer_id}: one of them already has a buddy")
+                continue
+            free[seeker_id].buddy_id = volunteer_id
+            free[volunteer_id].buddy_id = seeker_id
+            saved.append((seeker_id, volunteer_id))
+        ContactForm.objects.bulk_update(
+            [contact for contact in free.values() if contact.buddy_id is not None], ['buddy'], batch_size=500
+        )
+        # bulk_update() does not send the signals maintaining the dashboard statistics
+        paired = [contact_id for match in saved for contact_id in match]
+        if paired:
+            transaction.on_commit(partial(refresh_contacts, paired))
+    return saved
+
+
+def match_contact(contact_id: int, radius: Optional[float] = None) -> Optional[Match]:
+    """
+    Match a single contact with the best compatible free contact of the other side.
+
+    Only rows sharing a weekly slot (bitmask filter) and overlapping dates are
+    loaded, so this stays cheap however large the unmatched pool is. A located
+    contact is matched with the nearest one within `radius` metres (MATCHING_RADIUS
+    by default, 0 to ignore distances), only the grid cells around it being loaded,
+    or else with a contact without coordinates.
+    """
+    row = ContactForm.objects.filter(id=contact_id, buddy_id__isnull=True, availability__gt=0).values_list(
+        'is_volunteer', 'start_date', 'end_date', 'availability', 'lat', 'lon'
+    ).first()
+    if row is None:
+        return None
+    is_volunteer, start_date, end_date, availability, lat, lon = row
+    contact = make_candidate(contact_id, start_date, end_date, availability, lat, lon)
+    radius = get_radius() if radius is None else radius
+    nearby = bool(radius) and contact.located
+    pool = (free_seekers() if is_volunteer else free_volunteers()).available_in(mask=availability).filter(
+        start_date__lte=end_date, end_date__gte=start_date,
+    )
+    if nearby:
+        pool = pool.filter(Q(grid_cell__in=geo.cells_within(lat, lon, radius)) | Q(lat__isnull=True))
+    candidates = [
+        candidate for candidate in load_candidates(pool)
+        if candidate.id != contact_id and not (nearby and candidate.located and planar_distance(contact, candidate) > radius)
+    ]
+    if not candidates:
+        return None
+
+    def preference(other):
+        seeker, volunteer = (other, contact) if is_volunteer else (contact, other)
+        # Located contacts first, nearest first
+        nearness = (other.located, -planar_distance(contact, other)) if nearby and other.located else (False, 0)
+        return nearness, pair_score(seeker, volunteer), -other.start
+
+    best = max(candidates, key=preference)
+    match = (best.id, contact.id) if is_volunteer else (contact.id, best.id)
+    saved = save_matches([match])
+    return saved[0] if saved else None
+
+
+def run_matching(seekers=None, volunteers=None, strategy: str = 'greedy', dry_run: bool = False,
+                 radius: Optional[float] = None) -> List[Match]:
+    """
+    Match free seekers with free volunteers (optionally restricted querysets) and save the pairs.
+
+    `radius` defaults to MATCHING_RADIUS, 0 ignores the distances.
+    """
+    seekers = load_candidates(free_seekers() if seekers is None else seekers & free_seekers())
+    volunteers = load_candidates(free_volunteers() if volunteers is None else volunteers & free_volunteers())
+    matches = find_matches(seekers, volunteers, strategy, get_radius() if radius is None else radius)
+    if dry_run:
+        return matches
+    return save_matches(matches)
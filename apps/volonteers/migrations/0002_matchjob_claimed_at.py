@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volonteers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchjob',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,3 +1,41 @@
+from django.db import models
+from django.utils import timezone
+
 from apps.db_users.models import ContactForm
 
-ContactForm = ContactForm
\ No newline at end of file
+ContactForm = ContactForm
+
+
+class MatchJob(models.Model):
+    """Request to match a newly submitted contact, processed by the `match_worker` command."""
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'En attente'),
+        (STATUS_RUNNING, 'En cours'),
+        (STATUS_DONE, 'Terminé'),
+        (STATUS_FAILED, 'Échec'),
+    ]
+
+    contact = models.ForeignKey(ContactForm, on_delete=models.CASCADE, related_name='match_jobs')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    created_at = models.DateTimeField(default=timezone.now)
+    # Set when a worker claims the job, a running job claimed too long ago is claimed again
+    claimed_at = models.DateTimeField(blank=True, null=True)
+    processed_at = models.DateTimeField(blank=True, null=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Id of the contact paired by this job, if any
+    matched_with = models.IntegerField(blank=True, null=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='matchjob_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"Matching de {self.contact} ({self.get_status_display()})"
@@ -0,0 +1,346 @@
+import os
+import random
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.db_users.availability import SLOT_BITS
+from apps.db_users.factories import build_contact, create_contacts
+from apps.db_users.models import ContactForm
+from apps.volonteers.models import MatchJob
+from apps.map.models import Address
+from apps.modules import geo
+from apps.volonteers import jobs
+from apps.volonteers.matching import (
+    Candidate, GridIndex, IntervalIndex, SlotIndex, greedy_matches, is_compatible, match_contact, optimal_matches,
+    save_matches,
+)
+
+
+class ContactFormAdminTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'secret')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def changelist(self):
+        return self.client.get(reverse('admin:db_users_contactform_changelist'))
+
+    def test_changelist_query_count_does_not_depend_on_rows(self):
+        seekers = create_contacts(2, is_volunteer=False)
+        volunteers = create_contacts(2, is_volunteer=True)
+        for seeker, volunteer in zip(seekers, volunteers):
+            ContactForm.objects.filter(id=seeker.id).update(buddy=volunteer)
+        with CaptureQueriesContext(connection) as queries:
+            self.changelist()
+
+        create_contacts(20, is_volunteer=True)
+        with self.assertNumQueries(len(queries)):
+            response = self.changelist()
+        self.assertContains(response, 'Prénom0 Nom (Volunteer)')
+
+    def test_run_matching_action(self):
+        seeker, = create_contacts(1, is_volunteer=False)
+        volunteer, = create_contacts(1, is_volunteer=True)
+        other, = create_contacts(1, is_volunteer=True)
+
+        self.client.post(reverse('admin:db_users_contactform_changelist'), {
+            'action': 'run_matching_for_selected', ACTION_CHECKBOX_NAME: [seeker.id, volunteer.id],
+        })
+
+        seeker.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(seeker.buddy_id, volunteer.id)
+        self.assertIsNone(other.buddy_id)
+
+
+LONGUET = '12 Rue Jean Longuet 92290 Châtenay-Malabry'
+
+
+@override_settings(GEOCODING_UPSTREAM=False)
+class GeocodingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Address.objects.create(
+            ban_id='92019_0420_00012', housenumber='12', street='Rue Jean Longuet', postcode='92290',
+            citycode='92019', city='Châtenay-Malabry', label=LONGUET, lat=48.7663, lon=2.2637,
+        )
+
+    def test_submission_is_geocoded(self):
+        today = date.today()
+        self.client.post(reverse('contact_form'), {
+            'first_name': 'Jeanne', 'last_name': 'Martin', 'email': 'jeanne@example.com', 'phone': '0601020304',
+            'address': '12 rue Jean-Longuet, Châtenay-Malabry', 'submit_at': today,
+            'start_date': today, 'end_date': today + timedelta(days=7), 'monday_morning': 'on',
+        })
+
+        contact = ContactForm.objects.get(email='jeanne@example.com')
+        self.assertEqual((contact.lat, contact.lon), (48.7663, 2.2637))
+        self.assertEqual(contact.grid_cell, geo.grid_cell(48.7663, 2.2637))
+
+    def test_unknown_address_is_left_empty(self):
+        contact, = create_contacts(1, address='1 Rue Inconnue 92290 Châtenay-Malabry', lat=48.77, lon=2.27)
+        contact.set_location(None)
+        contact.save()
+
+        contact.refresh_from_db()
+        self.assertEqual((contact.lat, contact.grid_cell), (None, ''))
+
+    def test_grid_cell_follows_the_coordinates(self):
+        contact = build_contact(lat=48.77, lon=2.27, grid_cell='')
+        contact.save()
+        self.assertEqual(contact.grid_cell, geo.grid_cell(48.77, 2.27))
+
+        contact.lat, contact.lon = 48.7663, 2.2637
+        contact.save(update_fields=['lat', 'lon'])
+
+        contact.refresh_from_db()
+        self.assertEqual(contact.grid_cell, geo.grid_cell(48.7663, 2.2637))
+
+    def test_address_edited_in_the_admin_is_geocoded(self):
+        contact, = create_contacts(1, address='1 Rue Inconnue 92290 Châtenay-Malabry')
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'secret'))
+        self.client.post(reverse('admin:db_users_contactform_change', args=[contact.id]), {
+            'first_name': contact.first_name, 'last_name': contact.last_name, 'email': contact.email,
+            'phone': contact.phone, 'address': LONGUET, 'start_date': contact.start_date,
+            'end_date': contact.end_date, 'monday_morning': 'on',
+        })
+
+        contact.refresh_from_db()
+        self.assertEqual((contact.lat, contact.lon), (48.7663, 2.2637))
+        self.assertEqual(contact.grid_cell, geo.grid_cell(48.7663, 2.2637))
+
+    @override_settings(GEOCODING_UPSTREAM=True)
+    def test_backfill(self):
+        create_contacts(1, address='3 Avenue Voltaire', lat=48.77, lon=2.27)
+        create_contacts(2, address=LONGUET)
+        create_contacts(1, address='3 avenue  VOLTAIRE')
+        create_contacts(1, address='8 Rue Neuve')
+
+        upstream = {'8 Rue Neuve': (48.76, 2.28)}
+        with mock.patch('apps.map.geocoding.geocode_batch_upstream', return_value=upstream) as batch:
+            call_command('geocode_contacts', stdout=open(os.devnull, 'w'))
+
+        # Only the address found neither locally nor on another contact goes upstream
+        batch.assert_called_once_with(['8 Rue Neuve'])
+        self.assertFalse(ContactForm.objects.filter(lat__isnull=True).exists())
+        self.assertEqual(ContactForm.objects.filter(address=LONGUET, lat=48.7663).count(), 2)
+        self.assertEqual(ContactForm.objects.get(address='3 avenue  VOLTAIRE').grid_cell, geo.grid_cell(48.77, 2.27))
+
+
+class MatchJobTests(TestCase):
+    def setUp(self):
+        self.seeker, = create_contacts(1, is_volunteer=False)
+
+    def test_enqueued_job_is_claimed_once(self):
+        job = jobs.enqueue_match(self.seeker)
+        self.assertEqual(job.status, MatchJob.STATUS_PENDING)
+
+        claimed = jobs.claim_jobs(10)
+
+        self.assertEqual([(claimed_job.id, claimed_job.status) for claimed_job in claimed],
+                         [(job.id, MatchJob.STATUS_RUNNING)])
+        self.assertIsNotNone(claimed[0].claimed_at)
+        self.assertEqual(jobs.claim_jobs(10), [])
+
+    @override_settings(MATCH_JOB_LEASE=60)
+    def test_job_of_a_crashed_worker_is_claimed_again(self):
+        job = jobs.enqueue_match(self.seeker)
+        jobs.claim_jobs(10)
+        MatchJob.objects.filter(id=job.id).update(claimed_at=timezone.now() - timedelta(seconds=30))
+        self.assertEqual(jobs.claim_jobs(10), [])
+
+        # The worker died without finishing the job, whose lease has now expired
+        MatchJob.objects.filter(id=job.id).update(claimed_at=timezone.now() - timedelta(seconds=90))
+
+        self.assertEqual([claimed_job.id for claimed_job in jobs.claim_jobs(10)], [job.id])
+
+    def test_process_pending_matches_the_contact(self):
+        volunteer, = create_contacts(1, is_volunteer=True)
+        job = jobs.enqueue_match(self.seeker)
+
+        processed, = jobs.process_pending()
+
+        self.assertEqual((processed.id, processed.status, processed.matched_with),
+                         (job.id, MatchJob.STATUS_DONE, volunteer.id))
+        self.assertEqual(ContactForm.objects.get(id=self.seeker.id).buddy_id, volunteer.id)
+
+    @mock.patch('apps.volonteers.jobs.match_contact', side_effect=RuntimeError('boom'))
+    def test_failed_job_is_retried_then_given_up(self, _):
+        job = jobs.enqueue_match(self.seeker)
+
+        with self.assertLogs('apps.volonteers.jobs', 'ERROR'):
+            for _ in range(jobs.MAX_ATTEMPTS - 1):
+                processed, = jobs.process_pending()
+                self.assertEqual(processed.status, MatchJob.STATUS_PENDING)
+            processed, = jobs.process_pending()
+
+        self.assertEqual((processed.id, processed.status, processed.attempts, processed.error),
+                         (job.id, MatchJob.STATUS_FAILED, jobs.MAX_ATTEMPTS, 'boom'))
+        self.assertEqual(jobs.process_pending(), [])
+
+
+MONDAY, TUESDAY = SLOT_BITS['monday_morning'], SLOT_BITS['tuesday_morning']
+
+
+class MatchingEngineTests(TestCase):
+    def test_interval_index(self):
+        index = IntervalIndex([Candidate(1, 10, 20, MONDAY), Candidate(2, 0, 5, MONDAY), Candidate(3, 8, 30, MONDAY)])
+
+        self.assertEqual(index.find(0, 3), 2)
+        self.assertEqual(index.find(6, 9), 3)
+        self.assertEqual(index.find(25, 40), 3)
+        self.assertIsNone(index.find(31, 40))
+        self.assertEqual(sorted(index.find_all(9, 12)), [1, 3])
+
+        index.remove(3)
+
+        self.assertEqual(index.find(6, 9), None)
+        self.assertEqual(index.find(6, 12), 1)
+        self.assertEqual(index.find_all(9, 12), [1])
+
+    def test_slot_index(self):
+        index = SlotIndex([Candidate(1, 0, 10, MONDAY), Candidate(2, 0, 10, MONDAY | TUESDAY)])
+
+        self.assertEqual(sorted(index.find_all(Candidate(9, 5, 6, TUESDAY))), [2])
+        index.remove(2)
+        self.assertIsNone(index.find(Candidate(9, 5, 6, TUESDAY)))
+        self.assertEqual(index.find(Candidate(9, 5, 6, MONDAY | TUESDAY)), 1)
+
+    def test_greedy_matches(self):
+        seekers = [Candidate(1, 5, 8, MONDAY), Candidate(2, 0, 3, MONDAY), Candidate(3, 0, 10, TUESDAY)]
+        volunteers = [Candidate(10, 0, 10, MONDAY), Candidate(11, 6, 9, MONDAY)]
+
+        # Seekers are served by start date, each with the first compatible volunteer left
+        self.assertEqual(greedy_matches(seekers, volunteers), [(2, 10), (1, 11)])
+
+    def test_save_matches_skips_contacts_paired_meanwhile(self):
+        seekers = create_contacts(2, is_volunteer=False)
+        volunteers = create_contacts(2, is_volunteer=True)
+        ContactForm.objects.filter(id=volunteers[1].id).update(buddy=seekers[0])
+
+        saved = save_matches([(seekers[0].id, volunteers[0].id), (seekers[1].id, volunteers[1].id)])
+
+        # The second volunteer was paired by someone else in the meantime
+        self.assertEqual(saved, [(seekers[0].id, volunteers[0].id)])
+        self.assertEqual(ContactForm.objects.get(id=volunteers[0].id).buddy_id, seekers[0].id)
+        self.assertIsNone(ContactForm.objects.get(id=seekers[1].id).buddy_id)
+
+
+def kuhn_matching_size(seekers, volunteers):
+    """Size of a maximum matching found with simple augmenting paths, the reference for Hopcroft-Karp."""
+    partner = {}
+
+    def augment(seeker, seen):
+        for volunteer in volunteers:
+            if volunteer.id not in seen and is_compatible(seeker, volunteer):
+                seen.add(volunteer.id)
+                if volunteer.id not in partner or augment(partner[volunteer.id], seen):
+                    partner[volunteer.id] = seeker
+                    return True
+        return False
+
+    return sum(augment(seeker, set()) for seeker in seekers)
+
+
+class OptimalMatchingTests(SimpleTestCase):
+    def test_against_kuhn_on_random_graphs(self):
+        rng = random.Random(7)
+        bits = list(SLOT_BITS.values())[:4]
+        for _ in range(200):
+            def candidate(candidate_id):
+                start = rng.randint(0, 20)
+                return Candidate(candidate_id, start, start + rng.randint(0, 6), rng.choice(bits) | rng.choice(bits))
+
+            seekers = [candidate(index) for index in range(rng.randint(0, 8))]
+            volunteers = [candidate(100 + index) for index in range(rng.randint(0, 8))]
+            matches = optimal_matches(seekers, volunteers)
+
+            self.assertEqual(len(matches), kuhn_matching_size(seekers, volunteers))
+            by_id = {candidate.id: candidate for candidate in seekers + volunteers}
+            self.assertTrue(all(is_compatible(by_id[seeker], by_id[volunteer]) for seeker, volunteer in matches))
+            self.assertEqual(len({seeker for seeker, _ in matches}), len(matches))
+            self.assertEqual(len({volunteer for _, volunteer in matches}), len(matches))
+
+    def test_augmenting_path_beats_greedy(self):
+        seekers = [Candidate(1, 0, 10, MONDAY | TUESDAY), Candidate(2, 0, 10, MONDAY)]
+        volunteers = [Candidate(10, 0, 10, MONDAY), Candidate(11, 0, 10, TUESDAY)]
+
+        self.assertEqual(len(greedy_matches(seekers, volunteers)), 1)
+        self.assertEqual(sorted(optimal_matches(seekers, volunteers)), [(1, 11), (2, 10)])
+
+
+def located(candidate_id, east, north):
+    """Available candidate living `east` and `north` metres from the reference point."""
+    x, y = geo.project(geo.REFERENCE_LAT, 2.2666)
+    return Candidate(candidate_id, 0, 10, SLOT_BITS['monday_morning'], x + east, y + north)
+
+
+class DistanceMatchingTests(TestCase):
+    def test_nearest_compatible_volunteer_within_radius(self):
+        seeker = located(1, 0, 0)
+        volunteers = [
+            located(10, 1500, 0),
+            located(11, -300, 400),
+            located(12, 100, 0)._replace(availability=SLOT_BITS['friday_evening']),
+            located(13, 5000, 0),
+        ]
+
+        self.assertEqual(greedy_matches([seeker], volunteers, radius=2000), [(1, 11)])
+        self.assertEqual(greedy_matches([seeker], volunteers[:1] + volunteers[2:], radius=2000), [(1, 10)])
+        self.assertEqual(greedy_matches([seeker], volunteers[:1] + volunteers[2:], radius=1000), [])
+        self.assertEqual(optimal_matches([seeker], volunteers, radius=2000), [(1, 11)])
+        # Without a radius the distances are ignored
+        self.assertEqual(len(greedy_matches([seeker], [volunteers[3]], radius=None)), 1)
+
+    def test_grid_only_looks_at_volunteers_sharing_a_slot(self):
+        friday = located(12, 100, 0)._replace(availability=SLOT_BITS['friday_evening'])
+        grid = GridIndex([friday, located(10, 1500, 0), located(11, -300, 400)])
+        looked_at = []
+
+        found = grid.nearest(located(1, 0, 0), 2000, lambda volunteer: looked_at.append(volunteer.id) or True)
+
+        self.assertEqual(found, 11)
+        self.assertNotIn(12, looked_at)
+
+        grid.remove(located(11, -300, 400))
+        self.assertEqual(grid.nearest(located(1, 0, 0), 2000), 10)
+
+    def test_grid_skips_volunteers_not_started_yet(self):
+        upcoming = [located(100 + index, 10 * index, 0)._replace(start=20, end=30) for index in range(200)]
+        grid = GridIndex([*upcoming, located(10, 1500, 0)])
+        accept = mock.Mock(return_value=True)
+
+        self.assertEqual(grid.nearest(located(1, 0, 0), 2000, accept), 10)
+        # Only the volunteer whose dates overlap the seeker's is looked at
+        accept.assert_called_once()
+        self.assertEqual(len(greedy_matches([located(1, 0, 0)], upcoming, radius=2000)), 0)
+
+    def test_contacts_without_coordinates_are_matched_on_availability(self):
+        unlocated = Candidate(20, 0, 10, SLOT_BITS['monday_morning'])
+        far = located(13, 5000, 0)
+
+        self.assertEqual(greedy_matches([located(1, 0, 0)], [far, unlocated], radius=2000), [(1, 20)])
+        self.assertEqual(greedy_matches([Candidate(2, 0, 10, SLOT_BITS['monday_morning'])], [far], radius=2000), [(2, 13)])
+        self.assertEqual(optimal_matches([located(1, 0, 0)], [far, unlocated], radius=2000), [(1, 20)])
+
+    @override_settings(MATCHING_RADIUS=2000)
+    def test_match_contact_prefers_the_nearest(self):
+        seeker, = create_contacts(1, is_volunteer=False, lat=48.7663, lon=2.2637)
+        positions = {'far': (48.80, 2.30), 'near': (48.7700, 2.2700), 'unlocated': (None, None)}
+        volunteers = {}
+        for name, (lat, lon) in positions.items():
+            volunteers[name], = create_contacts(1, is_volunteer=True, lat=lat, lon=lon)
+
+        self.assertEqual(match_contact(seeker.id), (seeker.id, volunteers['near'].id))
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import FormLayoutsView
+from .views import FormLayoutsView, address_autocomplete
 
 
 
@@ -8,5 +8,6 @@ urlpatterns = [
         "form/layouts_vertical/",
         FormLayoutsView.as_view(template_name="contact_form.html"),
         name="contact_form",
-    )
+    ),
+    path("form/address-autocomplete/", address_autocomplete, name="address_autocomplete"),
 ]
@@ -1,10 +1,22 @@
+from django.conf import settings
 from django.views.generic import TemplateView
 from django.shortcuts import redirect
 from django.http import JsonResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import require_safe
+import logging
 import requests
+from apps.map import address_index
+from apps.modules import http_client
+from apps.modules.cache import cached_fetch
 from .forms import ContactFormForm
+from .geocoding import locate
+from .models import ContactForm
+from .jobs import enqueue_match
 from web_project import TemplateLayout
 
+logger = logging.getLogger(__name__)
+
 class FormLayoutsView(TemplateView):
     template_name = 'contact_form.html'
 
@@ -16,7 +28,10 @@ class FormLayoutsView(TemplateView):
     def post(self, request, **kwargs):
         form = ContactFormForm(request.POST)
         if form.is_valid():
-            form.save()
+            contact = form.save(commit=False)
+            locate(contact)
+            contact.save()
+            enqueue_match(contact)
             context = self.get_context_data(**kwargs)
             context['form'] = ContactFormForm()  # Réinitialiser le formulaire
             context['success_message'] = 'Votre formulaire a été soumis avec succès.'
@@ -25,7 +40,44 @@ class FormLayoutsView(TemplateView):
             context['form'] = form
         return self.render_to_response(context)
 
+# api-adresse.data.gouv.fr rejects shorter queries
+MIN_QUERY_LENGTH = 3
+
+
+def search_upstream(query, limit):
+    """Features of api-adresse.data.gouv.fr for the first of ADDRESS_POSTCODES, [] on failure."""
+    params = {'q': query, 'limit': limit}
+    postcodes = getattr(settings, 'ADDRESS_POSTCODES', [])
+    if postcodes:
+        params['postcode'] = postcodes[0]
+    try:
+        response = http_client.get('https://api-adresse.data.gouv.fr/search/', params=params)
+        response.raise_for_status()
+        return response.json().get('features', [])
+    except (requests.RequestException, ValueError) as e:
+        logger.error(f"Address autocomplete failed: {e}")
+        return []
+
+
+@require_safe
+@cache_control(public=True, max_age=300)
 def address_autocomplete(request):
-    query = request.GET.get('q', '')
-    response = requests.get(f'https://api-adresse.data.gouv.fr/search/?q={query}=&postcode=92290')
-    return JsonResponse(response.json())
+    """
+    GeoJSON FeatureCollection of the addresses matching `q`, like api-adresse.data.gouv.fr/search/.
+
+    Addresses come from the local index (`manage.py import_addresses`); the upstream API
+    is only called, and its answer cached, for queries without a local match.
+    """
+    query = request.GET.get('q', '').strip()
+    try:
+        limit = min(max(int(request.GET.get('limit', address_index.DEFAULT_LIMIT)), 1), address_index.MAX_LIMIT)
+    except ValueError:
+        limit = address_index.DEFAULT_LIMIT
+
+    features = []
+    if len(query) >= MIN_QUERY_LENGTH:
+        features = address_index.search(query, limit)
+        if not features and getattr(settings, 'ADDRESS_AUTOCOMPLETE_FALLBACK', True):
+            key = '+'.join(address_index.normalize(query))
+            features = cached_fetch('addresses', (key, limit), lambda: search_upstream(query, limit))
+    return JsonResponse({'type': 'FeatureCollection', 'features': features, 'query': query, 'limit': limit})
@@ -1,4 +1,6 @@
 from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+from apps.modules.page_cache import get_page_cache_info
 
 def my_setting(request):
     return {'MY_SETTING': settings}
@@ -7,3 +9,8 @@ def my_setting(request):
 # Add the 'ENVIRONMENT' setting to the template context
 def environment(request):
     return {'ENVIRONMENT': settings.ENVIRONMENT}
+
+
+# Snapshot version, location and timeout keying the {% cache %} fragments of the public pages
+def page_cache(request):
+    return {'page_cache': SimpleLazyObject(lambda: get_page_cache_info(request))}
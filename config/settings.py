@@ -74,6 +74,7 @@ INSTALLED_APPS = [
     
     "apps.forcast",
     "apps.twosome", 
+    "forcast",
         'admin_interface',
     'colorfield',
 
@@ -109,6 +110,7 @@ TEMPLATES = [
                 "django.contrib.messages.context_processors.messages",
                 "config.context_processors.my_setting",
                 "config.context_processors.environment",
+                "config.context_processors.page_cache",
             ],
             "libraries": {
                 "theme": "web_project.template_tags.theme",
@@ -136,6 +138,117 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# The "weather" cache holds upstream OpenWeather/Recosante responses. It is per-process
+# (locmem) by default; point it at a file or database backend to share it between
+# gunicorn workers, e.g. WEATHER_CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+# and WEATHER_CACHE_LOCATION=/var/tmp/coolchateney_cache
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "weather": {
+        "BACKEND": os.environ.get("WEATHER_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get("WEATHER_CACHE_LOCATION", "weather"),
+        "TIMEOUT": None,
+        "OPTIONS": {
+            # Size-bounded: once full, a third of the entries is evicted
+            "MAX_ENTRIES": int(os.environ.get("WEATHER_CACHE_MAX_ENTRIES", 500)),
+            "CULL_FREQUENCY": 3,
+        },
+    },
+    # Answers of api-adresse.data.gouv.fr for the address autocomplete, apart from the weather entries
+    "addresses": {
+        "BACKEND": os.environ.get("ADDRESS_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get("ADDRESS_CACHE_LOCATION", "addresses"),
+        "TIMEOUT": None,
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.environ.get("ADDRESS_CACHE_MAX_ENTRIES", 1000)),
+            "CULL_FREQUENCY": 3,
+        },
+    },
+    # Hit/miss/stale counters of the "weather" cache, kept apart so culling the data never resets them
+    "stats": {
+        "BACKEND": os.environ.get("WEATHER_STATS_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get("WEATHER_STATS_CACHE_LOCATION", "weather-stats"),
+        "TIMEOUT": None,
+    },
+}
+
+# Freshness of each upstream source in seconds; expired entries are still served
+# for WEATHER_CACHE_STALE_TTL seconds while they are refreshed in the background.
+WEATHER_CACHE_TTLS = {
+    "weather": 10 * 60,
+    "forecast": 30 * 60,
+    "recosante": 60 * 60,
+}
+WEATHER_CACHE_STALE_TTL = 60 * 60
+
+# Rendered public weather pages (home, cards, forcast) are cached for anonymous visitors
+# for PAGE_CACHE_TIMEOUT seconds, see apps/modules/page_cache.py. They are keyed on the
+# highest WeatherSnapshot id, so a snapshot stored by any process (e.g. the poller)
+# invalidates them. Browsers may reuse a page for PAGE_MAX_AGE seconds.
+PAGE_CACHE_TIMEOUT = 5 * 60
+PAGE_MAX_AGE = 60
+
+# Locations polled by `manage.py poll_weather` and stored as WeatherSnapshot rows.
+# Pages read the latest snapshot and only call the upstream APIs when it is older
+# than WEATHER_SNAPSHOT_MAX_AGE seconds (or missing).
+WEATHER_POLL_LOCATIONS = [(48.7651, 2.2666)]  # Châtenay-Malabry
+WEATHER_POLL_INSEE_CODES = ["92019"]
+WEATHER_POLL_INTERVAL = 10 * 60
+WEATHER_SNAPSHOT_MAX_AGE = 3 * 60 * 60
+
+# Forecast hours at or above this temperature (°C) count towards the heatwave outlook
+FORECAST_HEAT_THRESHOLD = 30
+
+# Addresses offered by the contact form autocomplete, imported from the Base Adresse
+# Nationale with `manage.py import_addresses`. Queries without a local match are sent
+# to api-adresse.data.gouv.fr when ADDRESS_AUTOCOMPLETE_FALLBACK is set.
+ADDRESS_POSTCODES = ["92290"]
+ADDRESS_AUTOCOMPLETE_FALLBACK = True
+# Contact addresses missing from the imported ones are geocoded on api-adresse.data.gouv.fr,
+# on submission and by `manage.py geocode_contacts`
+GEOCODING_UPSTREAM = True
+# Geocoded seekers are only matched with geocoded volunteers living within MATCHING_RADIUS
+# metres, nearest first (None disables the distance constraint). Contacts without
+# coordinates are matched on their availability alone.
+MATCHING_RADIUS = 2000
+# Jobs of the `match_worker` command still running after MATCH_JOB_LEASE seconds are
+# taken to belong to a crashed worker and are claimed again
+MATCH_JOB_LEASE = 10 * 60
+
+# Upstream calls of a page run concurrently in a bounded thread pool. A page waits
+# at most UPSTREAM_BUDGET seconds overall, and at most UPSTREAM_TIMEOUTS[source]
+# for a given source, before rendering with the fallback data.
+UPSTREAM_MAX_WORKERS = 8
+UPSTREAM_BUDGET = 4.0
+UPSTREAM_TIMEOUTS = {
+    "weather": 3.0,
+    "forecast": 3.0,
+    "recosante": 3.0,
+    "recosante_j1": 3.0,
+}
+
+# Outbound HTTP client (apps.modules.http_client): pooled keep-alive session per host,
+# (connect, read) timeouts, retries with jittered backoff and a circuit breaker that
+# makes callers fall back to their default responses while a host keeps failing.
+OUTBOUND_HTTP = {
+    "default": {
+        "connect_timeout": 3.05,
+        "read_timeout": 10,
+        "retries": 2,
+        "failure_threshold": 5,
+        "reset_timeout": 30,
+    },
+    "hosts": {
+        # Autocomplete is interactive: fail fast rather than retry
+        "api-adresse.data.gouv.fr": {"read_timeout": 3, "retries": 0},
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
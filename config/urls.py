@@ -71,6 +71,9 @@ urlpatterns = [
 
     path("", include("apps.twosome.urls")),
 
+    # JSON API urls
+    path("", include("forcast.urls")),
+
 
 
 ]
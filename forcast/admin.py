@@ -1,3 +1,10 @@
 from django.contrib import admin
+from .models import WeatherSnapshot
 
-# Register your models here.
+
+@admin.register(WeatherSnapshot)
+class WeatherSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('source', 'location', 'fetched_at')
+    list_filter = ('source', 'location')
+    date_hierarchy = 'fetched_at'
+    readonly_fields = ('source', 'location', 'data', 'fetched_at')
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import logging
+from typing import Any, Callable, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_safe
+
+from apps.modules.cache import round_location
+from apps.modules.page_cache import DEFAULT_PAGE_MAX_AGE
+from apps.modules.weather import (
+    DEFAULT_INSEE_CODE, DEFAULT_LAT, DEFAULT_LON, RecosanteAPI, WeatherData, daily_outlook, get_heat_threshold,
+)
+from .models import WeatherSnapshot
+from .snapshots import latest_data
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidParameter(ValueError):
+    pass
+
+
+def get_location(request) -> Tuple[float, float]:
+    try:
+        lat = float(request.GET.get('lat', DEFAULT_LAT))
+        lon = float(request.GET.get('lon', DEFAULT_LON))
+    except ValueError as e:
+        raise InvalidParameter("lat and lon must be numbers") from e
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise InvalidParameter("lat or lon out of range")
+    return lat, lon
+
+
+def get_threshold(request) -> float:
+    try:
+        threshold = float(request.GET.get('threshold', get_heat_threshold()))
+    except ValueError as e:
+        raise InvalidParameter("threshold must be a number") from e
+    if not -50 <= threshold <= 60:
+        raise InvalidParameter("threshold out of range")
+    return threshold
+
+
+def get_insee_code(request) -> str:
+    insee_code = request.GET.get('insee', DEFAULT_INSEE_CODE)
+    if not (len(insee_code) == 5 and insee_code.isalnum()):
+        raise InvalidParameter("insee must be a 5 character INSEE code")
+    return insee_code
+
+
+def json_response(request, data: Any, updated_at: Optional[Any]) -> HttpResponse:
+    """JSON body with an ETag, answering conditional GETs with a 304."""
+    content = json.dumps({'data': data, 'updated_at': updated_at}, cls=DjangoJSONEncoder, ensure_ascii=False)
+    etag = quote_etag(hashlib.md5(content.encode()).hexdigest())
+    response = HttpResponse(content, content_type='application/json')
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'PAGE_MAX_AGE', DEFAULT_PAGE_MAX_AGE))
+    patch_vary_headers(response, ('Accept-Language',))
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+def snapshot_view(resolve: Callable[[Any], Tuple[str, str, Callable[[], Any], Any]],
+                  present: Optional[Callable[[Any], Callable[[Any], Any]]] = None):
+    """
+    Async view serving the latest snapshot of a source, see `forcast.snapshots.latest_data`.
+
+    `resolve(request)` returns the `(source, location, fetch, default)` of the request.
+    `present(request)`, when given, returns a function applied to the data before it is served.
+    The snapshot lookup (and the live fetch, when the snapshot is missing or too old)
+    runs in a worker thread, so the event loop is not blocked.
+    """
+    @require_safe
+    async def view(request):
+        try:
+            source, location, fetch, default = resolve(request)
+            transform = present(request) if present else None
+        except InvalidParameter as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        data, updated_at = await sync_to_async(latest_data)(source, location, fetch, default)
+        if transform:
+            data = transform(data)
+        return json_response(request, data, updated_at)
+
+    return view
+
+
+def _weather(request):
+    lat, lon = get_location(request)
+    return (
+        WeatherSnapshot.SOURCE_WEATHER, round_location(lat, lon),
+        WeatherData(lat=lat, lon=lon).get_weather, WeatherData._default_weather_response(),
+    )
+
+
+def _air_quality(request):
+    recosante_api = RecosanteAPI(insee_code=get_insee_code(request))
+    return WeatherSnapshot.SOURCE_RECOSANTE, recosante_api.params['insee'], recosante_api.fetch_data, {}
+
+
+def _forecast(request):
+    lat, lon = get_location(request)
+    return (
+        WeatherSnapshot.SOURCE_FORECAST, round_location(lat, lon),
+        WeatherData(lat=lat, lon=lon).get_weather_forecast, WeatherData._default_forecast_response(),
+    )
+
+
+def _forecast_outlook(request):
+    threshold = get_threshold(request)
+    return lambda data: {**data, 'heat_threshold': threshold, 'daily': daily_outlook(data, threshold)}
+
+
+weather = snapshot_view(_weather)
+air_quality = snapshot_view(_air_quality)
+forecast = snapshot_view(_forecast, _forecast_outlook)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ForcastConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'forcast'
+    # 'forcast' is already the label of apps.forcast (the forecast page)
+    label = 'forcast_snapshots'
+    verbose_name = 'Relevés météo et qualité de l\'air'
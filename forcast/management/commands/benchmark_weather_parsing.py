@@ -0,0 +1,67 @@
+import json
+import sys
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from apps.modules.weather import parse_current, parse_forecast, parse_recosante
+
+FORECAST_POINTS = 40  # 5 days, every 3 hours
+
+
+def sample_payloads():
+    """Payloads shaped like the OpenWeather and Recosante responses."""
+    current = {
+        'name': 'Châtenay-Malabry',
+        'main': {'temp': 21.46, 'temp_max': 24.0, 'temp_min': 18.04, 'feels_like': 21.0, 'humidity': 40},
+        'weather': [{'description': 'ciel dégagé'}],
+        'wind': {'speed': 5.1, 'deg': 350},
+    }
+    forecast = {'city': {'timezone': 7200}, 'list': [
+        {
+            'dt': 1751328000 + 3 * 3600 * i,
+            'dt_txt': f'2025-07-{1 + i // 8:02d} {3 * (i % 8):02d}:00:00',
+            'main': {'temp': 18 + (i * 7) % 15, 'feels_like': 18 + (i * 5) % 15, 'humidity': 30 + i},
+            'weather': [{'description': 'ciel dégagé'}],
+            'wind': {'speed': 2.5, 'deg': 180},
+        }
+        for i in range(FORECAST_POINTS)
+    ]}
+    recosante = {
+        'commune': {'nom': 'Châtenay-Malabry', 'code': '92019'},
+        'indice_atmo': {'indice': {'label': 'Moyen', 'details': [
+            {'label': label, 'indice': {'label': 'Bon'}} for label in ('PM10', 'PM2,5', 'NO2', 'O3', 'SO2')
+        ]}, 'advice': {'main': 'Aérez votre logement.'}},
+        'raep': {'indice': {'details': [
+            {'label': label, 'indice': {'label': 'Faible'}} for label in ('Graminées', 'Bouleau', 'Ambroisie')
+        ]}},
+        'indice_uv': {'indice': {'label': 'Fort', 'value': 7}},
+        'vigilance_meteo': {'indice': {'details': [
+            {'indice': {'label': 'Canicule', 'color': 'Orange', 'validity': {'start': '06:00', 'end': '22:00'}}},
+        ]}},
+    }
+    return current, forecast, recosante
+
+
+class Command(BaseCommand):
+    help = 'Measure the parsing time and size of the OpenWeather and Recosante records.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        current, forecast, recosante = sample_payloads()
+
+        for name, parse, payload in (
+            ('current', parse_current, current),
+            ('forecast', parse_forecast, forecast),
+            ('recosante', parse_recosante, recosante),
+        ):
+            elapsed = timeit.timeit(lambda parse=parse, payload=payload: parse(payload), number=iterations)
+            record = parse(payload)
+            self.stdout.write(
+                f"{name:>10}: {elapsed / iterations * 1e6:.2f}µs per parse, "
+                f"record {sys.getsizeof(record)} bytes, "
+                f"stored {len(json.dumps(record.to_dict(), ensure_ascii=False))} bytes"
+            )
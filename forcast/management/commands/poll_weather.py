@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from forcast.snapshots import get_poll_insee_codes, get_poll_interval, get_poll_locations, poll_once, prune_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Poll OpenWeather and Recosante on a schedule and store the responses as snapshots.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int,
+            default=None,
+            help='Seconds between two polls (default: WEATHER_POLL_INTERVAL).',
+        )
+        parser.add_argument('--once', action='store_true', help='Poll a single time and exit.')
+        parser.add_argument(
+            '--location', action='append', default=None, metavar='LAT,LON',
+            help='Location to poll, can be repeated (default: WEATHER_POLL_LOCATIONS).',
+        )
+        parser.add_argument(
+            '--insee', action='append', default=None, metavar='CODE',
+            help='INSEE code to poll on Recosante, can be repeated (default: WEATHER_POLL_INSEE_CODES).',
+        )
+        parser.add_argument(
+            '--keep-days', type=int, default=7,
+            help='Delete snapshots older than this many days after each poll.',
+        )
+
+    def handle(self, *args, **options):
+        locations = self.parse_locations(options['location']) if options['location'] else get_poll_locations()
+        insee_codes = options['insee'] or get_poll_insee_codes()
+        interval = get_poll_interval() if options['interval'] is None else options['interval']
+
+        while True:
+            started = time.monotonic()
+            snapshots = poll_once(locations, insee_codes)
+            pruned = prune_snapshots(options['keep_days'])
+            self.stdout.write(f"Stored {len(snapshots)} snapshot(s), pruned {pruned}.")
+
+            if options['once']:
+                break
+            time.sleep(max(0, interval - (time.monotonic() - started)))
+
+        self.stdout.write(self.style.SUCCESS('Polling finished.'))
+
+    @staticmethod
+    def parse_locations(values):
+        locations = []
+        for value in values:
+            try:
+                lat, lon = (float(part) for part in value.split(','))
+            except ValueError as e:
+                raise CommandError(f"Invalid location '{value}', expected LAT,LON") from e
+            locations.append((lat, lon))
+        return locations
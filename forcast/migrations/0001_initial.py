@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:57
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeatherSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('weather', 'Météo actuelle (OpenWeather)'), ('forecast', 'Prévisions (OpenWeather)'), ('recosante', 'Recosante du jour'), ('recosante_j1', 'Recosante J+1')], max_length=20)),
+                ('location', models.CharField(max_length=32)),
+                ('data', models.JSONField()),
+                ('fetched_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-fetched_at'],
+                'get_latest_by': 'fetched_at',
+                'indexes': [models.Index(fields=['source', 'location', '-fetched_at'], name='snapshot_latest_idx')],
+            },
+        ),
+    ]
@@ -1,3 +1,38 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class WeatherSnapshot(models.Model):
+    """Normalized upstream response stored by the `poll_weather` worker."""
+
+    SOURCE_WEATHER = 'weather'
+    SOURCE_FORECAST = 'forecast'
+    SOURCE_RECOSANTE = 'recosante'
+    SOURCE_RECOSANTE_J1 = 'recosante_j1'
+    SOURCE_CHOICES = [
+        (SOURCE_WEATHER, 'Météo actuelle (OpenWeather)'),
+        (SOURCE_FORECAST, 'Prévisions (OpenWeather)'),
+        (SOURCE_RECOSANTE, 'Recosante du jour'),
+        (SOURCE_RECOSANTE_J1, 'Recosante J+1'),
+    ]
+
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    # Rounded "lat,lon" for OpenWeather sources, INSEE code for Recosante
+    location = models.CharField(max_length=32)
+    data = models.JSONField()
+    fetched_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-fetched_at']
+        get_latest_by = 'fetched_at'
+        indexes = [
+            models.Index(fields=['source', 'location', '-fetched_at'], name='snapshot_latest_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_source_display()} {self.location} ({self.fetched_at:%Y-%m-%d %H:%M})"
+
+    @classmethod
+    def latest_for(cls, source, location):
+        """Return the most recent snapshot for a source and location, or None."""
+        return cls.objects.filter(source=source, location=location).order_by('-fetched_at').first()
@@ -0,0 +1,149 @@
+import logging
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.modules.aggregator import UpstreamBatch, get_timeout
+from apps.modules.cache import round_location
+from apps.modules.weather import RecosanteAPI, WeatherData
+from .models import WeatherSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Time a poll may spend waiting on all upstream calls, in seconds
+POLL_BUDGET = 60
+
+
+def _fetch_weather(lat: float, lon: float) -> Dict[str, Any]:
+    return WeatherData.get_weather.uncached(WeatherData(lat=lat, lon=lon))
+
+
+def _fetch_forecast(lat: float, lon: float) -> Dict[str, Any]:
+    return WeatherData.get_weather_forecast.uncached(WeatherData(lat=lat, lon=lon))
+
+
+def _fetch_recosante(insee_code: str) -> Dict[str, Any]:
+    return RecosanteAPI.fetch_data.uncached(RecosanteAPI(insee_code))
+
+
+def _fetch_recosante_j1(insee_code: str) -> Dict[str, Any]:
+    return RecosanteAPI.fetch_data.uncached(RecosanteAPI(insee_code, days_ahead=1))
+
+
+# Upstream fetchers and the check telling a real response from a fallback
+LOCATION_SOURCES = {
+    WeatherSnapshot.SOURCE_WEATHER: (_fetch_weather, lambda data: data.get('temperature') != 'N/A'),
+    WeatherSnapshot.SOURCE_FORECAST: (_fetch_forecast, lambda data: 'min_temp' in data),
+}
+INSEE_SOURCES = {
+    WeatherSnapshot.SOURCE_RECOSANTE: (_fetch_recosante, bool),
+    WeatherSnapshot.SOURCE_RECOSANTE_J1: (_fetch_recosante_j1, bool),
+}
+
+
+def is_valid(source: str, data: Any) -> bool:
+    _, check = {**LOCATION_SOURCES, **INSEE_SOURCES}[source]
+    return bool(data) and check(data)
+
+
+# The WEATHER_POLL_* and WEATHER_SNAPSHOT_MAX_AGE defaults live in config/settings.py only
+def get_poll_locations() -> List[Tuple[float, float]]:
+    return list(settings.WEATHER_POLL_LOCATIONS)
+
+
+def get_poll_insee_codes() -> List[str]:
+    return list(settings.WEATHER_POLL_INSEE_CODES)
+
+
+def get_poll_interval() -> int:
+    return settings.WEATHER_POLL_INTERVAL
+
+
+def get_max_age() -> timedelta:
+    return timedelta(seconds=settings.WEATHER_SNAPSHOT_MAX_AGE)
+
+
+def poll_once(locations: Optional[Iterable[Tuple[float, float]]] = None,
+              insee_codes: Optional[Iterable[str]] = None) -> List[WeatherSnapshot]:
+    """Fetch every source once and store the valid responses as snapshots."""
+    locations = get_poll_locations() if locations is None else locations
+    insee_codes = get_poll_insee_codes() if insee_codes is None else insee_codes
+
+    jobs = []
+    for lat, lon in locations:
+        for source, (fetch, _) in LOCATION_SOURCES.items():
+            jobs.append((source, round_location(lat, lon), lambda fetch=fetch, lat=lat, lon=lon: fetch(lat, lon)))
+    for insee_code in insee_codes:
+        for source, (fetch, _) in INSEE_SOURCES.items():
+            jobs.append((source, insee_code, lambda fetch=fetch, insee_code=insee_code: fetch(insee_code)))
+
+    # All sources are fetched concurrently
+    batch = UpstreamBatch(budget=POLL_BUDGET)
+    for source, location, fetch in jobs:
+        batch.add(f"{source}:{location}", (source, location), fetch)
+    results = batch.run()
+
+    snapshots = []
+    for source, location, _ in jobs:
+        data = results[f"{source}:{location}"]
+        if data is None or not is_valid(source, data):
+            # Keep serving the previous snapshot rather than a fallback response.
+            logger.warning(f"Skipping invalid {source} response for {location}")
+            continue
+        snapshots.append(WeatherSnapshot(source=source, location=location, data=data))
+
+    return WeatherSnapshot.objects.bulk_create(snapshots)
+
+
+def prune_snapshots(keep_days: int) -> int:
+    """Delete snapshots older than `keep_days`, always keeping the latest per source/location."""
+    cutoff = timezone.now() - timedelta(days=keep_days)
+    latest_ids = [
+        WeatherSnapshot.latest_for(source, location).pk
+        for source, location in WeatherSnapshot.objects.values_list('source', 'location').distinct()
+    ]
+    deleted, _ = WeatherSnapshot.objects.filter(fetched_at__lt=cutoff).exclude(pk__in=latest_ids).delete()
+    return deleted
+
+
+def latest_data_many(requests: Dict[str, Tuple[str, str, Callable[[], Any], Any]],
+                     budget: Optional[float] = None) -> Dict[str, Tuple[Any, Optional[Any]]]:
+    """
+    Resolve `{name: (source, location, fetch, default)}` to `{name: (data, fetched_at)}`.
+
+    The latest stored snapshot is preferred. Snapshots older than
+    WEATHER_SNAPSHOT_MAX_AGE (or missing, when the poller is not running) are
+    replaced by live fetches, which are all issued concurrently within the page's
+    time budget; if a fetch fails, the old snapshot is still served so the page
+    keeps working with its freshness timestamp. `default` is returned (with no
+    timestamp) when neither a snapshot nor a live response is available in time.
+    """
+    max_age = get_max_age()
+    now = timezone.now()
+    snapshots = {}
+    batch = UpstreamBatch(budget)
+    for name, (source, location, fetch, default) in requests.items():
+        snapshot = snapshots[name] = WeatherSnapshot.latest_for(source, location)
+        if snapshot is None or now - snapshot.fetched_at > max_age:
+            batch.add(name, (source, location), fetch, timeout=get_timeout(source), default=default)
+    live = batch.run()
+
+    results = {}
+    for name, (source, _, _, default) in requests.items():
+        snapshot = snapshots[name]
+        if name not in live:
+            results[name] = (snapshot.data, snapshot.fetched_at)
+        elif live[name] is not None and is_valid(source, live[name]):
+            results[name] = (live[name], timezone.now())
+        elif snapshot is not None:
+            results[name] = (snapshot.data, snapshot.fetched_at)
+        else:
+            results[name] = (live[name] if live[name] is not None else default, None)
+    return results
+
+
+def latest_data(source: str, location: str, fetch: Callable[[], Any], default: Any = None) -> Tuple[Any, Optional[Any]]:
+    """Return `(data, fetched_at)` for a single source, see `latest_data_many`."""
+    return latest_data_many({source: (source, location, fetch, default)})[source]
@@ -1,3 +1,230 @@
-from django.test import TestCase
+import os
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.modules.weather import ForecastSeries, WeatherData, heat_index, parse_current, parse_forecast, parse_recosante
+from . import snapshots
+from .models import WeatherSnapshot
+
+
+class JsonApiTests(TestCase):
+    def setUp(self):
+        self.weather = {**WeatherData._default_weather_response(), 'temperature': 21.5}
+        WeatherSnapshot.objects.create(source=WeatherSnapshot.SOURCE_WEATHER, location='48.77,2.27', data=self.weather)
+        WeatherSnapshot.objects.create(
+            source=WeatherSnapshot.SOURCE_RECOSANTE, location='92019', data={'indice_atmo': {'overall_index': 'Moyen'}},
+        )
+
+    def test_weather(self):
+        response = self.client.get(reverse('api-weather'), {'lat': '48.7651', 'lon': '2.2666'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'], self.weather)
+        self.assertIsNotNone(response.json()['updated_at'])
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_air_quality(self):
+        response = self.client.get(reverse('api-air-quality'))
+
+        self.assertEqual(response.json()['data']['indice_atmo']['overall_index'], 'Moyen')
+
+    def test_conditional_get(self):
+        etag = self.client.get(reverse('api-weather'))['ETag']
+
+        response = self.client.get(reverse('api-weather'), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(reverse('api-weather'), {'lat': 'north'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('api-air-quality'), {'insee': '../x'}).status_code, 400)
+        self.assertEqual(self.client.post(reverse('api-weather')).status_code, 405)
+
+    def test_forecast_without_snapshot_or_api_key(self):
+        response = self.client.get(reverse('api-forecast'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('plus1H', response.json()['data'])
+        self.assertEqual(response.json()['data']['daily'], [])
+
+    def test_forecast_outlook(self):
+        temps = [24, 27, 31, 33, 32, 29, 26, 25] + [18] * 8
+        forecast = parse_forecast({'list': [forecast_entry(3 * i, temp) for i, temp in enumerate(temps)]})
+        WeatherSnapshot.objects.create(source=WeatherSnapshot.SOURCE_FORECAST, location='48.77,2.27', data=forecast.to_dict())
+
+        data = self.client.get(reverse('api-forecast'), {'threshold': '32'}).json()['data']
+
+        self.assertEqual(data['heat_threshold'], 32)
+        self.assertEqual([day['hours_above'] for day in data['daily']], [6, 0])
+        self.assertEqual(self.client.get(reverse('api-forecast'), {'threshold': 'hot'}).status_code, 400)
+
+
+def forecast_entry(hour, temp, humidity=40):
+    return {
+        'dt': 1751328000 + hour * 3600,  # 2025-07-01 00:00 UTC
+        'dt_txt': f'2025-07-{1 + hour // 24:02d} {hour % 24:02d}:00:00',
+        'main': {'temp': temp, 'feels_like': temp + 1, 'humidity': humidity},
+        'weather': [{'description': 'ciel dégagé'}],
+        'wind': {'speed': 3.0, 'deg': 90},
+    }
+
+
+class ParserTests(SimpleTestCase):
+    def test_current(self):
+        payload = {
+            'name': 'Châtenay-Malabry',
+            'main': {'temp': 21.46, 'temp_max': 24.0, 'temp_min': 18.04, 'feels_like': 21.0},
+            'weather': [{'description': 'ciel dégagé'}],
+            'wind': {'speed': 5, 'deg': 350},
+        }
+
+        weather = parse_current(payload).to_dict()
+
+        self.assertEqual(weather['temperature'], 21.5)
+        self.assertEqual(weather['wind_speed'], 18.0)
+        self.assertEqual(weather['wind_direction'], 'Nord')
+        self.assertEqual(weather['description'], 'Ciel dégagé')
+        self.assertEqual(set(weather), set(WeatherData._default_weather_response()))
+
+    def test_forecast(self):
+        temps = [20, 18, 25, 31, 12] + [22] * 35
+        forecast = parse_forecast({'list': [forecast_entry(3 * i, temp) for i, temp in enumerate(temps)]})
+
+        self.assertEqual((forecast.min_temp, forecast.max_temp), (12, 31))
+        self.assertEqual(forecast.to_dict()['plus1H']['temperature'], 18)
+        self.assertEqual(forecast.to_dict()['plus24H']['datetime'], '2025-07-02 00:00:00')
+
+    def test_short_forecast(self):
+        forecast = parse_forecast({'list': [forecast_entry(3 * i, 20 + i) for i in range(4)]})
+
+        self.assertEqual(len(forecast.series), 4)
+        self.assertEqual(forecast.plus24H.temperature, 23)
+        self.assertIsNone(parse_forecast({'list': []}))
+
+    def test_series_daily_outlook(self):
+        # Two days: a hot one, then a mild one
+        temps = [24, 27, 31, 33, 32, 29, 26, 25] + [18] * 8
+        series = parse_forecast({'list': [forecast_entry(3 * i, temp) for i, temp in enumerate(temps)]}).series
+
+        today, tomorrow = series.daily(threshold=30)
+
+        self.assertEqual((today.date, today.min_temp, today.max_temp), ('2025-07-01', 24, 33))
+        self.assertAlmostEqual(today.mean_temp, 28.375)
+        self.assertEqual(today.hours_above, 9)
+        self.assertEqual(tomorrow.hours_above, 0)
+        self.assertEqual(series.hours_above(20), 24)
+
+        stored = ForecastSeries.from_dict(series.to_dict())
+        self.assertEqual(stored.daily(30), [today, tomorrow])
+
+    def test_series_local_days(self):
+        series = parse_forecast({
+            'list': [forecast_entry(3 * i, 20) for i in range(16)], 'city': {'timezone': -2 * 3600},
+        }).series
+
+        self.assertEqual([day.date for day in series.daily()], ['2025-06-30', '2025-07-01', '2025-07-02'])
+
+    def test_heat_index(self):
+        self.assertAlmostEqual(heat_index(20, 50), 20, delta=1)
+        # NOAA table: 96 °F at 65 % humidity gives 121 °F
+        self.assertAlmostEqual(heat_index((96 - 32) * 5 / 9, 65), (121 - 32) * 5 / 9, delta=0.5)
+
+    def test_recosante(self):
+        data = parse_recosante({
+            'indice_atmo': {'indice': {'label': 'Moyen', 'details': [{'label': 'o3', 'indice': {'label': 'Bon'}}]}},
+            'raep': {'indice': {'details': [{'label': 'Graminées', 'indice': {'label': 'Élevé'}}]}},
+        }).to_dict()
+
+        self.assertEqual(data['indice_atmo']['overall_index'], 'Moyen')
+        self.assertEqual(data['indice_atmo']['air_quality_levels']['O3'], 'Bon')
+        self.assertEqual(data['indice_atmo']['air_quality_levels']['PM10'], 'N/A')
+        self.assertEqual(data['raep']['pollen_levels'], {'graminées': 'Élevé'})
+        self.assertEqual(data['episodes_pollution']['details'], [])
+
+    def test_missing_api_key_returns_defaults(self):
+        weather = WeatherData()
+        weather.api_key = None
+
+        self.assertNotIn('min_temp', WeatherData.get_weather_forecast.uncached(weather))
+        self.assertEqual(WeatherData.get_weather.uncached(weather)['temperature'], 'N/A')
+
+
+@override_settings(WEATHER_SNAPSHOT_MAX_AGE=3600)
+class SnapshotTests(TestCase):
+    default = WeatherData._default_weather_response()
+
+    def store(self, temperature, age=0):
+        snapshot = WeatherSnapshot.objects.create(
+            source=WeatherSnapshot.SOURCE_WEATHER, location='48.77,2.27', data={**self.default, 'temperature': temperature},
+        )
+        WeatherSnapshot.objects.filter(pk=snapshot.pk).update(fetched_at=timezone.now() - timedelta(seconds=age))
+
+    def latest(self, fetch):
+        data, fetched_at = snapshots.latest_data(WeatherSnapshot.SOURCE_WEATHER, '48.77,2.27', fetch, self.default)
+        return data['temperature'], fetched_at
+
+    def test_fresh_snapshot_is_served_without_fetching(self):
+        self.store(21, age=60)
+        fetch = mock.Mock()
+
+        temperature, fetched_at = self.latest(fetch)
+
+        self.assertEqual(temperature, 21)
+        self.assertIsNotNone(fetched_at)
+        fetch.assert_not_called()
+
+    def test_stale_snapshot_is_refreshed(self):
+        self.store(21, age=7200)
+
+        self.assertEqual(self.latest(lambda: {**self.default, 'temperature': 25})[0], 25)
+
+    def test_stale_snapshot_is_served_when_the_refresh_fails(self):
+        self.store(21, age=7200)
+
+        def fail():
+            raise ConnectionError('down')
+
+        self.assertEqual(self.latest(fail)[0], 21)
+        self.assertEqual(self.latest(lambda: self.default)[0], 21)
+
+    def test_missing_snapshot(self):
+        self.assertEqual(self.latest(lambda: {**self.default, 'temperature': 25})[0], 25)
+        self.assertEqual(self.latest(lambda: None), ('N/A', None))
+
+    def test_latest_data_many(self):
+        self.store(21, age=60)
+        results = snapshots.latest_data_many({
+            'stored': (WeatherSnapshot.SOURCE_WEATHER, '48.77,2.27', mock.Mock(), self.default),
+            'live': (WeatherSnapshot.SOURCE_WEATHER, '48.80,2.30', lambda: {**self.default, 'temperature': 18}, self.default),
+        })
+
+        self.assertEqual(results['stored'][0]['temperature'], 21)
+        self.assertEqual(results['live'][0]['temperature'], 18)
+
+    def test_poll_once_stores_valid_responses_only(self):
+        sources = {
+            WeatherSnapshot.SOURCE_WEATHER: (lambda lat, lon: {**self.default, 'temperature': 20}, lambda data: True),
+            WeatherSnapshot.SOURCE_FORECAST: (lambda lat, lon: {}, lambda data: True),
+        }
+        insee_sources = {WeatherSnapshot.SOURCE_RECOSANTE: (lambda insee_code: {'raep': {}}, bool)}
+        with mock.patch.dict(snapshots.LOCATION_SOURCES, sources, clear=True), \
+                mock.patch.dict(snapshots.INSEE_SOURCES, insee_sources, clear=True):
+            stored = snapshots.poll_once([(48.7651, 2.2666)], ['92019'])
+
+        self.assertEqual(
+            sorted((snapshot.source, snapshot.location) for snapshot in stored),
+            [('recosante', '92019'), ('weather', '48.77,2.27')],
+        )
+
+    def test_poll_command(self):
+        with mock.patch('forcast.management.commands.poll_weather.poll_once', return_value=[]) as poll:
+            call_command('poll_weather', '--once', '--location', '48.8,2.3', stdout=open(os.devnull, 'w'))
+        poll.assert_called_once_with([(48.8, 2.3)], ['92019'])
+
+        with self.assertRaises(CommandError):
+            call_command('poll_weather', '--once', '--location', 'north')
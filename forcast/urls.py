@@ -0,0 +1,10 @@
+from django.urls import path
+from . import api
+
+
+
+urlpatterns = [
+    path("api/weather", api.weather, name="api-weather"),
+    path("api/air-quality", api.air_quality, name="api-air-quality"),
+    path("api/forecast", api.forecast, name="api-forecast"),
+]
@@ -0,0 +1,43 @@
+/**
+ * Weather cards
+ * Refresh the values of a cached page from the JSON API, elements are marked with
+ * data-weather="<field>" (/api/weather) or data-air-quality="<field>" (/api/air-quality).
+ */
+
+'use strict';
+
+(function () {
+  const params = new URLSearchParams(window.location.search);
+  const query = new URLSearchParams();
+  ['lat', 'lon'].forEach(name => {
+    if (params.has(name)) {
+      query.set(name, params.get(name));
+    }
+  });
+
+  function format(value) {
+    return typeof value === 'number' ? value.toLocaleString('fr-FR') : value;
+  }
+
+  function refresh(url, attribute, pick) {
+    const elements = document.querySelectorAll(`[${attribute}]`);
+    if (!elements.length) {
+      return;
+    }
+    fetch(query.toString() ? `${url}?${query}` : url, { headers: { Accept: 'application/json' } })
+      .then(response => (response.ok ? response.json() : Promise.reject(response.status)))
+      .then(body => {
+        const data = pick(body.data || {});
+        elements.forEach(element => {
+          const value = data[element.getAttribute(attribute)];
+          if (value !== undefined && value !== null) {
+            element.textContent = format(value);
+          }
+        });
+      })
+      .catch(error => console.warn(`${url} unavailable:`, error));
+  }
+
+  refresh('/api/weather', 'data-weather', data => data);
+  refresh('/api/air-quality', 'data-air-quality', data => data.indice_atmo || {});
+})();
@@ -21,7 +21,6 @@ class TemplateLayout:
             }
         )
 
-        # Map context variables
-        TemplateHelper.map_context(context)
+        # The context variables are mapped by set_layout()
 
         return context
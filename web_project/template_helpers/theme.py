@@ -1,8 +1,15 @@
 from django.conf import settings
-from pprint import pprint
+import logging
 import os
+import pkgutil
 from importlib import import_module, util
 
+logger = logging.getLogger(__name__)
+
+# Per-process registry of the layout bootstrap classes and of the context they set, by layout name
+_bootstrap_classes = {}
+_layout_contexts = {}
+
 
 # Core TemplateHelper class
 class TemplateHelper:
@@ -30,33 +37,51 @@ class TemplateHelper:
     def get_theme_variables(scope):
         return settings.THEME_VARIABLES[scope]
 
+    # Bootstrap class of a layout, resolved once per process
+    def get_bootstrap(layout):
+        if layout not in _bootstrap_classes:
+            package = f"templates.{settings.THEME_LAYOUT_DIR.replace('/', '.')}.bootstrap"
+            module = f"{package}.{layout}"
+
+            # Check if the bootstrap file is exist
+            if util.find_spec(module) is not None:
+                TemplateBootstrap = TemplateHelper.import_class(
+                    module, f"TemplateBootstrap{layout.title().replace('_', '')}"
+                )
+            else:
+                TemplateBootstrap = TemplateHelper.import_class(
+                    f"{package}.default", "TemplateBootstrapDefault"
+                )
+            _bootstrap_classes[layout] = TemplateBootstrap
+        return _bootstrap_classes[layout]
+
+    # Context set by the bootstrap class of a layout, computed once per process.
+    # Bootstrap classes only set static values, so their result does not depend on the page.
+    def get_layout_context(layout):
+        if layout not in _layout_contexts:
+            _layout_contexts[layout] = TemplateHelper.get_bootstrap(layout).init({})
+        return _layout_contexts[layout]
+
+    # Resolve every bootstrap file of the theme, called when the apps are ready
+    def warm_layouts():
+        package = import_module(f"templates.{settings.THEME_LAYOUT_DIR.replace('/', '.')}.bootstrap")
+        for module in pkgutil.iter_modules(package.__path__):
+            TemplateHelper.get_layout_context(module.name)
+
     # Set the current page layout and init the layout bootstrap file
     def set_layout(view, context={}):
         # Extract layout from the view path
         layout = os.path.splitext(view)[0].split("/")[0]
 
-        # Get module path
-        module = f"templates.{settings.THEME_LAYOUT_DIR.replace('/', '.')}.bootstrap.{layout}"
-
-        # Check if the bootstrap file is exist
-        if util.find_spec(module) is not None:
-            # Auto import and init the default bootstrap.py file from the theme
-            TemplateBootstrap = TemplateHelper.import_class(
-                module, f"TemplateBootstrap{layout.title().replace('_', '')}"
-            )
-            TemplateBootstrap.init(context)
-        else:
-            module = f"templates.{settings.THEME_LAYOUT_DIR.replace('/', '.')}.bootstrap.default"
-
-            TemplateBootstrap = TemplateHelper.import_class(
-                module, "TemplateBootstrapDefault"
-            )
-            TemplateBootstrap.init(context)
+        context.update(TemplateHelper.get_layout_context(layout))
+        # Only a page level menu_fixed changes the mapped classes
+        if "menu_fixed" in context:
+            TemplateHelper.map_context(context)
 
         return f"{settings.THEME_LAYOUT_DIR}/{view}"
 
     # Import a module by string
     def import_class(fromModule, import_className):
-        pprint(f"Loading {import_className} from {fromModule}")
+        logger.debug(f"Loading {import_className} from {fromModule}")
         module = import_module(fromModule)
         return getattr(module, import_className)